@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand
+
+from apps.candidates.models import CandidateProfile
+from apps.candidates.utils.profile_completion import (
+    calculate_profile_completion,
+    store_profile_completion,
+)
+
+
+# Everything calculate_profile_completion reads; sections come from the
+# stored counters, so no child rows are loaded.
+COMPLETION_FIELDS = [
+    "id",
+    "full_name",
+    "email",
+    "phone",
+    "location",
+    "work_status",
+    "notice_period_code",
+    "availability_to_join",
+    "summary",
+    "resume_file",
+    "skills_count",
+    "employments_count",
+    "educations_count",
+    "projects_count",
+    "profile_completion_percent",
+]
+
+
+class Command(BaseCommand):
+    help = "Recompute stored profile_completion_percent for candidate profiles."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute every profile instead of only rows still at 0%",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of profiles written per bulk update",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        qs = CandidateProfile.objects.only(*COMPLETION_FIELDS).order_by("pk")
+        if not options["all"]:
+            qs = qs.filter(profile_completion_percent=0)
+
+        processed = 0
+        changed = 0
+        batch = []
+        for profile in qs.iterator(chunk_size=batch_size):
+            percent, _ = calculate_profile_completion(profile)
+            processed += 1
+            if percent == profile.profile_completion_percent:
+                continue
+            profile.profile_completion_percent = percent
+            batch.append(profile)
+            if len(batch) >= batch_size:
+                changed += store_profile_completion(batch)
+                batch = []
+                self.stdout.write(self.style.SUCCESS(f"Updated {changed} profiles..."))
+
+        if batch:
+            changed += store_profile_completion(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Backfill complete. Processed {processed} profiles, updated {changed}."
+            )
+        )
@@ -0,0 +1,84 @@
+from django.core.management.base import BaseCommand
+
+from apps.candidates.models import CandidateProfile, CandidateSkill
+from apps.candidates.services.search import bump_search_generation
+from apps.candidates.services.search_document import rebuild_search_documents
+from apps.skills.models import normalize_skill_name
+from apps.skills.search_index import get_skill_index
+
+
+class Command(BaseCommand):
+    help = "Link CandidateSkill rows without a Skill to the master by normalized name or alias."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of orphan rows read and written per batch",
+        )
+        parser.add_argument(
+            "--start-after",
+            type=str,
+            default=None,
+            help="Resume after this CandidateSkill id (printed with every batch)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        last_id = options["start_after"]
+        skill_index = get_skill_index()
+
+        scanned = 0
+        linked = 0
+        ambiguous = 0
+        while True:
+            orphans = CandidateSkill.objects.filter(skill__isnull=True).order_by("pk")
+            if last_id:
+                orphans = orphans.filter(pk__gt=last_id)
+            batch = list(orphans.only("id", "profile_id", "name", "normalized_name")[:batch_size])
+            if not batch:
+                break
+
+            to_update = []
+            profile_ids = set()
+            for row in batch:
+                normalized = row.normalized_name or normalize_skill_name(row.name)
+                skill_id = skill_index.exact_id(normalized)
+                if skill_id is None:
+                    alias_ids = skill_index.resolve(normalized)
+                    if len(alias_ids) == 1:
+                        skill_id = alias_ids[0]
+                    elif alias_ids:
+                        ambiguous += 1
+                if skill_id is None:
+                    continue
+                row.skill_id = skill_id
+                row.normalized_name = normalized
+                to_update.append(row)
+                profile_ids.add(row.profile_id)
+
+            if to_update:
+                CandidateSkill.objects.bulk_update(to_update, ["skill", "normalized_name"])
+                # Refresh this batch's documents before moving past it, so an
+                # interrupted run resumed with --start-after leaves none stale.
+                rebuild_search_documents(
+                    queryset=CandidateProfile.objects.filter(pk__in=profile_ids)
+                )
+                bump_search_generation()
+            scanned += len(batch)
+            linked += len(to_update)
+            last_id = str(batch[-1].pk)
+            self.stdout.write(
+                self.style.SUCCESS(f"Scanned {scanned} orphans, linked {linked} (last id {last_id})...")
+            )
+
+        total = CandidateSkill.objects.count()
+        remaining = CandidateSkill.objects.filter(skill__isnull=True).count()
+        coverage = 100.0 * (total - remaining) / total if total else 100.0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Link complete. Scanned {scanned}, linked {linked}, ambiguous {ambiguous}, "
+                f"unlinked {remaining} of {total} rows ({coverage:.1f}% linked)."
+            )
+        )
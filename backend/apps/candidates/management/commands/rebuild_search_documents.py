@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.candidates.services.search_document import rebuild_search_documents
+
+
+class Command(BaseCommand):
+    help = "Rebuild the denormalized candidate search documents in bulk."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of documents written per bulk upsert",
+        )
+
+    def handle(self, *args, **options):
+        indexed = rebuild_search_documents(batch_size=max(1, options["batch_size"]))
+        self.stdout.write(self.style.SUCCESS(f"Rebuild complete. Indexed {indexed} profiles."))
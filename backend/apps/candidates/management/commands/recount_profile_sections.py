@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+
+from apps.candidates.models import CandidateProfile
+from apps.candidates.utils.profile_completion import (
+    calculate_profile_completion,
+    store_profile_completion,
+)
+from apps.candidates.utils.section_counts import recount_sections, section_count_expressions
+
+
+class Command(BaseCommand):
+    help = "Recount stored skill/employment/education/project counters and fix completion."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of profiles recounted per UPDATE",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        expressions = section_count_expressions()
+        drifted = Q()
+        for field in expressions:
+            drifted |= ~Q(**{field: F(f"actual_{field}")})
+        stale_ids = list(
+            CandidateProfile.objects.annotate(
+                **{f"actual_{field}": expression for field, expression in expressions.items()}
+            )
+            .filter(drifted)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+        changed = 0
+        for start in range(0, len(stale_ids), batch_size):
+            chunk = CandidateProfile.objects.filter(pk__in=stale_ids[start:start + batch_size])
+            recount_sections(chunk)
+            batch = []
+            for profile in chunk:
+                percent, _ = calculate_profile_completion(profile)
+                if percent != profile.profile_completion_percent:
+                    profile.profile_completion_percent = percent
+                    batch.append(profile)
+            # The documents are built from the child rows, not the counters,
+            # so only a completion change makes one stale.
+            if batch:
+                changed += store_profile_completion(batch)
+            self.stdout.write(self.style.SUCCESS(f"Recounted {start + len(chunk)} profiles..."))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recount complete. Fixed counters on {len(stale_ids)} profiles, "
+                f"updated completion on {changed}."
+            )
+        )
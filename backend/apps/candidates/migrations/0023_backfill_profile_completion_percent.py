@@ -0,0 +1,68 @@
+from django.db import migrations
+
+
+def _has_availability(profile):
+    # mirror utils.profile_completion._has_availability
+    notice_code = profile.notice_period_code
+    if notice_code in (None, "", 0, "0"):
+        return True
+    if isinstance(notice_code, str) and notice_code.strip():
+        return True
+    return bool(profile.availability_to_join)
+
+
+def backfill_profile_completion(apps, schema_editor):
+    CandidateProfile = apps.get_model("candidates", "CandidateProfile")
+    qs = CandidateProfile.objects.filter(profile_completion_percent=0).prefetch_related(
+        "skills",
+        "employments",
+        "educations",
+        "projects",
+    )
+
+    batch = []
+    for profile in qs.iterator(chunk_size=500):
+        total = 0
+        # mirror utils.profile_completion weights
+        if profile.full_name:
+            total += 5
+        if profile.email:
+            total += 5
+        if profile.phone:
+            total += 5
+        if profile.location:
+            total += 5
+        if profile.work_status:
+            total += 5
+        if _has_availability(profile):
+            total += 5
+        if profile.summary:
+            total += 15
+        if list(profile.skills.all()):
+            total += 15
+        if list(profile.employments.all()):
+            total += 15
+        if list(profile.educations.all()):
+            total += 15
+        if list(profile.projects.all()):
+            total += 5
+        if profile.resume_file:
+            total += 10
+
+        profile.profile_completion_percent = min(total, 100)
+        batch.append(profile)
+        if len(batch) >= 500:
+            CandidateProfile.objects.bulk_update(batch, ["profile_completion_percent"])
+            batch = []
+    if batch:
+        CandidateProfile.objects.bulk_update(batch, ["profile_completion_percent"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("candidates", "0022_remove_candidateprofile_marital_status_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_profile_completion, migrations.RunPython.noop),
+    ]
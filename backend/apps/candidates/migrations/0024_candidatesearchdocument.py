@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0023_backfill_profile_completion_percent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateSearchDocument',
+            fields=[
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='candidates.candidateprofile')),
+                ('full_name', models.CharField(blank=True, max_length=200)),
+                ('summary', models.TextField(blank=True)),
+                ('skills', models.TextField(blank=True)),
+                ('skill_ids', models.TextField(blank=True)),
+                ('location', models.CharField(blank=True, max_length=200)),
+                ('city', models.CharField(blank=True, max_length=120)),
+                ('state', models.CharField(blank=True, max_length=120)),
+                ('country', models.CharField(blank=True, max_length=120)),
+                ('total_experience_months', models.PositiveIntegerField(default=0)),
+                ('current_title', models.CharField(blank=True, max_length=200)),
+                ('current_company', models.CharField(blank=True, max_length=200)),
+                ('highest_degree', models.CharField(blank=True, max_length=200)),
+                ('degrees', models.TextField(blank=True)),
+                ('work_status', models.CharField(blank=True, max_length=20)),
+                ('availability_to_join', models.CharField(blank=True, max_length=30)),
+                ('gender', models.CharField(blank=True, max_length=20)),
+                ('notice_period_code', models.CharField(blank=True, max_length=30, null=True)),
+                ('expected_salary', models.PositiveIntegerField(blank=True, null=True)),
+                ('profile_completion_percent', models.PositiveSmallIntegerField(default=0)),
+                ('is_searchable', models.BooleanField(default=False)),
+                ('last_active_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(blank=True, null=True)),
+                ('indexed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['is_searchable', 'profile_completion_percent'], name='candidates__is_sear_296690_idx'), models.Index(fields=['location'], name='candidates__locatio_efb992_idx'), models.Index(fields=['city'], name='candidates__city_457f02_idx'), models.Index(fields=['state'], name='candidates__state_d0009a_idx'), models.Index(fields=['country'], name='candidates__country_6b13d6_idx'), models.Index(fields=['total_experience_months'], name='candidates__total_e_7cba3e_idx'), models.Index(fields=['expected_salary'], name='candidates__expecte_6c51cb_idx'), models.Index(fields=['notice_period_code'], name='candidates__notice__adeb15_idx'), models.Index(fields=['last_active_at'], name='candidates__last_ac_48915c_idx'), models.Index(fields=['created_at'], name='candidates__created_1b13e8_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,77 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:15
+
+from django.db import migrations, models
+
+
+def backfill_current_employment(apps, schema_editor):
+    CandidateProfile = apps.get_model("candidates", "CandidateProfile")
+    CandidateEmployment = apps.get_model("candidates", "CandidateEmployment")
+    fields = [
+        "current_title",
+        "current_company",
+        "current_start_date",
+        "current_end_date",
+        "current_is_current",
+    ]
+
+    # mirror utils.current_employment.sync_current_employment ordering
+    employments = CandidateEmployment.objects.order_by(
+        "profile_id", "-is_current", "-start_date"
+    ).iterator(chunk_size=2000)
+    batch = []
+    last_profile_id = None
+    for employment in employments:
+        if employment.profile_id == last_profile_id:
+            continue
+        last_profile_id = employment.profile_id
+        batch.append(
+            CandidateProfile(
+                id=employment.profile_id,
+                current_title=employment.title,
+                current_company=employment.company,
+                current_start_date=employment.start_date,
+                current_end_date=employment.end_date,
+                current_is_current=employment.is_current,
+            )
+        )
+        if len(batch) >= 500:
+            CandidateProfile.objects.bulk_update(batch, fields)
+            batch = []
+    if batch:
+        CandidateProfile.objects.bulk_update(batch, fields)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0024_candidatesearchdocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='current_company',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='current_end_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='current_is_current',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='current_start_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='current_title',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.RunPython(backfill_current_employment, migrations.RunPython.noop),
+    ]
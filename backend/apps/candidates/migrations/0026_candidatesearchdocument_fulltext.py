@@ -0,0 +1,87 @@
+import uuid
+
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE candidates_candidatesearchdocument
+    ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple'::regconfig, coalesce(full_name, '')), 'A')
+        || setweight(to_tsvector('simple'::regconfig, replace(coalesce(skills, ''), '|', ' ')), 'A')
+        || setweight(to_tsvector('simple'::regconfig, coalesce(current_title, '')), 'B')
+        || setweight(to_tsvector('simple'::regconfig, coalesce(summary, '')), 'C')
+    ) STORED
+    """,
+    """
+    CREATE INDEX candidates_searchdoc_fts_idx
+    ON candidates_candidatesearchdocument USING gin (search_vector)
+    """,
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS candidates_searchdoc_fts_idx",
+    "ALTER TABLE candidates_candidatesearchdocument DROP COLUMN IF EXISTS search_vector",
+]
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS candidates_search_fts USING fts5(
+        profile_id UNINDEXED,
+        full_name,
+        skills,
+        current_title,
+        summary,
+        tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+]
+SQLITE_REVERSE = ["DROP TABLE IF EXISTS candidates_search_fts"]
+
+
+def create_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        for statement in POSTGRES_FORWARD:
+            schema_editor.execute(statement)
+    elif vendor == "sqlite":
+        for statement in SQLITE_FORWARD:
+            schema_editor.execute(statement)
+        # mirror services.fulltext.SqliteFullTextEngine.index_documents
+        CandidateSearchDocument = apps.get_model("candidates", "CandidateSearchDocument")
+        rows = []
+        for document in CandidateSearchDocument.objects.iterator(chunk_size=1000):
+            profile_hex = uuid.UUID(str(document.profile_id)).hex
+            rows.append(
+                (
+                    int(profile_hex[:15], 16),
+                    profile_hex,
+                    document.full_name,
+                    document.skills.replace("|", " "),
+                    document.current_title,
+                    document.summary,
+                )
+            )
+        if rows:
+            with schema_editor.connection.cursor() as cursor:
+                cursor.executemany(
+                    "INSERT INTO candidates_search_fts"
+                    "(rowid, profile_id, full_name, skills, current_title, summary) "
+                    "VALUES (%s, %s, %s, %s, %s, %s)",
+                    rows,
+                )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {"postgresql": POSTGRES_REVERSE, "sqlite": SQLITE_REVERSE}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("candidates", "0025_candidateprofile_current_employment"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations
+
+
+# Postgres only: SQLite substring lookups go through apps.skills.ngram instead.
+TRIGRAM_INDEXES = {
+    # skill filters use __contains on the already lower-cased column
+    "candidates_skill_normalized_trgm_idx": (
+        "candidates_candidateskill",
+        "normalized_name gin_trgm_ops",
+    ),
+    "candidates_searchdoc_skills_trgm_idx": (
+        "candidates_candidatesearchdocument",
+        "skills gin_trgm_ops",
+    ),
+    # matches the UPPER(...) LIKE UPPER(...) that Django emits for icontains
+    "candidates_profile_full_name_trgm_idx": (
+        "candidates_candidateprofile",
+        "(UPPER(full_name::text)) gin_trgm_ops",
+    ),
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, (table, expression) in TRIGRAM_INDEXES.items():
+        schema_editor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} USING gin ({expression})")
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("skills", "0003_skill_normalized_name_trigram"),
+        ("candidates", "0026_candidatesearchdocument_fulltext"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
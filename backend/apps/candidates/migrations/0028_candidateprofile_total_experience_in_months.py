@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:25
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_total_experience(apps, schema_editor):
+    CandidateProfile = apps.get_model("candidates", "CandidateProfile")
+    # mirror CandidateProfile.save
+    CandidateProfile.objects.update(
+        total_experience_in_months=F("total_experience_years") * 12 + F("total_experience_months")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0027_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='total_experience_in_months',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_total_experience, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='candidateprofile',
+            index=models.Index(fields=['total_experience_in_months'], name='candidates__total_e_6f9592_idx'),
+        ),
+    ]
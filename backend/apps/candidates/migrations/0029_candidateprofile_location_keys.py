@@ -0,0 +1,71 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:26
+
+from django.db import migrations, models
+
+
+def backfill_location_keys(apps, schema_editor):
+    CandidateProfile = apps.get_model("candidates", "CandidateProfile")
+    # mirror models.LOCATION_KEY_FIELDS / normalize_skill_name
+    fields = {
+        "location": "location_key",
+        "current_city": "city_key",
+        "current_state": "state_key",
+        "country": "country_key",
+    }
+    batch = []
+    for profile in CandidateProfile.objects.only("id", *fields).iterator(chunk_size=2000):
+        for source, key in fields.items():
+            setattr(profile, key, " ".join((getattr(profile, source) or "").lower().split()))
+        batch.append(profile)
+        if len(batch) >= 500:
+            CandidateProfile.objects.bulk_update(batch, list(fields.values()))
+            batch = []
+    if batch:
+        CandidateProfile.objects.bulk_update(batch, list(fields.values()))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0028_candidateprofile_total_experience_in_months'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='city_key',
+            field=models.CharField(blank=True, default='', max_length=120),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='country_key',
+            field=models.CharField(blank=True, default='', max_length=120),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='location_key',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='state_key',
+            field=models.CharField(blank=True, default='', max_length=120),
+        ),
+        migrations.RunPython(backfill_location_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='candidateprofile',
+            index=models.Index(fields=['location_key'], name='candidates__locatio_af127d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidateprofile',
+            index=models.Index(fields=['city_key'], name='candidates__city_ke_146702_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidateprofile',
+            index=models.Index(fields=['state_key'], name='candidates__state_k_8a9370_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='candidateprofile',
+            index=models.Index(fields=['country_key'], name='candidates__country_0d2b58_idx'),
+        ),
+    ]
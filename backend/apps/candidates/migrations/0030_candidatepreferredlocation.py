@@ -0,0 +1,55 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+def backfill_preferred_locations(apps, schema_editor):
+    CandidateProfile = apps.get_model("candidates", "CandidateProfile")
+    CandidatePreferredLocation = apps.get_model("candidates", "CandidatePreferredLocation")
+    # mirror utils.preferred_locations.preferred_location_keys
+    batch = []
+    profiles = CandidateProfile.objects.exclude(preferred_locations=[]).only(
+        "id", "preferred_locations"
+    )
+    for profile in profiles.iterator(chunk_size=2000):
+        keys = []
+        for value in profile.preferred_locations or []:
+            key = " ".join(value.lower().split()) if isinstance(value, str) else ""
+            if key and key not in keys:
+                keys.append(key)
+        batch.extend(
+            CandidatePreferredLocation(profile_id=profile.id, normalized_name=key) for key in keys
+        )
+        if len(batch) >= 1000:
+            CandidatePreferredLocation.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        CandidatePreferredLocation.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0029_candidateprofile_location_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidatePreferredLocation',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('normalized_name', models.CharField(max_length=200)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='preferred_location_entries', to='candidates.candidateprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['normalized_name', 'profile'], name='candidates__normali_c6b23a_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='candidatepreferredlocation',
+            constraint=models.UniqueConstraint(fields=('profile', 'normalized_name'), name='candidates_preferred_location_uniq'),
+        ),
+        migrations.RunPython(backfill_preferred_locations, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:46
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_section_counts(apps, schema_editor):
+    CandidateProfile = apps.get_model("candidates", "CandidateProfile")
+    # mirror utils.section_counts.recount_sections
+    expressions = {}
+    for field, model_name in (
+        ("skills_count", "CandidateSkill"),
+        ("employments_count", "CandidateEmployment"),
+        ("educations_count", "CandidateEducation"),
+        ("projects_count", "CandidateProject"),
+    ):
+        model = apps.get_model("candidates", model_name)
+        counts = (
+            model.objects.filter(profile=OuterRef("pk"))
+            .order_by()
+            .values("profile")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        expressions[field] = Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+    CandidateProfile.objects.update(**expressions)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('candidates', '0030_candidatepreferredlocation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='educations_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='employments_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='projects_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='candidateprofile',
+            name='skills_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_section_counts, migrations.RunPython.noop),
+    ]
@@ -5,6 +5,15 @@ from django.db import models
 from apps.skills.models import Skill, normalize_skill_name
 
 
+# Profile location column -> normalized key column.
+LOCATION_KEY_FIELDS = {
+    "location": "location_key",
+    "current_city": "city_key",
+    "current_state": "state_key",
+    "country": "country_key",
+}
+
+
 class CandidateProfile(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.OneToOneField(
@@ -28,11 +37,20 @@ class CandidateProfile(models.Model):
     nationality = models.CharField(max_length=120, blank=True)
     preferred_locations = models.JSONField(default=list, blank=True)
     work_authorization_country = models.CharField(max_length=120, blank=True)
+    # Normalized (normalize_skill_name) copies of the location columns for
+    # indexed equality filters; maintained in save().
+    location_key = models.CharField(max_length=200, blank=True, default="")
+    city_key = models.CharField(max_length=120, blank=True, default="")
+    state_key = models.CharField(max_length=120, blank=True, default="")
+    country_key = models.CharField(max_length=120, blank=True, default="")
     total_experience_years = models.PositiveSmallIntegerField(default=0)
     total_experience_months = models.PositiveSmallIntegerField(
         default=0,
         validators=[MinValueValidator(0), MaxValueValidator(11)],
     )
+    # years * 12 + months, maintained in save() so experience filters can
+    # use an index range scan.
+    total_experience_in_months = models.PositiveIntegerField(default=0)
     notice_period_days = models.PositiveIntegerField(null=True, blank=True)
     notice_period_code = models.CharField(max_length=30, null=True, blank=True)
     expected_salary = models.PositiveIntegerField(null=True, blank=True)
@@ -40,12 +58,25 @@ class CandidateProfile(models.Model):
     last_active_at = models.DateTimeField(null=True, blank=True)
     profile_updated_at = models.DateTimeField(null=True, blank=True)
     freshness_at = models.DateTimeField(null=True, blank=True)
+    # Denormalized copy of the current (or most recent) employment, kept in
+    # sync by the employment views via utils.current_employment.
+    current_title = models.CharField(max_length=200, blank=True, default="")
+    current_company = models.CharField(max_length=200, blank=True, default="")
+    current_start_date = models.DateField(null=True, blank=True)
+    current_end_date = models.DateField(null=True, blank=True)
+    current_is_current = models.BooleanField(default=False)
     resume_file = models.FileField(upload_to="resumes/", null=True, blank=True)
     photo_file = models.FileField(upload_to="profile-photos/", null=True, blank=True)
     profile_completion_percent = models.PositiveSmallIntegerField(
         default=0,
         validators=[MinValueValidator(0), MaxValueValidator(100)],
     )
+    # Child row counts, kept by the section views via utils.section_counts so
+    # completion never has to read the child tables.
+    skills_count = models.PositiveIntegerField(default=0)
+    employments_count = models.PositiveIntegerField(default=0)
+    educations_count = models.PositiveIntegerField(default=0)
+    projects_count = models.PositiveIntegerField(default=0)
     is_searchable = models.BooleanField(default=False)
     updated_at = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -62,11 +93,57 @@ class CandidateProfile(models.Model):
             models.Index(fields=["last_active_at"]),
             models.Index(fields=["profile_updated_at"]),
             models.Index(fields=["freshness_at"]),
+            models.Index(fields=["total_experience_in_months"]),
+            models.Index(fields=["location_key"]),
+            models.Index(fields=["city_key"]),
+            models.Index(fields=["state_key"]),
+            models.Index(fields=["country_key"]),
         ]
 
     def __str__(self):
         return self.full_name
 
+    def save(self, *args, **kwargs):
+        self.total_experience_in_months = (
+            (self.total_experience_years or 0) * 12 + (self.total_experience_months or 0)
+        )
+        for source, key in LOCATION_KEY_FIELDS.items():
+            setattr(self, key, normalize_skill_name(getattr(self, source) or ""))
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if {"total_experience_years", "total_experience_months"} & update_fields:
+                update_fields.add("total_experience_in_months")
+            update_fields.update(
+                key for source, key in LOCATION_KEY_FIELDS.items() if source in update_fields
+            )
+            kwargs["update_fields"] = update_fields
+        super().save(*args, **kwargs)
+
+
+class CandidatePreferredLocation(models.Model):
+    """Normalized rows of CandidateProfile.preferred_locations for indexed lookups."""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    profile = models.ForeignKey(
+        CandidateProfile,
+        on_delete=models.CASCADE,
+        related_name="preferred_location_entries",
+    )
+    normalized_name = models.CharField(max_length=200)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["profile", "normalized_name"],
+                name="candidates_preferred_location_uniq",
+            ),
+        ]
+        indexes = [models.Index(fields=["normalized_name", "profile"])]
+
+    def __str__(self):
+        return self.normalized_name
+
 
 class CandidateSkill(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -163,3 +240,63 @@ class CandidateProject(models.Model):
 
     def __str__(self):
         return self.title
+
+
+class CandidateSearchDocument(models.Model):
+    """
+    Flat, per-candidate read model for employer search.
+
+    Rebuilt from the profile and its child rows on every profile write (see
+    services.search_document) so scalar search filters run against this one
+    table. Text columns hold normalized values; the "|"-delimited multi-valued
+    ones feed the keyword index and display only - skill and education
+    filters use the indexed CandidateSkill and CandidateEducation rows.
+    """
+
+    profile = models.OneToOneField(
+        CandidateProfile,
+        primary_key=True,
+        on_delete=models.CASCADE,
+        related_name="search_document",
+    )
+    full_name = models.CharField(max_length=200, blank=True)
+    summary = models.TextField(blank=True)
+    skills = models.TextField(blank=True)
+    skill_ids = models.TextField(blank=True)
+    location = models.CharField(max_length=200, blank=True)
+    city = models.CharField(max_length=120, blank=True)
+    state = models.CharField(max_length=120, blank=True)
+    country = models.CharField(max_length=120, blank=True)
+    total_experience_months = models.PositiveIntegerField(default=0)
+    current_title = models.CharField(max_length=200, blank=True)
+    current_company = models.CharField(max_length=200, blank=True)
+    highest_degree = models.CharField(max_length=200, blank=True)
+    degrees = models.TextField(blank=True)
+    work_status = models.CharField(max_length=20, blank=True)
+    availability_to_join = models.CharField(max_length=30, blank=True)
+    gender = models.CharField(max_length=20, blank=True)
+    notice_period_code = models.CharField(max_length=30, null=True, blank=True)
+    expected_salary = models.PositiveIntegerField(null=True, blank=True)
+    profile_completion_percent = models.PositiveSmallIntegerField(default=0)
+    is_searchable = models.BooleanField(default=False)
+    last_active_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(null=True, blank=True)
+    indexed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["is_searchable", "profile_completion_percent"]),
+            models.Index(fields=["location"]),
+            models.Index(fields=["city"]),
+            models.Index(fields=["state"]),
+            models.Index(fields=["country"]),
+            models.Index(fields=["total_experience_months"]),
+            models.Index(fields=["expected_salary"]),
+            models.Index(fields=["notice_period_code"]),
+            models.Index(fields=["last_active_at"]),
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self):
+        return self.full_name
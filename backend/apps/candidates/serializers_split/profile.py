@@ -2,6 +2,7 @@ from rest_framework import serializers
 from django.utils import timezone
 
 from ..models import CandidateProfile
+from ..utils.preferred_locations import sync_preferred_locations
 
 
 def _clean_preferred_locations(value):
@@ -26,6 +27,16 @@ def _clean_preferred_locations(value):
     return cleaned, None
 
 
+class PreferredLocationsSyncMixin:
+    """Keep the indexed CandidatePreferredLocation rows in step with the JSON list."""
+
+    def update(self, instance, validated_data):
+        instance = super().update(instance, validated_data)
+        if "preferred_locations" in validated_data:
+            sync_preferred_locations(instance)
+        return instance
+
+
 class CandidateProfileSerializer(serializers.ModelSerializer):
     resume_url = serializers.SerializerMethodField()
     resume_filename = serializers.SerializerMethodField()
@@ -88,7 +99,7 @@ class CandidateProfileSerializer(serializers.ModelSerializer):
         return ""
 
 
-class CandidateProfileUpdateSerializer(serializers.ModelSerializer):
+class CandidateProfileUpdateSerializer(PreferredLocationsSyncMixin, serializers.ModelSerializer):
     class Meta:
         model = CandidateProfile
         fields = (
@@ -162,7 +173,7 @@ class CandidateProfileUpdateSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class CandidatePersonalDetailsSerializer(serializers.ModelSerializer):
+class CandidatePersonalDetailsSerializer(PreferredLocationsSyncMixin, serializers.ModelSerializer):
     class Meta:
         model = CandidateProfile
         fields = (
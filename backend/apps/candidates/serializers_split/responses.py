@@ -26,14 +26,10 @@ class CandidateSearchSerializer(serializers.ModelSerializer):
     last_updated = serializers.DateTimeField(source="updated_at", read_only=True)
     profile_image_url = serializers.SerializerMethodField()
     resume_url = serializers.SerializerMethodField()
-    current_title = serializers.SerializerMethodField()
-    current_company = serializers.SerializerMethodField()
-    current_start_date = serializers.SerializerMethodField()
-    current_end_date = serializers.SerializerMethodField()
-    current_is_current = serializers.SerializerMethodField()
     employments = CandidateEmploymentSerializer(many=True, read_only=True)
     educations = CandidateEducationSerializer(many=True, read_only=True)
     profile_completion_percent = serializers.IntegerField(read_only=True)
+    keyword_rank = serializers.SerializerMethodField()
 
     class Meta:
         model = CandidateProfile
@@ -66,6 +62,7 @@ class CandidateSearchSerializer(serializers.ModelSerializer):
             "expected_salary",
             "salary_currency",
             "profile_completion_percent",
+            "keyword_rank",
         )
 
     def get_skills(self, obj):
@@ -92,28 +89,5 @@ class CandidateSearchSerializer(serializers.ModelSerializer):
             return obj.resume_file.url
         return ""
 
-    def _get_current_employment(self, obj):
-        current = obj.employments.filter(is_current=True).order_by("-start_date").first()
-        if current:
-            return current
-        return obj.employments.order_by("-start_date").first()
-
-    def get_current_title(self, obj):
-        employment = self._get_current_employment(obj)
-        return employment.title if employment else ""
-
-    def get_current_company(self, obj):
-        employment = self._get_current_employment(obj)
-        return employment.company if employment else ""
-
-    def get_current_start_date(self, obj):
-        employment = self._get_current_employment(obj)
-        return employment.start_date if employment else None
-
-    def get_current_end_date(self, obj):
-        employment = self._get_current_employment(obj)
-        return employment.end_date if employment else None
-
-    def get_current_is_current(self, obj):
-        employment = self._get_current_employment(obj)
-        return bool(employment.is_current) if employment else False
+    def get_keyword_rank(self, obj):
+        return getattr(obj, "keyword_rank", None)
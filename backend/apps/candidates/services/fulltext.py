@@ -0,0 +1,141 @@
+# Full-text keyword index over CandidateSearchDocument.
+#
+# Postgres: a generated ``search_vector`` tsvector column with a GIN index
+# (created in migration 0026), so rows never need explicit maintenance.
+# SQLite: an FTS5 shadow table keyed by a 60-bit integer derived from the
+# profile UUID, written from the same code paths that save documents.
+import re
+import uuid
+
+from django.conf import settings
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+
+FTS_TABLE = "candidates_search_fts"
+DOCUMENT_TABLE = "candidates_candidatesearchdocument"
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def fts_rowid(profile_id):
+    return int(uuid.UUID(str(profile_id)).hex[:15], 16)
+
+
+class PostgresFullTextEngine:
+    vendor = "postgresql"
+
+    def match_subquery(self, keywords):
+        return RawSQL(
+            f"SELECT profile_id FROM {DOCUMENT_TABLE} "
+            "WHERE search_vector @@ plainto_tsquery('simple', %s)",
+            [keywords],
+        )
+
+    def rank(self, keywords, profile_ids):
+        if not profile_ids:
+            return {}
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT profile_id, ts_rank(search_vector, plainto_tsquery('simple', %s)) "
+                f"FROM {DOCUMENT_TABLE} WHERE profile_id = ANY(%s::uuid[])",
+                [keywords, [str(pk) for pk in profile_ids]],
+            )
+            return {str(pk): float(score) for pk, score in cursor.fetchall()}
+
+    def index_documents(self, documents):
+        # search_vector is a generated column.
+        return None
+
+
+class SqliteFullTextEngine:
+    vendor = "sqlite"
+    # bm25 column weights: full_name, skills, current_title, summary
+    weights = (10.0, 8.0, 4.0, 1.0)
+
+    def build_match_query(self, keywords):
+        tokens = TOKEN_RE.findall(keywords.lower())
+        return " ".join(f'"{token}"' for token in tokens)
+
+    def match_subquery(self, keywords):
+        match = self.build_match_query(keywords)
+        if not match:
+            return None
+        return RawSQL(f"SELECT profile_id FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match])
+
+    def rank(self, keywords, profile_ids):
+        match = self.build_match_query(keywords)
+        if not match or not profile_ids:
+            return {}
+        hex_ids = [uuid.UUID(str(pk)).hex for pk in profile_ids]
+        placeholders = ",".join("%s" for _ in hex_ids)
+        weights = ", ".join(str(weight) for weight in self.weights)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT profile_id, -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND profile_id IN ({placeholders})",
+                [match, *hex_ids],
+            )
+            return {str(uuid.UUID(pk)): float(score) for pk, score in cursor.fetchall()}
+
+    def index_documents(self, documents):
+        rows = [
+            (
+                fts_rowid(document.profile_id),
+                uuid.UUID(str(document.profile_id)).hex,
+                document.full_name,
+                document.skills.replace("|", " "),
+                document.current_title,
+                document.summary,
+            )
+            for document in documents
+        ]
+        if not rows:
+            return
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"DELETE FROM {FTS_TABLE} WHERE rowid = %s",
+                [(row[0],) for row in rows],
+            )
+            cursor.executemany(
+                f"INSERT INTO {FTS_TABLE}(rowid, profile_id, full_name, skills, current_title, summary) "
+                "VALUES (%s, %s, %s, %s, %s, %s)",
+                rows,
+            )
+
+
+ENGINES = {
+    PostgresFullTextEngine.vendor: PostgresFullTextEngine(),
+    SqliteFullTextEngine.vendor: SqliteFullTextEngine(),
+}
+
+
+def get_fulltext_engine():
+    """Index engine for the active database, maintained regardless of settings."""
+    return ENGINES.get(connection.vendor)
+
+
+def get_keyword_engine():
+    """Engine used for keyword queries, or None for the icontains fallback."""
+    if getattr(settings, "CANDIDATE_KEYWORD_SEARCH", "basic") != "fulltext":
+        return None
+    return get_fulltext_engine()
+
+
+def index_documents(documents):
+    engine = get_fulltext_engine()
+    if engine is not None:
+        engine.index_documents(documents)
+
+
+def keyword_match_subquery(keywords):
+    engine = get_keyword_engine()
+    if engine is None:
+        return None
+    return engine.match_subquery(keywords)
+
+
+def keyword_rank(keywords, profile_ids):
+    engine = get_keyword_engine()
+    if engine is None or not keywords:
+        return {}
+    return engine.rank(keywords, profile_ids)
@@ -1,8 +1,13 @@
+import time
 from typing import Any
 
+from django.core.cache import cache
 from django.utils import timezone
 
 
+SEARCH_GENERATION_KEY = "candidates:search:generation"
+
+
 def has_value(value: Any) -> bool:
     if value is None:
         return False
@@ -15,6 +20,7 @@ def has_search_inputs(params: dict) -> bool:
         params.get("location"),
         params.get("city"),
         params.get("state"),
+        params.get("preferred_location"),
         params.get("country"),
         params.get("exp_min"),
         params.get("exp_max"),
@@ -33,7 +39,8 @@ def has_search_inputs(params: dict) -> bool:
     return any(has_value(value) for value in fields)
 
 
-def parse_updated_within(value: Any):
+def parse_updated_within_days(value: Any):
+    """Relative window of an ``updated_within`` token, in days (or None)."""
     if value is None:
         return None
     value = str(value).strip()
@@ -52,9 +59,34 @@ def parse_updated_within(value: Any):
         "1M": 30,
     }
     if upper in token_map:
-        return timezone.now() - timezone.timedelta(days=token_map[upper])
+        return token_map[upper]
     try:
-        days = int(value)
-        return timezone.now() - timezone.timedelta(days=days)
+        return int(value)
     except ValueError:
         return None
+
+
+def parse_updated_within(value: Any):
+    days = parse_updated_within_days(value)
+    if days is None:
+        return None
+    return timezone.now() - timezone.timedelta(days=days)
+
+
+def get_search_generation() -> int:
+    generation = cache.get(SEARCH_GENERATION_KEY)
+    if generation is None:
+        # Seed from the clock so an evicted key never revives result entries
+        # cached under an earlier generation.
+        seed = time.time_ns()
+        cache.add(SEARCH_GENERATION_KEY, seed, None)
+        generation = cache.get(SEARCH_GENERATION_KEY, seed)
+    return generation
+
+
+def bump_search_generation() -> None:
+    """Invalidate every cached search result after a candidate profile write."""
+    try:
+        cache.incr(SEARCH_GENERATION_KEY)
+    except ValueError:
+        cache.add(SEARCH_GENERATION_KEY, time.time_ns(), None)
@@ -0,0 +1,109 @@
+# Maintenance of the denormalized CandidateSearchDocument read model.
+from apps.skills.models import normalize_skill_name
+
+from ..models import CandidateProfile, CandidateSearchDocument
+from .fulltext import index_documents
+
+
+DOCUMENT_FIELDS = [
+    field.name
+    for field in CandidateSearchDocument._meta.concrete_fields
+    if not field.primary_key and field.name != "indexed_at"
+]
+
+DOCUMENT_PREFETCH = ("skills", "educations")
+
+
+def join_tokens(values):
+    """Serialize values as "|a|b|" so a whole token matches with contains="|a|"."""
+    tokens = []
+    seen = set()
+    for value in values:
+        token = str(value).replace("|", " ").strip()
+        if not token or token in seen:
+            continue
+        seen.add(token)
+        tokens.append(token)
+    if not tokens:
+        return ""
+    return "|" + "|".join(tokens) + "|"
+
+
+def pick_highest_education(educations):
+    # Degrees are free text, so the most recently completed one stands in for
+    # the highest qualification.
+    educations = sorted(
+        educations,
+        key=lambda item: (item.end_year or 0, item.start_year or 0),
+        reverse=True,
+    )
+    return educations[0] if educations else None
+
+
+def build_search_document(profile):
+    skills = list(profile.skills.all())
+    educations = list(profile.educations.all())
+    highest = pick_highest_education(educations)
+
+    return CandidateSearchDocument(
+        profile=profile,
+        full_name=profile.full_name or "",
+        summary=profile.summary or "",
+        skills=join_tokens(skill.normalized_name or normalize_skill_name(skill.name) for skill in skills),
+        skill_ids=join_tokens(skill.skill_id for skill in skills if skill.skill_id),
+        location=profile.location_key,
+        city=profile.city_key,
+        state=profile.state_key,
+        country=profile.country_key,
+        total_experience_months=profile.total_experience_in_months,
+        current_title=profile.current_title or "",
+        current_company=profile.current_company or "",
+        highest_degree=highest.degree if highest else "",
+        degrees=join_tokens(education.degree for education in educations),
+        work_status=profile.work_status or "",
+        availability_to_join=profile.availability_to_join or "",
+        gender=profile.gender or "",
+        notice_period_code=profile.notice_period_code,
+        expected_salary=profile.expected_salary,
+        profile_completion_percent=profile.profile_completion_percent or 0,
+        is_searchable=bool(profile.is_searchable and profile.user.is_active),
+        last_active_at=profile.last_active_at,
+        created_at=profile.created_at,
+        updated_at=profile.updated_at,
+    )
+
+
+def refresh_search_document(profile):
+    document = build_search_document(profile)
+    document.save()
+    index_documents([document])
+    return document
+
+
+def rebuild_search_documents(batch_size=500, queryset=None):
+    """Rebuild documents in bulk; returns the number of profiles indexed."""
+    if queryset is None:
+        queryset = CandidateProfile.objects.all()
+    queryset = queryset.select_related("user").prefetch_related(*DOCUMENT_PREFETCH).order_by("pk")
+
+    indexed = 0
+    batch = []
+    for profile in queryset.iterator(chunk_size=batch_size):
+        batch.append(build_search_document(profile))
+        if len(batch) >= batch_size:
+            indexed += _write_batch(batch)
+            batch = []
+    if batch:
+        indexed += _write_batch(batch)
+    return indexed
+
+
+def _write_batch(documents):
+    CandidateSearchDocument.objects.bulk_create(
+        documents,
+        update_conflicts=True,
+        unique_fields=["profile"],
+        update_fields=DOCUMENT_FIELDS + ["indexed_at"],
+    )
+    index_documents(documents)
+    return len(documents)
@@ -1,12 +1,25 @@
 from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
 
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework.test import APITestCase
 
 from apps.accounts.models import User
-from apps.candidates.models import CandidateProfile
+from apps.candidates.models import CandidateProfile, CandidateSearchDocument, CandidateSkill
+from apps.candidates.serializers import CandidateSearchSerializer
+from apps.candidates.services.search import get_search_generation
+from apps.candidates.services.search_document import rebuild_search_documents
+from apps.candidates.utils.profile_completion import calculate_profile_completion
+from apps.candidates.utils import skills as skills_utils
+from apps.candidates.utils.skills import resolve_master_skills
+from apps.skills.models import Skill, SkillPopularityDelta
+from apps.skills.popularity import record_skill_popularity
 
 
 class CandidateProfileFlowTests(APITestCase):
@@ -78,3 +91,238 @@ class CandidateProfileFlowTests(APITestCase):
         payload = response.json()
         self.assertIn("profile", payload)
         self.assertTrue(payload["profile"].get("resume_url"))
+
+    def test_backfill_command_replaces_zero_placeholder(self):
+        CandidateSkill.objects.create(profile=self.profile, name="Python")
+        self.assertEqual(self.profile.profile_completion_percent, 0)
+
+        generation = get_search_generation()
+        with self.assertNumQueries(8):
+            call_command("backfill_profile_completion", stdout=StringIO())
+
+        self.profile.refresh_from_db()
+        self.assertGreater(self.profile.profile_completion_percent, 0)
+        document = CandidateSearchDocument.objects.get(profile=self.profile)
+        self.assertEqual(document.profile_completion_percent, self.profile.profile_completion_percent)
+        self.assertNotEqual(get_search_generation(), generation)
+
+    def test_skill_write_refreshes_search_document(self):
+        url = reverse("candidate-skill-create")
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post(url, {"name": "Django  REST"}, format="json")
+            self.assertFalse(CandidateSearchDocument.objects.filter(profile=self.profile).exists())
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(callbacks)
+
+        document = CandidateSearchDocument.objects.get(profile=self.profile)
+        self.assertEqual(document.skills, "|django rest|")
+        self.assertEqual(document.location, "bangalore")
+        self.assertGreater(document.profile_completion_percent, 0)
+
+    def test_profile_update_bumps_search_generation_after_commit(self):
+        generation = get_search_generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse("candidate-profile"), {"summary": "Backend engineer"}, format="json"
+            )
+            self.assertEqual(get_search_generation(), generation)
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(get_search_generation(), generation)
+
+    def test_employment_views_keep_current_employment_on_profile(self):
+        url = reverse("candidate-employment-create")
+        current = self.client.post(
+            url,
+            {"company": "Acme", "title": "Lead Engineer", "start_date": "2022-01-01", "is_current": True},
+            format="json",
+        )
+        self.assertEqual(current.status_code, 201)
+        self.client.post(
+            url,
+            {"company": "Initech", "title": "Engineer", "start_date": "2019-01-01", "end_date": "2021-12-31"},
+            format="json",
+        )
+
+        profile = CandidateProfile.objects.prefetch_related(
+            "skills", "employments", "educations"
+        ).get(id=self.profile.id)
+        self.assertEqual(profile.current_title, "Lead Engineer")
+        with self.assertNumQueries(0):
+            data = CandidateSearchSerializer(profile).data
+        self.assertEqual(data["current_company"], "Acme")
+        self.assertTrue(data["current_is_current"])
+
+        delete_url = reverse(
+            "candidate-employment-update-delete",
+            kwargs={"employment_id": current.json()["id"]},
+        )
+        self.client.delete(delete_url)
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.current_company, "Initech")
+        self.assertFalse(self.profile.current_is_current)
+        self.assertEqual(str(self.profile.current_end_date), "2021-12-31")
+
+    def test_total_experience_in_months_tracks_years_and_months(self):
+        self.profile.total_experience_years = 2
+        self.profile.total_experience_months = 6
+        self.profile.save(update_fields=["total_experience_years", "total_experience_months"])
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.total_experience_in_months, 30)
+
+    def test_personal_details_sync_preferred_location_rows(self):
+        url = reverse("candidate-profile-personal")
+        response = self.client.patch(
+            url, {"preferred_locations": ["Bengaluru", " pune ", "PUNE"]}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(self.profile.preferred_location_entries.values_list("normalized_name", flat=True)),
+            ["bengaluru", "pune"],
+        )
+
+        self.client.patch(url, {"preferred_locations": ["Chennai", "Pune"]}, format="json")
+        self.assertEqual(
+            sorted(self.profile.preferred_location_entries.values_list("normalized_name", flat=True)),
+            ["chennai", "pune"],
+        )
+
+    def test_link_candidate_skills_links_orphans_by_name_and_alias(self):
+        python = Skill.objects.create(name="Python")
+        javascript = Skill.objects.create(name="JavaScript", alt_labels="JS")
+        for name in ("python", "JS", "Cobol"):
+            CandidateSkill.objects.create(profile=self.profile, name=name)
+
+        out = StringIO()
+        command_module = "apps.candidates.management.commands.link_candidate_skills"
+        with patch(
+            f"{command_module}.rebuild_search_documents",
+            wraps=rebuild_search_documents,
+        ) as rebuild:
+            call_command("link_candidate_skills", "--batch-size", "1", stdout=out)
+        # Documents are refreshed per linked batch, not once at the end.
+        self.assertEqual(rebuild.call_count, 2)
+
+        linked = dict(
+            CandidateSkill.objects.filter(profile=self.profile).values_list("name", "skill_id")
+        )
+        self.assertEqual(linked, {"python": python.id, "JS": javascript.id, "Cobol": None})
+        self.assertIn("linked 2", out.getvalue())
+        self.assertIn("unlinked 1 of 3 rows (66.7% linked)", out.getvalue())
+        self.assertIn(
+            f"|{python.id}|",
+            CandidateSearchDocument.objects.get(profile=self.profile).skill_ids,
+        )
+
+    def test_bulk_skill_upsert_resolves_skills_in_constant_queries(self):
+        url = reverse("candidate-skill-bulk")
+        python = Skill.objects.create(name="Python", popularity=3)
+        django_skill = Skill.objects.create(name="Django", popularity=7)
+
+        def put_skills(skills):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.put(url, {"skills": skills}, format="json")
+            self.assertEqual(response.status_code, 200)
+            return len(queries)
+
+        small = put_skills([{"name": "Python"}, {"name": "Django", "id": django_skill.id}])
+        python.refresh_from_db()
+        self.assertEqual(python.popularity, 3)
+        call_command("flush_skill_popularity", stdout=StringIO())
+        python.refresh_from_db()
+        django_skill.refresh_from_db()
+        self.assertEqual((python.popularity, django_skill.popularity), (4, 7))
+
+        CandidateSkill.objects.filter(profile=self.profile).delete()
+        names = [{"name": "Python"}, {"name": "Django", "id": django_skill.id}]
+        names += [{"name": f"Skill {index}"} for index in range(20)]
+        large = put_skills(names)
+        self.assertLessEqual(large, small + 2)
+        self.assertEqual(Skill.objects.get(normalized_name="skill 7").popularity, 1)
+        self.assertEqual(
+            CandidateSkill.objects.filter(profile=self.profile, skill__isnull=False).count(), 22
+        )
+
+    def test_skill_created_by_a_racing_writer_gets_a_popularity_delta(self):
+        real_insert_skills = skills_utils.insert_new_skills
+
+        def racing_insert_skills(skills):
+            # Another request inserts "rust" between the lookup and this insert.
+            Skill.objects.bulk_create(
+                [Skill(name="Rust", normalized_name="rust", popularity=1)], ignore_conflicts=True
+            )
+            return real_insert_skills(skills)
+
+        with patch.object(skills_utils, "insert_new_skills", side_effect=racing_insert_skills):
+            resolved = resolve_master_skills(
+                [{"name": "Rust", "normalized": "rust"}, {"name": "Go", "normalized": "go"}]
+            )
+        self.assertEqual(
+            list(SkillPopularityDelta.objects.values_list("skill_id", flat=True)), [resolved["rust"].id]
+        )
+        self.assertEqual(Skill.objects.get(normalized_name="go").popularity, 1)
+
+    def test_popularity_deltas_are_flushed_and_reconciled(self):
+        python = Skill.objects.create(name="Python", popularity=10)
+        for _ in range(3):
+            record_skill_popularity([python.id])
+
+        out = StringIO()
+        call_command("flush_skill_popularity", "--batch-size", "2", stdout=out)
+        self.assertIn("Applied 3 deltas", out.getvalue())
+        python.refresh_from_db()
+        self.assertEqual(python.popularity, 13)
+        self.assertFalse(SkillPopularityDelta.objects.exists())
+
+        CandidateSkill.objects.create(profile=self.profile, name="Python", skill=python)
+        record_skill_popularity([python.id])
+        call_command("reconcile_skill_popularity", stdout=StringIO())
+        python.refresh_from_db()
+        self.assertEqual(python.popularity, 1)
+        self.assertFalse(SkillPopularityDelta.objects.exists())
+
+        with patch("apps.skills.popularity.POPULARITY_BACKLOG_CHECK_INTERVAL", 1), patch(
+            "apps.skills.popularity.POPULARITY_BACKLOG_WARNING", 1
+        ), self.assertLogs("apps.skills.popularity", level="WARNING") as logs:
+            record_skill_popularity([python.id, python.id])
+        self.assertIn("2 skill popularity deltas are pending", logs.output[0])
+
+    def test_section_counters_drive_completion_and_can_be_recounted(self):
+        self.client.post(reverse("candidate-skill-create"), {"name": "Python"}, format="json")
+        self.client.put(
+            reverse("candidate-skill-bulk"),
+            {"skills": ["Python", "Django", "SQL"]},
+            format="json",
+        )
+        project = self.client.post(
+            reverse("candidate-project-create"),
+            {"title": "Search", "status": "IN_PROGRESS", "worked_from_year": 2024, "worked_from_month": 1},
+            format="json",
+        )
+        self.assertEqual(project.status_code, 201)
+        self.profile.refresh_from_db()
+        self.assertEqual((self.profile.skills_count, self.profile.projects_count), (3, 1))
+
+        with self.assertNumQueries(0):
+            percent, missing = calculate_profile_completion(self.profile)
+        missing_keys = {entry["key"] for entry in missing}
+        self.assertNotIn("skills", missing_keys)
+        self.assertIn("employment", missing_keys)
+
+        self.client.delete(
+            reverse("candidate-project-update-delete", kwargs={"project_id": project.json()["id"]})
+        )
+        self.profile.refresh_from_db()
+        self.assertEqual(self.profile.projects_count, 0)
+
+        CandidateProfile.objects.filter(pk=self.profile.pk).update(
+            skills_count=0, educations_count=4, profile_completion_percent=0
+        )
+        out = StringIO()
+        call_command("recount_profile_sections", stdout=out)
+        self.assertIn("Fixed counters on 1 profiles", out.getvalue())
+        self.profile.refresh_from_db()
+        self.assertEqual((self.profile.skills_count, self.profile.educations_count), (3, 0))
+        self.assertEqual(self.profile.profile_completion_percent, percent - 5)
+        document = CandidateSearchDocument.objects.get(profile=self.profile)
+        self.assertEqual(document.profile_completion_percent, percent - 5)
+
@@ -0,0 +1,26 @@
+CURRENT_EMPLOYMENT_FIELDS = [
+    "current_title",
+    "current_company",
+    "current_start_date",
+    "current_end_date",
+    "current_is_current",
+]
+
+
+def apply_current_employment(profile, employment):
+    profile.current_title = employment.title if employment else ""
+    profile.current_company = employment.company if employment else ""
+    profile.current_start_date = employment.start_date if employment else None
+    profile.current_end_date = employment.end_date if employment else None
+    profile.current_is_current = bool(employment.is_current) if employment else False
+
+
+def sync_current_employment(profile):
+    """
+    Store the current employment (or the latest one when none is marked
+    current) on the profile so search results never query employments.
+    """
+    employment = profile.employments.order_by("-is_current", "-start_date").first()
+    apply_current_employment(profile, employment)
+    profile.save(update_fields=CURRENT_EMPLOYMENT_FIELDS)
+    return employment
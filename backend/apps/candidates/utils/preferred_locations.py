@@ -0,0 +1,35 @@
+from apps.skills.models import normalize_skill_name
+
+from ..models import CandidatePreferredLocation
+
+
+def preferred_location_keys(values):
+    keys = []
+    for value in values or []:
+        key = normalize_skill_name(value) if isinstance(value, str) else ""
+        if key and key not in keys:
+            keys.append(key)
+    return keys
+
+
+def sync_preferred_locations(profile):
+    """
+    Mirror profile.preferred_locations into CandidatePreferredLocation rows,
+    touching only the entries that were added or removed.
+    """
+    wanted = set(preferred_location_keys(profile.preferred_locations))
+    existing = set(
+        CandidatePreferredLocation.objects.filter(profile=profile).values_list(
+            "normalized_name", flat=True
+        )
+    )
+    removed = existing - wanted
+    if removed:
+        CandidatePreferredLocation.objects.filter(
+            profile=profile, normalized_name__in=removed
+        ).delete()
+    added = wanted - existing
+    if added:
+        CandidatePreferredLocation.objects.bulk_create(
+            [CandidatePreferredLocation(profile=profile, normalized_name=key) for key in added]
+        )
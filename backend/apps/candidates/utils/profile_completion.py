@@ -1,5 +1,14 @@
 from typing import List, Tuple
 
+from django.db import transaction
+
+from ..models import CandidateProfile
+from ..services.search import bump_search_generation
+from ..services.search_document import rebuild_search_documents, refresh_search_document
+
+
+# Employers only ever see profiles at or above this completion percent.
+MIN_SEARCHABLE_COMPLETION = 60
 
 WEIGHTS = {
     "personal_full_name": 5,
@@ -96,22 +105,22 @@ def calculate_profile_completion(profile) -> Tuple[int, List[dict]]:
     else:
         missing.append(_build_missing_entry("summary"))
 
-    if list(profile.skills.all()):
+    if profile.skills_count:
         total += WEIGHTS["skills"]
     else:
         missing.append(_build_missing_entry("skills"))
 
-    if list(profile.employments.all()):
+    if profile.employments_count:
         total += WEIGHTS["employment"]
     else:
         missing.append(_build_missing_entry("employment"))
 
-    if list(profile.educations.all()):
+    if profile.educations_count:
         total += WEIGHTS["education"]
     else:
         missing.append(_build_missing_entry("education"))
 
-    if list(profile.projects.all()):
+    if profile.projects_count:
         total += WEIGHTS["projects"]
     else:
         missing.append(_build_missing_entry("projects"))
@@ -128,4 +137,23 @@ def update_profile_completion(profile) -> Tuple[int, List[dict]]:
     percent, missing = calculate_profile_completion(profile)
     profile.profile_completion_percent = percent
     profile.save(update_fields=["profile_completion_percent"])
+    # Every profile write path ends here, so keep the search read model in
+    # step once the write is committed (immediately outside a transaction).
+    transaction.on_commit(lambda: refresh_search_document(profile))
     return percent, missing
+
+
+def store_profile_completion(profiles) -> int:
+    """
+    Bulk-save ``profile_completion_percent`` for recomputed profiles and
+    refresh their search documents, for backfills that bypass
+    ``update_profile_completion``. Returns the number of profiles written.
+    """
+    CandidateProfile.objects.bulk_update(profiles, ["profile_completion_percent"])
+    # Refreshed per batch, so an interrupted run leaves no document behind
+    # the stored completion the search gate reads.
+    rebuild_search_documents(
+        queryset=CandidateProfile.objects.filter(pk__in=[profile.pk for profile in profiles])
+    )
+    bump_search_generation()
+    return len(profiles)
@@ -0,0 +1,50 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from ..models import (
+    CandidateEducation,
+    CandidateEmployment,
+    CandidateProfile,
+    CandidateProject,
+    CandidateSkill,
+)
+
+
+SECTION_COUNT_FIELDS = {
+    "skills_count": CandidateSkill,
+    "employments_count": CandidateEmployment,
+    "educations_count": CandidateEducation,
+    "projects_count": CandidateProject,
+}
+
+
+def adjust_section_count(profile, field, delta):
+    """
+    Apply ``delta`` to one counter with an F() update and reload it onto
+    ``profile``. Call inside the transaction that writes the child rows: the
+    UPDATE holds the profile row lock until commit.
+    """
+    if delta:
+        CandidateProfile.objects.filter(pk=profile.pk).update(
+            **{field: Greatest(F(field) + delta, Value(0))}
+        )
+    profile.refresh_from_db(fields=[field])
+
+
+def section_count_expressions():
+    expressions = {}
+    for field, model in SECTION_COUNT_FIELDS.items():
+        counts = (
+            model.objects.filter(profile=OuterRef("pk"))
+            .order_by()
+            .values("profile")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        expressions[field] = Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+    return expressions
+
+
+def recount_sections(queryset):
+    """Recount every section of the profiles in ``queryset`` in one UPDATE."""
+    return queryset.update(**section_count_expressions())
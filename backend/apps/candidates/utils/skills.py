@@ -0,0 +1,75 @@
+from django.db import transaction
+
+from apps.skills.index_version import bump_skill_additions_version
+from apps.skills.inserts import insert_new_skills
+from apps.skills.models import Skill, skill_content_hash
+from apps.skills.popularity import record_skill_popularity
+
+
+def _skill_pk(value):
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+
+def resolve_master_skills(items):
+    """
+    Map each item's normalized name to its master Skill.
+
+    ``items`` are dicts with ``name``, ``normalized`` and optional ``skill_id``.
+    A valid ``skill_id`` wins. Other items are matched by normalized name:
+    existing skills get one buffered popularity increment, and missing ones are
+    created with popularity 1 (or get an increment when a concurrent insert
+    wins the race, told apart by the ids the insert returned). This takes a
+    fixed number of queries however many items are given: ids, names, one
+    insert plus a re-read, and one delta insert. Call it inside the caller's
+    transaction.
+    """
+    resolved = {}
+    requested_ids = {_skill_pk(item.get("skill_id")) for item in items} - {None}
+    by_id = Skill.objects.in_bulk(requested_ids) if requested_ids else {}
+    pending = []
+    for item in items:
+        skill = by_id.get(_skill_pk(item.get("skill_id")))
+        if skill is not None:
+            resolved[item["normalized"]] = skill
+        else:
+            pending.append(item)
+    if not pending:
+        return resolved
+
+    names = {item["normalized"] for item in pending}
+    by_name = {skill.normalized_name: skill for skill in Skill.objects.filter(normalized_name__in=names)}
+    existing_ids = [by_name[name].id for name in names if name in by_name]
+
+    missing = {}
+    for item in pending:
+        if item["normalized"] not in by_name:
+            missing.setdefault(
+                item["normalized"],
+                Skill(
+                    name=item["name"],
+                    normalized_name=item["normalized"],
+                    popularity=1,
+                    content_hash=skill_content_hash(item["name"], "", ""),
+                ),
+            )
+    if missing:
+        inserted = insert_new_skills(list(missing.values()))
+        for skill in Skill.objects.filter(normalized_name__in=list(missing)):
+            by_name[skill.normalized_name] = skill
+            if inserted.get(skill.normalized_name) != skill.id:
+                # A concurrent writer inserted it first, so its popularity 1
+                # is theirs; count this use as a buffered increment.
+                existing_ids.append(skill.id)
+        # Appended in place by every worker once committed; no full rebuild.
+        transaction.on_commit(bump_skill_additions_version)
+
+    if existing_ids:
+        record_skill_popularity(existing_ids)
+
+    for item in pending:
+        resolved[item["normalized"]] = by_name.get(item["normalized"])
+    return resolved
@@ -1,5 +1,6 @@
 from rest_framework import status
 from rest_framework.response import Response
+from django.db import transaction
 from django.utils import timezone
 
 from .serializers import (
@@ -9,6 +10,7 @@ from .serializers import (
     CandidateEducationSerializer,
     CandidateProjectSerializer,
 )
+from .services.search import bump_search_generation
 from .utils.profile_completion import calculate_profile_completion
 
 
@@ -20,6 +22,9 @@ def touch_profile(profile):
         filter(None, [profile.last_active_at, profile.profile_updated_at])
     )
     profile.save(update_fields=["updated_at", "profile_updated_at", "freshness_at"])
+    # After commit, so a search racing the write cannot cache pre-commit
+    # results under the new generation.
+    transaction.on_commit(bump_search_generation)
 
 
 def error_response(detail, code, errors=None, status_code=status.HTTP_400_BAD_REQUEST):
@@ -2,6 +2,7 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 
 from apps.masteradmin.permissions import IsCandidate
@@ -9,6 +10,7 @@ from .models import CandidateProfile, CandidateEducation
 from .serializers import CandidateEducationSerializer
 from .views_common import error_response, touch_profile
 from .utils.profile_completion import update_profile_completion
+from .utils.section_counts import adjust_section_count
 
 
 class CandidateEducationCreateView(APIView):
@@ -18,9 +20,11 @@ class CandidateEducationCreateView(APIView):
         profile = get_object_or_404(CandidateProfile, user=request.user)
         serializer = CandidateEducationSerializer(data=request.data)
         if serializer.is_valid():
-            education = CandidateEducation.objects.create(profile=profile, **serializer.validated_data)
-            touch_profile(profile)
-            update_profile_completion(profile)
+            with transaction.atomic():
+                education = CandidateEducation.objects.create(profile=profile, **serializer.validated_data)
+                adjust_section_count(profile, "educations_count", 1)
+                touch_profile(profile)
+                update_profile_completion(profile)
             return Response(
                 CandidateEducationSerializer(education).data, status=status.HTTP_201_CREATED
             )
@@ -52,7 +56,9 @@ class CandidateEducationUpdateDeleteView(APIView):
     def delete(self, request, education_id):
         profile = get_object_or_404(CandidateProfile, user=request.user)
         education = get_object_or_404(CandidateEducation, id=education_id, profile=profile)
-        education.delete()
-        touch_profile(profile)
-        update_profile_completion(profile)
+        with transaction.atomic():
+            deleted, _ = education.delete()
+            adjust_section_count(profile, "educations_count", -deleted)
+            touch_profile(profile)
+            update_profile_completion(profile)
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -2,13 +2,16 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 
 from apps.masteradmin.permissions import IsCandidate
 from .models import CandidateProfile, CandidateEmployment
 from .serializers import CandidateEmploymentSerializer
 from .views_common import error_response, touch_profile
+from .utils.current_employment import sync_current_employment
 from .utils.profile_completion import update_profile_completion
+from .utils.section_counts import adjust_section_count
 
 
 class CandidateEmploymentCreateView(APIView):
@@ -18,11 +21,14 @@ class CandidateEmploymentCreateView(APIView):
         profile = get_object_or_404(CandidateProfile, user=request.user)
         serializer = CandidateEmploymentSerializer(data=request.data)
         if serializer.is_valid():
-            employment = CandidateEmployment.objects.create(
-                profile=profile, **serializer.validated_data
-            )
-            touch_profile(profile)
-            update_profile_completion(profile)
+            with transaction.atomic():
+                employment = CandidateEmployment.objects.create(
+                    profile=profile, **serializer.validated_data
+                )
+                adjust_section_count(profile, "employments_count", 1)
+                sync_current_employment(profile)
+                touch_profile(profile)
+                update_profile_completion(profile)
             return Response(
                 CandidateEmploymentSerializer(employment).data, status=status.HTTP_201_CREATED
             )
@@ -42,6 +48,7 @@ class CandidateEmploymentUpdateDeleteView(APIView):
         serializer = CandidateEmploymentSerializer(employment, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
+            sync_current_employment(profile)
             touch_profile(profile)
             update_profile_completion(profile)
             return Response(serializer.data)
@@ -54,7 +61,10 @@ class CandidateEmploymentUpdateDeleteView(APIView):
     def delete(self, request, employment_id):
         profile = get_object_or_404(CandidateProfile, user=request.user)
         employment = get_object_or_404(CandidateEmployment, id=employment_id, profile=profile)
-        employment.delete()
-        touch_profile(profile)
-        update_profile_completion(profile)
+        with transaction.atomic():
+            deleted, _ = employment.delete()
+            adjust_section_count(profile, "employments_count", -deleted)
+            sync_current_employment(profile)
+            touch_profile(profile)
+            update_profile_completion(profile)
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -1,5 +1,6 @@
 import logging
 
+from django.db import transaction
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
@@ -8,8 +9,10 @@ from rest_framework.views import APIView
 from apps.masteradmin.permissions import IsCandidate
 from .models import CandidateProfile
 from .serializers import CandidateProfileUpdateSerializer
+from .services.search import bump_search_generation
+from .services.search_document import refresh_search_document
 from .views_common import build_profile_response, error_response
-from .utils.profile_completion import update_profile_completion
+from .utils.profile_completion import MIN_SEARCHABLE_COMPLETION, update_profile_completion
 
 logger = logging.getLogger(__name__)
 
@@ -58,15 +61,20 @@ class CandidateProfileView(APIView):
             serializer.save()
             profile.refresh_from_db()
             completion_percent, _ = update_profile_completion(profile)
-            if completion_percent < 60 and profile.is_searchable:
+            hidden = completion_percent < MIN_SEARCHABLE_COMPLETION and profile.is_searchable
+            if hidden:
                 profile.is_searchable = False
                 profile.save(update_fields=["is_searchable"])
-                if requested_visibility is True:
-                    return error_response(
-                        "Complete at least 60% of your profile to enable visibility.",
-                        "PROFILE_VISIBILITY_MIN_COMPLETION",
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                    )
+                refresh_search_document(profile)
+            # After commit, so a search racing the write cannot cache pre-commit
+            # results under the new generation.
+            transaction.on_commit(bump_search_generation)
+            if hidden and requested_visibility is True:
+                return error_response(
+                    "Complete at least 60% of your profile to enable visibility.",
+                    "PROFILE_VISIBILITY_MIN_COMPLETION",
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
             try:
                 return Response(build_profile_response(profile, request))
             except Exception:
@@ -2,6 +2,7 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 
 from apps.masteradmin.permissions import IsCandidate
@@ -9,6 +10,7 @@ from .models import CandidateProfile, CandidateProject
 from .serializers import CandidateProjectSerializer
 from .views_common import error_response, touch_profile
 from .utils.profile_completion import update_profile_completion
+from .utils.section_counts import adjust_section_count
 
 
 class CandidateProjectCreateView(APIView):
@@ -18,9 +20,11 @@ class CandidateProjectCreateView(APIView):
         profile = get_object_or_404(CandidateProfile, user=request.user)
         serializer = CandidateProjectSerializer(data=request.data)
         if serializer.is_valid():
-            project = CandidateProject.objects.create(profile=profile, **serializer.validated_data)
-            touch_profile(profile)
-            update_profile_completion(profile)
+            with transaction.atomic():
+                project = CandidateProject.objects.create(profile=profile, **serializer.validated_data)
+                adjust_section_count(profile, "projects_count", 1)
+                touch_profile(profile)
+                update_profile_completion(profile)
             return Response(
                 CandidateProjectSerializer(project).data, status=status.HTTP_201_CREATED
             )
@@ -52,7 +56,9 @@ class CandidateProjectUpdateDeleteView(APIView):
     def delete(self, request, project_id):
         profile = get_object_or_404(CandidateProfile, user=request.user)
         project = get_object_or_404(CandidateProject, id=project_id, profile=profile)
-        project.delete()
-        touch_profile(profile)
-        update_profile_completion(profile)
+        with transaction.atomic():
+            deleted, _ = project.delete()
+            adjust_section_count(profile, "projects_count", -deleted)
+            touch_profile(profile)
+            update_profile_completion(profile)
         return Response(status=status.HTTP_204_NO_CONTENT)
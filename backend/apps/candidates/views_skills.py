@@ -2,15 +2,17 @@ from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.db.models import F
+from django.db import transaction
 from django.shortcuts import get_object_or_404
 
 from apps.masteradmin.permissions import IsCandidate
-from apps.skills.models import Skill, normalize_skill_name
+from apps.skills.models import normalize_skill_name
 from .models import CandidateProfile, CandidateSkill
 from .serializers import CandidateSkillSerializer
 from .views_common import error_response, touch_profile
 from .utils.profile_completion import update_profile_completion
+from .utils.section_counts import adjust_section_count
+from .utils.skills import resolve_master_skills
 
 
 class CandidateSkillCreateView(APIView):
@@ -23,24 +25,20 @@ class CandidateSkillCreateView(APIView):
             skill_id = serializer.validated_data.pop("skill_id", None)
             name = serializer.validated_data.get("name", "")
             normalized = normalize_skill_name(name)
-            skill_obj = None
-            if skill_id:
-                skill_obj = Skill.objects.filter(id=skill_id).first()
-            if not skill_obj and normalized:
-                skill_obj, created = Skill.objects.get_or_create(
+            with transaction.atomic():
+                skill_obj = None
+                if normalized:
+                    item = {"name": name, "normalized": normalized, "skill_id": skill_id}
+                    skill_obj = resolve_master_skills([item]).get(normalized)
+                skill = CandidateSkill.objects.create(
+                    profile=profile,
+                    name=name,
                     normalized_name=normalized,
-                    defaults={"name": name, "popularity": 1},
+                    skill=skill_obj,
                 )
-                if not created:
-                    Skill.objects.filter(id=skill_obj.id).update(popularity=F("popularity") + 1)
-            skill = CandidateSkill.objects.create(
-                profile=profile,
-                name=name,
-                normalized_name=normalized,
-                skill=skill_obj,
-            )
-            touch_profile(profile)
-            update_profile_completion(profile)
+                adjust_section_count(profile, "skills_count", 1)
+                touch_profile(profile)
+                update_profile_completion(profile)
             return Response(CandidateSkillSerializer(skill).data, status=status.HTTP_201_CREATED)
         return error_response(
             "Invalid skill payload.",
@@ -55,9 +53,11 @@ class CandidateSkillDeleteView(APIView):
     def delete(self, request, skill_id):
         profile = get_object_or_404(CandidateProfile, user=request.user)
         skill = get_object_or_404(CandidateSkill, id=skill_id, profile=profile)
-        skill.delete()
-        touch_profile(profile)
-        update_profile_completion(profile)
+        with transaction.atomic():
+            deleted, _ = skill.delete()
+            adjust_section_count(profile, "skills_count", -deleted)
+            touch_profile(profile)
+            update_profile_completion(profile)
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -96,41 +96,34 @@ class CandidateSkillBulkUpsertView(APIView):
                 }
             )
 
-        existing = list(CandidateSkill.objects.filter(profile=profile))
-        existing_map = {normalize_skill_name(skill.name): skill for skill in existing}
-
-        desired_norms = {item["normalized"] for item in desired}
-        to_delete = [skill.id for key, skill in existing_map.items() if key not in desired_norms]
-        to_create = [item for item in desired if item["normalized"] not in existing_map]
-
-        if to_delete:
-            CandidateSkill.objects.filter(id__in=to_delete, profile=profile).delete()
-
-        created_skills = []
-        for item in to_create:
-            skill_obj = None
-            if item.get("skill_id"):
-                skill_obj = Skill.objects.filter(id=item["skill_id"]).first()
-            if not skill_obj:
-                skill_obj, created = Skill.objects.get_or_create(
-                    normalized_name=item["normalized"],
-                    defaults={"name": item["name"], "popularity": 1},
+        with transaction.atomic():
+            existing = list(CandidateSkill.objects.filter(profile=profile))
+            existing_map = {normalize_skill_name(skill.name): skill for skill in existing}
+
+            desired_norms = {item["normalized"] for item in desired}
+            to_delete = [skill.id for key, skill in existing_map.items() if key not in desired_norms]
+            to_create = [item for item in desired if item["normalized"] not in existing_map]
+
+            deleted = 0
+            if to_delete:
+                deleted, _ = CandidateSkill.objects.filter(id__in=to_delete, profile=profile).delete()
+
+            created = 0
+            if to_create:
+                skills = resolve_master_skills(to_create)
+                created = len(to_create)
+                CandidateSkill.objects.bulk_create(
+                    CandidateSkill(
+                        profile=profile,
+                        name=item["name"],
+                        normalized_name=item["normalized"],
+                        skill=skills.get(item["normalized"]),
+                    )
+                    for item in to_create
                 )
-                if not created:
-                    Skill.objects.filter(id=skill_obj.id).update(popularity=F("popularity") + 1)
-            created_skills.append(
-                CandidateSkill(
-                    profile=profile,
-                    name=item["name"],
-                    normalized_name=item["normalized"],
-                    skill=skill_obj,
-                )
-            )
 
-        if created_skills:
-            CandidateSkill.objects.bulk_create(created_skills)
-
-        touch_profile(profile)
-        update_profile_completion(profile)
+            adjust_section_count(profile, "skills_count", created - deleted)
+            touch_profile(profile)
+            update_profile_completion(profile)
         updated = CandidateSkill.objects.filter(profile=profile)
         return Response(CandidateSkillSerializer(updated, many=True).data, status=status.HTTP_200_OK)
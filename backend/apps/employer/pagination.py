@@ -1,7 +1,161 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+CURSOR_MODE = "cursor"
+
+
+class UnsupportedCursorOrdering(Exception):
+    """The queryset is not ordered by a descending (timestamp, id) keyset."""
+
+
+class InvalidCursor(Exception):
+    """The cursor query parameter cannot be decoded into a keyset position."""
+
+
+def wants_cursor_pagination(params):
+    return params.get("pagination") == CURSOR_MODE or bool(params.get("cursor"))
 
 
 class CandidateSearchPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 50
+
+
+class CandidateSearchCursorPagination(BasePagination):
+    """
+    Keyset pagination for candidate search.
+
+    The keyset is read from the queryset ordering chosen by
+    ``resolve_search_ordering`` (a descending timestamp followed by ``-id``),
+    so a page costs one indexed range scan no matter how deep it is. The
+    total count is skipped unless ``include_count`` is requested.
+    """
+
+    cursor_query_param = "cursor"
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 50
+    count_query_param = "include_count"
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.field, self.id_field = self._get_keyset_fields(queryset)
+        cursor = self.decode_cursor(request)
+
+        self.count = None
+        include_count = str(request.query_params.get(self.count_query_param, "")).lower()
+        if include_count in {"1", "true", "yes"}:
+            self.count = queryset.count()
+
+        reverse = bool(cursor and cursor["reverse"])
+        page_qs = queryset
+        if cursor is not None:
+            lookup = "gt" if reverse else "lt"
+            page_qs = page_qs.filter(
+                Q(**{f"{self.field}__{lookup}": cursor["value"]})
+                | Q(**{self.field: cursor["value"], f"{self.id_field}__{lookup}": cursor["id"]})
+            )
+        if reverse:
+            page_qs = page_qs.order_by(self.field, self.id_field)
+
+        rows = list(page_qs[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, TypeError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def _get_keyset_fields(self, queryset):
+        ordering = list(queryset.query.order_by)
+        if len(ordering) != 2 or not all(str(field).startswith("-") for field in ordering):
+            raise UnsupportedCursorOrdering(
+                "Cursor pagination requires a descending (timestamp, id) ordering."
+            )
+        return ordering[0][1:], ordering[1][1:]
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")).decode("utf-8"))
+            value = parse_datetime(payload["v"])
+            if value is None or not payload.get("id"):
+                raise ValueError(encoded)
+            return {"value": value, "id": str(payload["id"]), "reverse": bool(payload.get("r"))}
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise InvalidCursor(self.invalid_cursor_message)
+
+    def encode_cursor(self, row, reverse):
+        value = getattr(row, self.field)
+        payload = {
+            "v": value.isoformat() if isinstance(value, datetime) else str(value),
+            "id": str(getattr(row, self.id_field)),
+        }
+        if reverse:
+            payload["r"] = 1
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        ).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        payload = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.count is not None:
+            payload["count"] = self.count
+        return Response(payload)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
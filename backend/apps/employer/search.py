@@ -1,5 +1,6 @@
 import logging
 
+from django.conf import settings
 from django.db import DatabaseError, OperationalError, ProgrammingError
 from django.shortcuts import get_object_or_404
 from rest_framework import status
@@ -9,9 +10,16 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from apps.masteradmin.permissions import IsEmployer
-from apps.candidates.views_common import calculate_profile_completion
 from apps.candidates.serializers import CandidateSearchSerializer
-from .pagination import CandidateSearchPagination
+from apps.candidates.services.fulltext import keyword_rank
+from apps.candidates.views_common import error_response
+from .pagination import (
+    CandidateSearchCursorPagination,
+    CandidateSearchPagination,
+    InvalidCursor,
+    UnsupportedCursorOrdering,
+    wants_cursor_pagination,
+)
 from .models import EmployerSearchPreset
 from .serializers import (
     EmployerSearchPresetSerializer,
@@ -23,44 +31,79 @@ from .services.search_filters import (
     apply_search_filters,
     build_candidate_search_queryset,
 )
+from .services.relevance import wants_relevance_sort
+from .services.search_documents import build_document_search_queryset
+from .services.search_cache import (
+    fetch_profiles_in_order,
+    get_cached_facets,
+    get_cached_result_ids,
+)
+from .services.search_facets import compute_search_facets, empty_search_facets
 from .services.search_presets import canonicalize_effective_filters, upsert_recent_search
 
 logger = logging.getLogger(__name__)
 
 
+def build_filtered_search_queryset(params):
+    if settings.CANDIDATE_SEARCH_BACKEND == "document":
+        return build_document_search_queryset(params)
+    base_qs = build_candidate_search_queryset()
+    return apply_search_filters(base_qs, params)
+
+
 class CandidateSearchView(ListAPIView):
     serializer_class = CandidateSearchSerializer
     permission_classes = [IsAuthenticated, IsEmployer]
     pagination_class = CandidateSearchPagination
 
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self._uses_cursor():
+                self._paginator = CandidateSearchCursorPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+
+    def _uses_cursor(self):
+        # Relevance scores are not a column, so keyset cursors cannot follow them.
+        params = self.request.query_params
+        return wants_cursor_pagination(params) and not wants_relevance_sort(params)
+
     def list(self, request, *args, **kwargs):
         if not has_search_inputs(self.request.query_params):
             return Response({"count": 0, "results": []})
 
-        queryset = self.get_queryset()
-        searchable_profiles = []
-        for profile in queryset:
-            completion_percent = profile.profile_completion_percent
-            if completion_percent in (None, 0):
-                completion_percent, _ = calculate_profile_completion(profile)
-            if completion_percent >= 60:
-                searchable_profiles.append(profile)
-
-        page = self.paginate_queryset(searchable_profiles)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            response = self.get_paginated_response(serializer.data)
-            self._log_recent_search(request)
-            return response
-
-        serializer = self.get_serializer(searchable_profiles, many=True)
-        response = Response({"count": len(searchable_profiles), "results": serializer.data})
+        result_ids = None
+        if self._uses_cursor():
+            try:
+                profiles = self.paginate_queryset(self.get_queryset())
+            except UnsupportedCursorOrdering as exc:
+                return error_response(str(exc), "CURSOR_ORDERING_UNSUPPORTED")
+            except InvalidCursor as exc:
+                return error_response(str(exc), "INVALID_CURSOR")
+        else:
+            result_ids = get_cached_result_ids(request.query_params, self.get_queryset())
+            page_ids = self.paginate_queryset(result_ids)
+            profiles = fetch_profiles_in_order(build_candidate_search_queryset(), page_ids)
+        self._attach_keyword_rank(profiles)
+        serializer = self.get_serializer(profiles, many=True)
+        response = self.get_paginated_response(serializer.data)
+        if result_ids is not None and result_ids.truncated:
+            # Only the freshest matches were ranked; the rest follow unranked.
+            response.data["relevance_truncated"] = True
+            response.data["relevance_scored"] = result_ids.scored
         self._log_recent_search(request)
         return response
 
+    def _attach_keyword_rank(self, profiles):
+        keywords = self.request.query_params.get("keywords", "").strip()
+        ranks = keyword_rank(keywords, [profile.id for profile in profiles]) if keywords else {}
+        for profile in profiles:
+            profile.keyword_rank = ranks.get(str(profile.id))
+
     def get_queryset(self):
-        base_qs = build_candidate_search_queryset()
-        return apply_search_filters(base_qs, self.request.query_params)
+        return build_filtered_search_queryset(self.request.query_params)
 
     def _log_recent_search(self, request):
         raw_filters = {key: value for key, value in request.query_params.items()}
@@ -74,6 +117,20 @@ class CandidateSearchView(ListAPIView):
             logger.exception("Recent search logging failed for employer %s", request.user.id)
 
 
+class CandidateSearchFacetsView(APIView):
+    permission_classes = [IsAuthenticated, IsEmployer]
+
+    def get(self, request):
+        params = request.query_params
+        if not has_search_inputs(params):
+            return Response(empty_search_facets(), status=status.HTTP_200_OK)
+        facets = get_cached_facets(
+            params,
+            lambda: compute_search_facets(build_filtered_search_queryset(params)),
+        )
+        return Response(facets, status=status.HTTP_200_OK)
+
+
 class RecentSearchListView(ListAPIView):
     serializer_class = EmployerSearchPresetSerializer
     permission_classes = [IsAuthenticated, IsEmployer]
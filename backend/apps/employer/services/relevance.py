@@ -0,0 +1,179 @@
+# BM25-style relevance ranking for candidate search (sort=relevance).
+import heapq
+import math
+import re
+from array import array
+
+from django.db.models import F, FloatField, Sum, TextField, Value
+from django.db.models.functions import Coalesce, Concat, Length, Lower, Replace
+
+from apps.candidates.models import CandidateEducation, CandidateEmployment, CandidateProfile, CandidateSkill
+
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+# Punctuation turned into spaces before counting " term " occurrences in SQL.
+# Each one is a nested REPLACE, so keep the list short (SQLite caps parser depth).
+TOKEN_SEPARATORS = ",./()-+;:&|"
+
+# Per-field term-frequency weights (BM25F style).
+RELEVANCE_FIELD_WEIGHTS = {
+    "skills": 3.0,
+    "titles": 2.0,
+    "education": 1.5,
+    "summary": 1.0,
+}
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Upper bound on the filtered candidate set scored per request; the freshest
+# candidates are kept when a search matches more than this.
+MAX_RELEVANCE_CANDIDATES = 5000
+ID_CHUNK_SIZE = 2000
+
+
+def wants_relevance_sort(params):
+    return (params.get("sort") or "").strip().lower() == "relevance" and bool(relevance_terms(params))
+
+
+def relevance_terms(params):
+    raw = " ".join(
+        [
+            params.get("keywords", "") or "",
+            (params.get("skills", "") or "").replace(",", " "),
+        ]
+    )
+    return set(TOKEN_RE.findall(raw.lower()))
+
+
+def _chunks(values, size=ID_CHUNK_SIZE):
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _padded_text(field):
+    """Lowercased ``field`` with separators as spaces and every token wrapped in its own spaces."""
+    text = Lower(Coalesce(F(field), Value(""), output_field=TextField()))
+    for char in TOKEN_SEPARATORS:
+        text = Replace(text, Value(char), Value(" "))
+    return Concat(Value(" "), Replace(text, Value(" "), Value("  ")), Value(" "), output_field=TextField())
+
+
+def _term_count(field, term):
+    text = _padded_text(field)
+    needle = f" {term} "
+    removed = Length(text) - Length(Replace(text, Value(needle), Value("")))
+    return removed * 1.0 / len(needle)
+
+
+def _weighted(fields, expression):
+    return sum(
+        (expression(field) * weight for field, weight in fields),
+        Value(0.0, output_field=FloatField()),
+    )
+
+
+# (queryset factory, profile id column, ((text column, field weight), ...), aggregate)
+# Titles come from the employment rows only: the profile's current_title is a
+# copy of one of them (the latest when none is current), so reading it as
+# well would count that employment twice.
+RELEVANCE_SOURCES = (
+    (
+        lambda chunk: CandidateProfile.objects.filter(id__in=chunk),
+        "id",
+        (("summary", RELEVANCE_FIELD_WEIGHTS["summary"]),),
+        False,
+    ),
+    (
+        lambda chunk: CandidateSkill.objects.filter(profile_id__in=chunk),
+        "profile_id",
+        (("normalized_name", RELEVANCE_FIELD_WEIGHTS["skills"]),),
+        True,
+    ),
+    (
+        lambda chunk: CandidateEmployment.objects.filter(profile_id__in=chunk),
+        "profile_id",
+        (("title", RELEVANCE_FIELD_WEIGHTS["titles"]),),
+        True,
+    ),
+    (
+        lambda chunk: CandidateEducation.objects.filter(profile_id__in=chunk),
+        "profile_id",
+        (("degree", RELEVANCE_FIELD_WEIGHTS["education"]),),
+        True,
+    ),
+)
+
+
+def load_term_frequencies(profile_ids, terms):
+    """
+    Weighted term frequencies and field lengths for ``profile_ids``.
+
+    The database computes them set-wise: every source table gets one grouped
+    query per id chunk whose columns count each term's whole-token
+    occurrences (``" term "`` in the padded text) and the weighted text
+    length. Python only adds the per-profile columns into flat arrays.
+    Returns ({term: array of tf by position}, array of lengths by position).
+    """
+    terms = sorted(terms)
+    positions = {pk: position for position, pk in enumerate(profile_ids)}
+    tfs = {term: array("d", bytes(8 * len(profile_ids))) for term in terms}
+    lengths = array("d", bytes(8 * len(profile_ids)))
+    for chunk in _chunks(profile_ids):
+        for queryset, id_column, fields, aggregate in RELEVANCE_SOURCES:
+            columns = {
+                f"tf_{index}": _weighted(fields, lambda field, term=term: _term_count(field, term))
+                for index, term in enumerate(terms)
+            }
+            columns["text_length"] = _weighted(
+                fields, lambda field: Length(Coalesce(F(field), Value(""), output_field=TextField()))
+            )
+            rows = queryset(chunk).order_by().values(id_column)
+            if aggregate:
+                rows = rows.annotate(**{name: Sum(expression) for name, expression in columns.items()})
+            else:
+                rows = rows.annotate(**columns)
+            for row in rows:
+                position = positions[row[id_column]]
+                lengths[position] += row["text_length"] or 0.0
+                for index, term in enumerate(terms):
+                    tfs[term][position] += row[f"tf_{index}"] or 0.0
+    return tfs, lengths
+
+
+def score_documents(tfs, lengths):
+    """
+    BM25F over the batch, term at a time: each query term adds its
+    contribution to a flat score array for the documents that contain it.
+    """
+    doc_count = len(lengths)
+    scores = array("d", bytes(8 * doc_count))
+    if not doc_count:
+        return scores
+    avg_length = (sum(lengths) / doc_count) or 1.0
+    norms = [BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length) for length in lengths]
+    for term_tfs in tfs.values():
+        matching = [position for position, tf in enumerate(term_tfs) if tf]
+        if not matching:
+            continue
+        idf = math.log(1 + (doc_count - len(matching) + 0.5) / (len(matching) + 0.5))
+        for position in matching:
+            tf = term_tfs[position]
+            scores[position] += idf * tf * (BM25_K1 + 1) / (tf + norms[position])
+    return scores
+
+
+def rank_candidate_ids(queryset, params, limit=None):
+    """
+    Return (top ``limit`` profile ids by relevance - all scored ids when
+    ``limit`` is None - and the number of ids scored).
+
+    Only the freshest ``MAX_RELEVANCE_CANDIDATES`` matches are scored; callers
+    compare the scored count with the full match count to flag truncation.
+    Ties keep the queryset's freshness ordering.
+    """
+    terms = relevance_terms(params)
+    ids = list(queryset.values_list("id", flat=True)[:MAX_RELEVANCE_CANDIDATES])
+    scores = score_documents(*load_term_frequencies(ids, terms))
+    if limit is None:
+        limit = len(ids)
+    top = heapq.nlargest(limit, range(len(ids)), key=lambda position: (scores[position], -position))
+    return [str(ids[position]) for position in top], len(ids)
@@ -0,0 +1,122 @@
+# Short-lived cache of ordered candidate ids per canonical search.
+from django.core.cache import cache
+
+from apps.candidates.services.search import get_search_generation
+from .relevance import MAX_RELEVANCE_CANDIDATES, rank_candidate_ids, wants_relevance_sort
+from .search_filters import canonical_search_filters, resolve_search_ordering
+from .search_presets import build_filters_hash
+
+
+SEARCH_RESULT_CACHE_TTL = 120
+SEARCH_RESULT_CACHE_MAX_IDS = 500
+
+
+def build_result_cache_key(params):
+    # Keyed on the applied recency window: "updated_within=6_MONTHS" and no
+    # cutoff at all differ, and so do raw day counts like 1 and 365.
+    effective_filters = canonical_search_filters(params)
+    if wants_relevance_sort(params):
+        ordering = "relevance"
+    else:
+        ordering = ",".join(resolve_search_ordering(params))
+    return (
+        f"candidates:search:ids:{get_search_generation()}:"
+        f"{build_filters_hash(effective_filters)}:{ordering}"
+    )
+
+
+def build_facets_cache_key(params):
+    effective_filters = canonical_search_filters(params)
+    return (
+        f"candidates:search:facets:{get_search_generation()}:"
+        f"{build_filters_hash(effective_filters)}"
+    )
+
+
+def get_cached_facets(params, compute):
+    key = build_facets_cache_key(params)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute()
+        cache.set(key, facets, SEARCH_RESULT_CACHE_TTL)
+    return facets
+
+
+class CachedResultIds:
+    """
+    Sequence of ordered result ids for one search.
+
+    The first ``SEARCH_RESULT_CACHE_MAX_IDS`` ids (every ranked id for a
+    relevance search) come from the cache; slices beyond that window fall
+    through to ``fetch_slice``, so deep pages stay
+    correct while ``len()`` reports the cached total count. ``scored`` is set
+    for relevance searches that matched more candidates than were ranked.
+    """
+
+    def __init__(self, ids, count, fetch_slice, scored=None):
+        self.ids = ids
+        self.count_value = count
+        self.fetch_slice = fetch_slice
+        self.scored = scored
+
+    @property
+    def truncated(self):
+        return self.scored is not None and self.scored < self.count_value
+
+    def __len__(self):
+        return self.count_value
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        stop = self.count_value if index.stop is None else index.stop
+        if stop <= len(self.ids):
+            return self.ids[index]
+        return self.fetch_slice(slice(index.start, stop))
+
+
+def get_cached_result_ids(params, queryset):
+    key = build_result_cache_key(params)
+    entry = cache.get(key)
+    if wants_relevance_sort(params):
+        if entry is None:
+            # The whole ranked list is cached, so deeper pages never re-rank.
+            ids, scored = rank_candidate_ids(queryset, params)
+            count = queryset.count() if scored >= MAX_RELEVANCE_CANDIDATES else scored
+            entry = {"ids": ids, "count": count, "scored": scored}
+            cache.set(key, entry, SEARCH_RESULT_CACHE_TTL)
+        scored = entry["scored"]
+
+        def fetch_slice(index):
+            # Past the ranked ids, the unscored remainder in freshness order.
+            start = index.start or 0
+            ranked = entry["ids"][start:index.stop]
+            if index.stop > scored:
+                remainder = queryset.values_list("id", flat=True)[max(start, scored):index.stop]
+                ranked.extend(str(pk) for pk in remainder)
+            return ranked
+
+        return CachedResultIds(entry["ids"], entry["count"], fetch_slice, scored=scored)
+
+    if entry is None:
+        ids = [
+            str(pk)
+            for pk in queryset.values_list("id", flat=True)[: SEARCH_RESULT_CACHE_MAX_IDS + 1]
+        ]
+        if len(ids) > SEARCH_RESULT_CACHE_MAX_IDS:
+            ids = ids[:SEARCH_RESULT_CACHE_MAX_IDS]
+            count = queryset.count()
+        else:
+            count = len(ids)
+        entry = {"ids": ids, "count": count}
+        cache.set(key, entry, SEARCH_RESULT_CACHE_TTL)
+
+    def fetch_slice(index):
+        return [str(pk) for pk in queryset.values_list("id", flat=True)[index]]
+
+    return CachedResultIds(entry["ids"], entry["count"], fetch_slice)
+
+
+def fetch_profiles_in_order(queryset, ids):
+    profiles = {str(profile.id): profile for profile in queryset.filter(id__in=ids)}
+    return [profiles[pk] for pk in ids if pk in profiles]
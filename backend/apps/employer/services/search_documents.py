@@ -0,0 +1,26 @@
+# Candidate search over the denormalized CandidateSearchDocument table.
+from apps.candidates.models import CandidateSearchDocument
+from .search_filters import build_candidate_search_queryset, get_search_plan
+
+
+def apply_document_filters(queryset, params):
+    """
+    Mirror of ``apply_search_filters`` for CandidateSearchDocument rows.
+
+    The predicates come from the same compiled SearchPlan as the profile
+    search: scalar filters run on the document's indexed columns, while
+    skills, education and preferred locations use the indexed child rows.
+    """
+    return get_search_plan(params).apply_documents(queryset)
+
+
+def build_document_search_queryset(params):
+    # Searchability and the account's active flag are read from the profile
+    # and user, not the document, which is only refreshed on profile writes.
+    plan = get_search_plan(params)
+    documents = plan.apply_documents(CandidateSearchDocument.objects.all())
+    return (
+        build_candidate_search_queryset()
+        .filter(pk__in=documents.values("profile_id"))
+        .order_by(*plan.ordering)
+    )
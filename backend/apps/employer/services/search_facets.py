@@ -0,0 +1,117 @@
+# Facet counts for the employer search sidebar.
+from django.db.models import Count, Min, Q
+
+from apps.candidates.models import CandidateProfile
+
+
+# (code, label, lower bound inclusive, upper bound exclusive) in months.
+EXPERIENCE_BUCKETS = (
+    ("FRESHER", "Fresher", 0, 1),
+    ("0_2", "Up to 2 years", 1, 24),
+    ("2_5", "2-5 years", 24, 60),
+    ("5_10", "5-10 years", 60, 120),
+    ("10_PLUS", "10+ years", 120, None),
+)
+# Expected annual salary ranges, same bounds convention.
+SALARY_BUCKETS = (
+    ("0_3L", "Up to 3 LPA", 0, 300000),
+    ("3L_6L", "3-6 LPA", 300000, 600000),
+    ("6L_10L", "6-10 LPA", 600000, 1000000),
+    ("10L_20L", "10-20 LPA", 1000000, 2000000),
+    ("20L_PLUS", "20+ LPA", 2000000, None),
+)
+IMMEDIATE_NOTICE_CODES = {"", "0", "ANY", "IMMEDIATE", "IMMEDIATE_JOINER"}
+# Values returned per text facet; each facet is its own bounded GROUP BY.
+FACET_VALUE_LIMIT = 50
+
+
+def _normalize_notice(value):
+    notice = (value or "").strip()
+    return "IMMEDIATE_JOINER" if notice.upper() in IMMEDIATE_NOTICE_CODES else notice
+
+
+def _normalize_gender(value):
+    return (value or "").upper()
+
+
+# (facet, grouped column, label column or None, normalizer or None). Location
+# facets group on the same normalized keys the filters match and label each
+# key with one of its spellings; the others have few distinct values, so
+# they are normalized and merged here.
+TEXT_FACETS = (
+    ("city", "city_key", "current_city", None),
+    ("state", "state_key", "current_state", None),
+    ("notice_period_code", "notice_period_code", None, _normalize_notice),
+    ("work_status", "work_status", None, None),
+    ("gender", "gender", None, _normalize_gender),
+)
+
+
+def _bucket_counts(name, expression, buckets):
+    counts = {}
+    for index, (_code, _label, lower, upper) in enumerate(buckets):
+        condition = Q(**{f"{expression}__gte": lower})
+        if upper is not None:
+            condition &= Q(**{f"{expression}__lt": upper})
+        counts[f"{name}_{index}"] = Count("pk", filter=condition)
+    return counts
+
+
+def _bucket_entries(name, buckets, totals):
+    return [
+        {"value": code, "label": label, "count": totals.get(f"{name}_{index}", 0)}
+        for index, (code, label, _lower, _upper) in enumerate(buckets)
+    ]
+
+
+def _text_facet(candidates, column, label_column, normalize):
+    rows = candidates.values(column).annotate(total=Count("pk"))
+    if label_column:
+        rows = rows.annotate(label=Min(label_column))
+    if normalize is None:
+        rows = rows.exclude(**{column: ""}).order_by("-total", column)[:FACET_VALUE_LIMIT]
+    counts = {}
+    for row in rows:
+        key = row[column] if normalize is None else normalize(row[column])
+        if not key:
+            continue
+        entry = counts.setdefault(key, {"value": row.get("label") or key, "count": 0})
+        entry["count"] += row["total"]
+    return sorted(counts.values(), key=lambda entry: (-entry["count"], entry["value"]))[
+        :FACET_VALUE_LIMIT
+    ]
+
+
+def empty_search_facets():
+    facets = {name: [] for name, _column, _label, _normalize in TEXT_FACETS}
+    facets["experience"] = _bucket_entries("experience", EXPERIENCE_BUCKETS, {})
+    facets["salary"] = _bucket_entries("salary", SALARY_BUCKETS, {})
+    return {"count": 0, "facets": facets}
+
+
+def compute_search_facets(queryset):
+    """
+    Count each facet with its own aggregate over the filtered candidates:
+    one query counts the total and every experience and salary bucket, and
+    each text facet is a GROUP BY on its single column, capped at
+    ``FACET_VALUE_LIMIT`` values. Nothing groups by the cross product of
+    facets, so the work stays proportional to the distinct values per facet.
+    """
+    candidates = CandidateProfile.objects.filter(
+        pk__in=queryset.order_by().values("pk")
+    ).order_by()
+    totals = candidates.aggregate(
+        total=Count("pk"),
+        **_bucket_counts("experience", "total_experience_in_months", EXPERIENCE_BUCKETS),
+        **_bucket_counts("salary", "expected_salary", SALARY_BUCKETS),
+    )
+    if not totals["total"]:
+        return empty_search_facets()
+
+    facets = {
+        name: _text_facet(candidates, column, label_column, normalize)
+        for name, column, label_column, normalize in TEXT_FACETS
+    }
+    facets["experience"] = _bucket_entries("experience", EXPERIENCE_BUCKETS, totals)
+    facets["salary"] = _bucket_entries("salary", SALARY_BUCKETS, totals)
+    return {"count": totals["total"], "facets": facets}
@@ -1,9 +1,34 @@
-from django.db.models import Q, F, ExpressionWrapper, IntegerField
-from apps.skills.models import normalize_skill_name
-from apps.candidates.models import CandidateProfile
-from apps.candidates.services.search import has_search_inputs, parse_updated_within
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, fields, replace
+from typing import Optional
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from apps.skills.models import Location, Skill, normalize_skill_name
+from apps.skills.index_version import get_skill_index_version
+from apps.skills.search_index import get_skill_index, uses_trigram_index
+from apps.candidates.models import (
+    CandidateEducation,
+    CandidatePreferredLocation,
+    CandidateProfile,
+    CandidateSkill,
+)
+from apps.candidates.services.fulltext import keyword_match_subquery
+from apps.candidates.services.search import (
+    has_search_inputs,
+    parse_updated_within,
+    parse_updated_within_days,
+)
+from apps.candidates.utils.profile_completion import MIN_SEARCHABLE_COMPLETION
+from .search_presets import build_filters_hash, canonicalize_effective_filters
 
 
+# Above this many matching skills a substring token is matched with a Skill
+# subquery instead of an inlined id list, which bloats the SQL and the plan.
+SKILL_ID_LIST_LIMIT = 500
+
 # Fields we want prefetch on every search query.
 SEARCH_PREFETCH = (
     "skills",
@@ -17,144 +42,479 @@ def build_candidate_search_queryset():
     return CandidateProfile.objects.filter(
         is_searchable=True,
         user__is_active=True,
+        profile_completion_percent__gte=MIN_SEARCHABLE_COMPLETION,
     ).select_related("user", "user__organization").prefetch_related(*SEARCH_PREFETCH)
 
 
-def annotate_total_experience(queryset):
-    total_months = ExpressionWrapper(
-        F("total_experience_years") * 12 + F("total_experience_months"),
-        output_field=IntegerField(),
+def normalize_updated_type(value):
+    normalized_type = (value or "").strip().lower()
+    if normalized_type in {"active_updated", "active/updated"}:
+        normalized_type = "active"
+    return normalized_type or "active"
+
+
+def parse_experience_months(value):
+    if not value:
+        return None
+    try:
+        return int(float(value) * 12)
+    except ValueError:
+        return None
+
+
+def parse_salary(value):
+    if not value:
+        return None
+    try:
+        return int(str(value).replace(",", ""))
+    except ValueError:
+        return None
+
+
+IMMEDIATE_NOTICE_TOKENS = {"", "0", "ANY", "IMMEDIATE_JOINER", "IMMEDIATE"}
+
+
+def normalize_notice_period(value):
+    """The notice period a search applies: None, "IMMEDIATE_JOINER" or the code."""
+    if value is None:
+        return None
+    normalized_notice = str(value).strip()
+    if normalized_notice.upper() in IMMEDIATE_NOTICE_TOKENS:
+        return "IMMEDIATE_JOINER"
+    return normalized_notice
+
+
+def build_notice_period_q(value):
+    normalized_notice = normalize_notice_period(value)
+    if normalized_notice is None:
+        return None
+    if normalized_notice == "IMMEDIATE_JOINER":
+        return (
+            Q(notice_period_code__isnull=True)
+            | Q(notice_period_code="")
+            | Q(notice_period_code="0")
+            | Q(notice_period_code__in=["IMMEDIATE_JOINER", "IMMEDIATE", "ANY"])
+        )
+    return Q(notice_period_code=normalized_notice)
+
+
+def parse_location_keys(value):
+    """Comma-separated location names -> list of normalized keys."""
+    return [key for key in (normalize_skill_name(part) for part in (value or "").split(",")) if key]
+
+
+def build_state_q(state_keys, state_field="state_key", city_field="city_key"):
+    """
+    Match the state key, or - for profiles that only recorded a city - any
+    city the canonical Location table places in one of those states.
+    """
+    state_cities = Location.objects.filter(state_key__in=state_keys).values("city_key")
+    return Q(**{f"{state_field}__in": state_keys}) | Q(
+        **{state_field: "", f"{city_field}__in": state_cities}
     )
-    return queryset.annotate(total_experience_months_calc=total_months)
 
 
-def apply_search_filters(queryset, params):
-    qs = annotate_total_experience(queryset)
+def wants_relocation(params):
+    return str(params.get("include_relocation", "")).strip().lower() in {"1", "true", "yes"}
+
+
+def prefers_location(location_keys, profile_ref="pk"):
+    """Correlated EXISTS over the indexed preferred-location rows."""
+    return Exists(
+        CandidatePreferredLocation.objects.filter(
+            profile_id=OuterRef(profile_ref),
+            normalized_name__in=location_keys,
+        )
+    )
+
+
+def resolve_skill_substring_ids(token):
+    """Skill ids whose name contains ``token``, or None when Postgres matches in SQL."""
+    if uses_trigram_index():
+        return None
+    return tuple(get_skill_index().substring_ids(token))
+
+
+def build_skill_substring_q(token, skill_ids=None, known_max_id=None):
+    """
+    Substring match of a normalized skill token against CandidateSkill rows.
+    Postgres uses the pg_trgm indexes via LIKE on the lower-cased columns;
+    elsewhere the token is resolved to Skill ids with the in-process n-gram
+    index (``skill_ids``), leaving only unlinked candidate skills to a LIKE
+    scan. Broad tokens matching more than ``SKILL_ID_LIST_LIMIT`` skills use
+    a Skill subquery rather than an inlined id list. Skills appended after
+    the index's ``known_max_id`` are matched by name, so a memoized plan
+    still finds candidates linked to skills created since it was compiled.
+    """
+    if skill_ids is None:
+        skill_ids = resolve_skill_substring_ids(token)
+    if skill_ids is None:
+        return Q(normalized_name__contains=token) | Q(skill__normalized_name__contains=token)
+    if len(skill_ids) > SKILL_ID_LIST_LIMIT:
+        return Q(skill_id__in=Skill.objects.filter(normalized_name__contains=token).values("id")) | Q(
+            skill__isnull=True,
+            normalized_name__contains=token,
+        )
+    if known_max_id is None:
+        known_max_id = get_skill_index().max_id
+    return (
+        Q(skill_id__in=skill_ids)
+        | Q(skill__isnull=True, normalized_name__contains=token)
+        | Q(skill_id__gt=known_max_id, normalized_name__contains=token)
+    )
+
+
+def profile_has_skill(condition, profile_ref="pk"):
+    """Correlated EXISTS over the profile's skills, so the match never fans out rows."""
+    return Exists(CandidateSkill.objects.filter(condition, profile_id=OuterRef(profile_ref)))
+
+
+# Scalar columns of each search target. The CandidateSearchDocument read model
+# names a few of the profile's columns differently; the rest are shared.
+PROFILE_SEARCH_COLUMNS = {
+    "pk": "pk",
+    "location": "location_key",
+    "city": "city_key",
+    "state": "state_key",
+    "country": "country_key",
+    "experience": "total_experience_in_months",
+}
+DOCUMENT_SEARCH_COLUMNS = {
+    "pk": "profile_id",
+    "location": "location",
+    "city": "city",
+    "state": "state",
+    "country": "country",
+    "experience": "total_experience_months",
+}
+
+
+def resolve_search_ordering(params):
+    """
+    Ordering used for search results, always ending with the primary key so
+    it is total and usable as a keyset for cursor pagination. The leading
+    timestamp is only nullable (last_active_at) when the cutoff filter
+    already excludes NULL rows.
+    """
+    if parse_updated_within(params.get("updated_within")):
+        if normalize_updated_type(params.get("updated_type")) == "created":
+            return ("-created_at", "-id")
+        return ("-last_active_at", "-id")
+    return ("-updated_at", "-id")
+
+
+@dataclass(frozen=True)
+class SearchPlan:
+    """
+    Compiled, immutable form of one canonical search.
+
+    Everything that depends only on the filters - parsed bounds, normalized
+    tokens, resolved skill ids and the Q trees for the profile table and the
+    search document table - is computed once. The
+    relative ``updated_within`` window is kept in days and turned into a
+    cutoff timestamp each time the plan is applied.
+    """
+
+    cache_key: str
+    keywords: str = ""
+    keyword_mode: str = "basic"
+    location: str = ""
+    include_relocation: bool = False
+    cities: tuple = ()
+    states: tuple = ()
+    countries: tuple = ()
+    preferred_locations: tuple = ()
+    exp_min_months: Optional[int] = None
+    exp_max_months: Optional[int] = None
+    skill_tokens: tuple = ()
+    skill_ids: tuple = ()
+    exact_skill_ids: tuple = ()
+    substring_skill_ids: tuple = ()
+    updated_within_days: Optional[int] = None
+    updated_field: str = "last_active_at"
+    salary_min: Optional[int] = None
+    salary_max: Optional[int] = None
+    notice_period: Optional[str] = None
+    genders: tuple = ()
+    work_status: str = ""
+    availability_to_join: str = ""
+    education: str = ""
+    ordering: tuple = ("-updated_at", "-id")
+    q: Q = field(default_factory=Q, compare=False, repr=False)
+    document_q: Q = field(default_factory=Q, compare=False, repr=False)
+
+    def cutoff_q(self):
+        if self.updated_within_days is None:
+            return Q()
+        cutoff = timezone.now() - timezone.timedelta(days=self.updated_within_days)
+        return Q(**{f"{self.updated_field}__gte": cutoff})
+
+    def apply(self, queryset):
+        return queryset.filter(self.q, self.cutoff_q()).order_by(*self.ordering)
 
+    def apply_documents(self, queryset):
+        """The same filters over CandidateSearchDocument rows."""
+        return queryset.filter(self.document_q, self.cutoff_q())
+
+    def describe(self):
+        """Plain-data view of the plan for logging and debugging."""
+        described = {
+            item.name: getattr(self, item.name)
+            for item in fields(self)
+            if item.name not in {"q", "document_q"}
+        }
+        described["q"] = str(self.q)
+        described["document_q"] = str(self.document_q)
+        return described
+
+
+def _parse_skill_tokens(value):
+    return [normalize_skill_name(token) for token in (value or "").split(",")]
+
+
+def _parse_genders(value):
+    return [token.strip().upper() for token in (value or "").split(",")]
+
+
+# Multi-valued filters keyed by the tokens the compiler applies, so order,
+# case and repeats ("Pune,Delhi" vs "delhi,pune,Pune") do not split the key.
+LIST_FILTER_PARSERS = {
+    "city": parse_location_keys,
+    "state": parse_location_keys,
+    "country": parse_location_keys,
+    "preferred_location": parse_location_keys,
+    "skills": _parse_skill_tokens,
+    "gender": _parse_genders,
+}
+
+
+def canonical_search_filters(params):
+    """
+    Canonical filters for cache keys. The recency window and type are keyed
+    by what the search applies (days and field), not by the preset tokens:
+    "6M", "180" and "6_MONTHS" share a key while "1" and "365" do not. The
+    notice period likewise: an empty value still filters to immediate
+    joiners, so it keys as IMMEDIATE_JOINER rather than being dropped.
+    """
+    filters = canonicalize_effective_filters(dict(params.items()), keep_defaults=True)
+    filters.pop("updated_within", None)
+    filters.pop("updated_type", None)
+    filters.pop("notice_period_code", None)
+    notice_period = normalize_notice_period(params.get("notice_period_code"))
+    if notice_period is not None:
+        filters["notice_period_code"] = notice_period
+    for key, parse in LIST_FILTER_PARSERS.items():
+        tokens = sorted({token for token in parse(params.get(key)) if token})
+        if tokens:
+            filters[key] = ",".join(tokens)
+        else:
+            filters.pop(key, None)
+    updated_within_days = parse_updated_within_days(params.get("updated_within"))
+    if updated_within_days is not None:
+        filters["updated_within_days"] = updated_within_days
+        filters["updated_type"] = normalize_updated_type(params.get("updated_type"))
+    return filters
+
+
+def build_plan_cache_key(params):
+    # Resolved skill ids depend on the skill index and the keyword subquery on
+    # the configured engine, so both are part of the key.
+    filters_hash = build_filters_hash(canonical_search_filters(params))
+    return f"{filters_hash}:{get_skill_index_version()}:{settings.CANDIDATE_KEYWORD_SEARCH}"
+
+
+def compile_search_plan(params, cache_key=""):
     keywords = params.get("keywords", "").strip()
-    location = params.get("location", "").strip()
-    city = params.get("city", "").strip()
-    state = params.get("state", "").strip()
-    country = params.get("country", "").strip()
-    exp_min = params.get("exp_min")
-    exp_max = params.get("exp_max")
+    location = normalize_skill_name(params.get("location", ""))
     skills = params.get("skills", "").strip()
     skill_ids = params.get("skill_ids", "").strip()
-    updated_within = params.get("updated_within")
-    updated_type = params.get("updated_type", "").strip().lower()
-    salary_min = params.get("salary_min")
-    salary_max = params.get("salary_max")
-    notice_period_code = params.get("notice_period_code")
     gender = params.get("gender", "").strip()
-    work_status = params.get("work_status", "").strip()
-    availability = params.get("availability_to_join", "").strip()
-    education_level = params.get("education", "").strip()
-
-    if keywords:
-        keyword_q = (
-            Q(full_name__icontains=keywords)
-            | Q(summary__icontains=keywords)
-            | Q(skills__name__icontains=keywords)
+    updated_within_days = parse_updated_within_days(params.get("updated_within"))
+    updated_field = (
+        "created_at"
+        if normalize_updated_type(params.get("updated_type")) == "created"
+        else "last_active_at"
+    )
+    keyword_subquery = keyword_match_subquery(keywords) if keywords else None
+
+    skill_tokens = []
+    if skills:
+        skill_tokens = [normalize_skill_name(s) for s in skills.split(",") if normalize_skill_name(s)]
+    requested_ids = [value.strip() for value in skill_ids.split(",") if value.strip()]
+    skill_index = get_skill_index()
+    exact_skill_ids = []
+    substring_skill_ids = []
+    skill_q = None
+    for token in skill_tokens:
+        exact_ids = skill_index.resolve(token)
+        if exact_ids:
+            exact_skill_ids.append((token, exact_ids))
+            continue
+        token_ids = resolve_skill_substring_ids(token)
+        if token_ids is not None:
+            substring_skill_ids.append((token, token_ids))
+        token_q = build_skill_substring_q(token, token_ids, skill_index.max_id)
+        skill_q = token_q if skill_q is None else skill_q | token_q
+    if exact_skill_ids:
+        # Tokens that name a master skill (or one of its ESCO aliases) become
+        # an indexed FK lookup; rows not yet linked to the master still match
+        # on any name of the resolved skills.
+        resolved_ids = sorted({pk for _token, ids in exact_skill_ids for pk in ids})
+        orphan_names = sorted(
+            {token for token, _ids in exact_skill_ids} | skill_index.expand_names(resolved_ids)
         )
-        qs = qs.filter(keyword_q)
-    if location:
-        location_q = (
-            Q(location__iexact=location)
-            | Q(current_city__iexact=location)
-            | Q(current_state__iexact=location)
-            | Q(country__iexact=location)
+        exact_q = Q(skill_id__in=resolved_ids) | Q(
+            skill__isnull=True, normalized_name__in=orphan_names
         )
-        qs = qs.filter(location_q)
-    if city:
-        qs = qs.filter(current_city__iexact=city)
-    if state:
-        qs = qs.filter(current_state__iexact=state)
-    if country:
-        qs = qs.filter(country__iexact=country)
-    if exp_min:
-        try:
-            qs = qs.filter(total_experience_months_calc__gte=int(float(exp_min) * 12))
-        except ValueError:
-            pass
-    if exp_max:
-        try:
-            qs = qs.filter(total_experience_months_calc__lte=int(float(exp_max) * 12))
-        except ValueError:
-            pass
+        skill_q = exact_q if skill_q is None else skill_q | exact_q
+    if requested_ids:
+        ids_q = Q(skill_id__in=requested_ids)
+        skill_q = ids_q if skill_q is None else skill_q | ids_q
 
-    skill_q = None
-    if skills:
-        tokens = [normalize_skill_name(s) for s in skills.split(",") if normalize_skill_name(s)]
-        for token in tokens:
-            token_q = (
-                Q(skills__normalized_name__icontains=token)
-                | Q(skills__skill__normalized_name__icontains=token)
-            )
-            skill_q = token_q if skill_q is None else skill_q | token_q
-    if skill_ids:
-        ids = [value for value in skill_ids.split(",") if value.strip()]
-        if ids:
-            ids_q = Q(skills__skill_id__in=ids)
-            skill_q = ids_q if skill_q is None else skill_q | ids_q
+    plan = SearchPlan(
+        cache_key=cache_key,
+        keywords=keywords,
+        keyword_mode="fulltext" if keyword_subquery is not None else "basic",
+        location=location,
+        include_relocation=wants_relocation(params),
+        cities=tuple(parse_location_keys(params.get("city"))),
+        states=tuple(parse_location_keys(params.get("state"))),
+        countries=tuple(parse_location_keys(params.get("country"))),
+        preferred_locations=tuple(parse_location_keys(params.get("preferred_location"))),
+        exp_min_months=parse_experience_months(params.get("exp_min")),
+        exp_max_months=parse_experience_months(params.get("exp_max")),
+        skill_tokens=tuple(skill_tokens),
+        skill_ids=tuple(requested_ids),
+        exact_skill_ids=tuple(exact_skill_ids),
+        substring_skill_ids=tuple(substring_skill_ids),
+        updated_within_days=updated_within_days,
+        updated_field=updated_field,
+        salary_min=parse_salary(params.get("salary_min")),
+        salary_max=parse_salary(params.get("salary_max")),
+        notice_period=normalize_notice_period(params.get("notice_period_code")),
+        genders=tuple(value.strip().upper() for value in gender.split(",") if value.strip()),
+        work_status=params.get("work_status", "").strip(),
+        availability_to_join=params.get("availability_to_join", "").strip(),
+        education=params.get("education", "").strip(),
+        ordering=resolve_search_ordering(params),
+    )
+    # Both search targets are filtered from the same compiled plan, so the
+    # document read model cannot drift from the profile search.
+    return replace(
+        plan,
+        q=build_search_q(plan, PROFILE_SEARCH_COLUMNS, keyword_subquery, skill_q),
+        document_q=build_search_q(plan, DOCUMENT_SEARCH_COLUMNS, keyword_subquery, skill_q),
+    )
+
+
+def build_search_q(plan, columns, keyword_subquery=None, skill_q=None):
+    """
+    The plan's filters as a Q over one search target. ``columns`` names the
+    target's scalar columns; multi-valued filters (skills, education and
+    preferred locations) always go through the indexed child rows,
+    correlated on ``columns["pk"]``. ``skill_q`` is the resolved condition on
+    CandidateSkill rows.
+    """
+    pk = columns["pk"]
+    q = Q()
+    if keyword_subquery is not None:
+        q &= Q(**{f"{pk}__in": keyword_subquery})
+    elif plan.keywords:
+        q &= (
+            Q(full_name__icontains=plan.keywords)
+            | Q(summary__icontains=plan.keywords)
+            | Q(profile_has_skill(Q(name__icontains=plan.keywords), profile_ref=pk))
+        )
+    if plan.location:
+        location_q = (
+            Q(**{columns["location"]: plan.location})
+            | Q(**{columns["city"]: plan.location})
+            | Q(**{columns["state"]: plan.location})
+            | Q(**{columns["country"]: plan.location})
+        )
+        if plan.include_relocation:
+            location_q |= Q(prefers_location([plan.location], profile_ref=pk))
+        q &= location_q
+    if plan.cities:
+        q &= Q(**{f"{columns['city']}__in": plan.cities})
+    if plan.states:
+        q &= build_state_q(plan.states, state_field=columns["state"], city_field=columns["city"])
+    if plan.countries:
+        q &= Q(**{f"{columns['country']}__in": plan.countries})
+    if plan.preferred_locations:
+        q &= Q(prefers_location(plan.preferred_locations, profile_ref=pk))
+    if plan.exp_min_months is not None:
+        q &= Q(**{f"{columns['experience']}__gte": plan.exp_min_months})
+    if plan.exp_max_months is not None:
+        q &= Q(**{f"{columns['experience']}__lte": plan.exp_max_months})
     if skill_q is not None:
-        qs = qs.filter(skill_q)
+        q &= Q(profile_has_skill(skill_q, profile_ref=pk))
 
-    normalized_type = (updated_type or "").lower()
-    if normalized_type in {"active_updated", "active/updated"}:
-        normalized_type = "active"
-    if not normalized_type:
-        normalized_type = "active"
-    cutoff = parse_updated_within(updated_within)
-    if cutoff:
-        if normalized_type == "created":
-            qs = qs.filter(created_at__gte=cutoff).order_by("-created_at")
-        else:
-            qs = qs.filter(last_active_at__gte=cutoff).order_by("-last_active_at")
-
-    if salary_min:
-        try:
-            qs = qs.filter(expected_salary__gte=int(str(salary_min).replace(",", "")))
-        except ValueError:
-            pass
-    if salary_max:
-        try:
-            qs = qs.filter(expected_salary__lte=int(str(salary_max).replace(",", "")))
-        except ValueError:
-            pass
-
-    if notice_period_code is not None:
-        normalized_notice = str(notice_period_code).strip()
-        immediate_tokens = {"", "0", "ANY", "IMMEDIATE_JOINER", "IMMEDIATE"}
-        if normalized_notice.upper() in immediate_tokens:
-            qs = qs.filter(
-                Q(notice_period_code__isnull=True)
-                | Q(notice_period_code="")
-                | Q(notice_period_code="0")
-                | Q(notice_period_code__in=["IMMEDIATE_JOINER", "IMMEDIATE", "ANY"])
-            )
-        elif normalized_notice:
-            qs = qs.filter(notice_period_code=normalized_notice)
+    if plan.salary_min is not None:
+        q &= Q(expected_salary__gte=plan.salary_min)
+    if plan.salary_max is not None:
+        q &= Q(expected_salary__lte=plan.salary_max)
+
+    notice_q = build_notice_period_q(plan.notice_period)
+    if notice_q is not None:
+        q &= notice_q
 
-    if gender:
-        gender_values = [value.strip().upper() for value in gender.split(",") if value.strip()]
-        if gender_values:
-            qs = qs.filter(gender__in=gender_values)
+    if plan.genders:
+        q &= Q(gender__in=plan.genders)
 
-    if work_status:
-        normalized_status = work_status.strip().upper()
+    if plan.work_status:
+        normalized_status = plan.work_status.upper()
         if normalized_status == "FRESHER":
-            qs = qs.filter(total_experience_months_calc=0)
+            q &= Q(**{columns["experience"]: 0})
         elif normalized_status == "EXPERIENCED":
-            qs = qs.filter(total_experience_months_calc__gt=0)
+            q &= Q(**{f"{columns['experience']}__gt": 0})
         else:
-            qs = qs.filter(work_status=work_status)
+            q &= Q(work_status=plan.work_status)
+
+    if plan.availability_to_join:
+        q &= Q(availability_to_join=plan.availability_to_join)
+    if plan.education:
+        q &= Q(
+            Exists(
+                CandidateEducation.objects.filter(
+                    profile_id=OuterRef(pk), degree=plan.education
+                )
+            )
+        )
+    return q
 
-    if availability:
-        qs = qs.filter(availability_to_join=availability)
-    if education_level:
-        qs = qs.filter(educations__degree=education_level)
 
-    return qs.distinct()
+SEARCH_PLAN_CACHE_SIZE = 256
+_plan_lock = threading.Lock()
+_plans = OrderedDict()
+
+
+def get_search_plan(params):
+    """Compiled plan for ``params``, memoized in a process-local LRU."""
+    key = build_plan_cache_key(params)
+    with _plan_lock:
+        plan = _plans.get(key)
+        if plan is not None:
+            _plans.move_to_end(key)
+            return plan
+    plan = compile_search_plan(params, cache_key=key)
+    with _plan_lock:
+        _plans[key] = plan
+        _plans.move_to_end(key)
+        while len(_plans) > SEARCH_PLAN_CACHE_SIZE:
+            _plans.popitem(last=False)
+    return plan
+
+
+def apply_search_filters(queryset, params):
+    return get_search_plan(params).apply(queryset)
 
 
-__all__ = ["has_search_inputs", "apply_search_filters"]
+__all__ = [
+    "has_search_inputs",
+    "apply_search_filters",
+    "compile_search_plan",
+    "get_search_plan",
+    "parse_location_keys",
+    "resolve_search_ordering",
+]
@@ -13,6 +13,10 @@ DEFAULT_FILTER_VALUES = {
     "notice_period_code": "IMMEDIATE_JOINER",
 }
 
+# Query params that drive paging rather than which candidates match.
+PAGINATION_PARAM_KEYS = {"page", "page_size", "cursor", "pagination", "include_count"}
+# Result ordering is a view choice, not a filter; presets and filter hashes skip it.
+ORDERING_PARAM_KEYS = {"sort"}
 COMMA_SORT_FIELDS = {"skills", "skill_ids", "gender"}
 NUMERIC_FILTER_KEYS = {"exp_min", "exp_max", "salary_min", "salary_max"}
 VALID_UPDATED_WITHIN = {"1_DAY", "3_DAYS", "7_DAYS", "15_DAYS", "1_MONTH", "3_MONTHS", "6_MONTHS"}
@@ -30,9 +34,11 @@ def _normalize_scalar(value):
     return value
 
 
-def canonicalize_effective_filters(filters):
+def canonicalize_effective_filters(filters, keep_defaults=False):
     cleaned = {}
     for key in sorted(filters.keys()):
+        if key in PAGINATION_PARAM_KEYS or key in ORDERING_PARAM_KEYS:
+            continue
         value = filters.get(key)
         normalized = _normalize_scalar(value)
         if normalized is None:
@@ -63,7 +69,7 @@ def canonicalize_effective_filters(filters):
                 normalized = "active"
             if normalized not in VALID_UPDATED_TYPE:
                 continue
-        if str(normalized) == str(DEFAULT_FILTER_VALUES.get(key)):
+        if not keep_defaults and str(normalized) == str(DEFAULT_FILTER_VALUES.get(key)):
             continue
         cleaned[key] = normalized
     return cleaned
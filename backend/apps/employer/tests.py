@@ -1,12 +1,51 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APITestCase
 from apps.accounts.models import User
-from apps.candidates.models import CandidateProfile, CandidateSkill
+from apps.candidates.services.search import (
+    SEARCH_GENERATION_KEY,
+    bump_search_generation,
+    get_search_generation,
+)
+from apps.candidates.models import (
+    CandidateEducation,
+    CandidateEmployment,
+    CandidateProfile,
+    CandidateSkill,
+)
+from apps.candidates.utils.current_employment import sync_current_employment
+from apps.candidates.utils.preferred_locations import sync_preferred_locations
+from apps.candidates.utils.skills import resolve_master_skills
+from apps.candidates.views_common import touch_profile
 from apps.organizations.models import Organization
+from apps.skills.models import Skill
+from apps.skills.aliases import get_alias_map
+from apps.skills.search_index import get_skill_index
 from .models import EmployerSearchPreset
+from .search import CandidateSearchView
+from .services.relevance import RELEVANCE_FIELD_WEIGHTS, load_term_frequencies, rank_candidate_ids
+from .services.search_cache import build_result_cache_key
+from .services.search_documents import build_document_search_queryset
+from .services.search_filters import (
+    apply_search_filters,
+    build_candidate_search_queryset,
+    _plans,
+    build_skill_substring_q,
+    get_search_plan,
+)
 
 
 class EmployerSearchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+
     def test_empty_search_returns_no_results(self):
         org = Organization.objects.create(
             name="Test Org",
@@ -154,9 +193,883 @@ class EmployerSearchTests(APITestCase):
         self.assertEqual(response.data["count"], 1)
         self.assertEqual(response.data["results"][0]["id"], str(immediate_profile.id))
 
+        # An empty notice period still filters to immediate joiners, so it
+        # must not share a plan or cached ids with no notice filter at all.
+        empty_notice = {"location": "Remote", "notice_period_code": ""}
+        no_notice = {"location": "Remote"}
+        self.assertIsNot(get_search_plan(empty_notice), get_search_plan(no_notice))
+        for first, second in ((empty_notice, no_notice), (no_notice, empty_notice)):
+            cache.clear()
+            _plans.clear()
+            counts = {}
+            for params in (first, second):
+                response = self.client.get(url, params)
+                counts[params.get("notice_period_code")] = response.data["count"]
+            self.assertEqual(counts, {"": 1, None: 2})
+
+    def test_search_excludes_profiles_below_completion_threshold(self):
+        org = Organization.objects.create(
+            name="Test Org",
+            code="TEST04",
+            address="Address",
+            contact_number="123456",
+        )
+        employer = User.objects.create_user(
+            email="employer4@example.com",
+            password="StrongPass123!",
+            full_name="Employer User 4",
+            role=User.Role.EMPLOYER,
+            organization=org,
+        )
+        complete_profile = None
+        for index, percent in enumerate((0, 45, 60, 95)):
+            candidate_user = User.objects.create_user(
+                email=f"cand_threshold{index}@example.com",
+                password="StrongPass123!",
+                full_name=f"Cand Threshold {index}",
+                role=User.Role.CANDIDATE,
+            )
+            profile = CandidateProfile.objects.create(
+                user=candidate_user,
+                full_name=f"Cand Threshold {index}",
+                email=f"cand_threshold{index}@example.com",
+                location="Remote",
+                is_searchable=True,
+            )
+            profile.profile_completion_percent = percent
+            profile.save(update_fields=["profile_completion_percent"])
+            if percent == 60:
+                complete_profile = profile
+
+        self.client.force_authenticate(user=employer)
+        url = reverse("employer-candidates")
+        response = self.client.get(f"{url}?location=Remote&page_size=1")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertIsNotNone(response.data["next"])
+        result_ids = {response.data["results"][0]["id"]}
+        second = self.client.get(f"{url}?location=Remote&page_size=1&page=2")
+        result_ids.add(second.data["results"][0]["id"])
+        self.assertIn(str(complete_profile.id), result_ids)
+
+
+    def test_cursor_pagination_walks_forward_and_back(self):
+        org = Organization.objects.create(
+            name="Test Org",
+            code="TEST05",
+            address="Address",
+            contact_number="123456",
+        )
+        employer = User.objects.create_user(
+            email="employer5@example.com",
+            password="StrongPass123!",
+            full_name="Employer User 5",
+            role=User.Role.EMPLOYER,
+            organization=org,
+        )
+        for index in range(3):
+            candidate_user = User.objects.create_user(
+                email=f"cand_cursor{index}@example.com",
+                password="StrongPass123!",
+                full_name=f"Cand Cursor {index}",
+                role=User.Role.CANDIDATE,
+            )
+            profile = CandidateProfile.objects.create(
+                user=candidate_user,
+                full_name=f"Cand Cursor {index}",
+                email=f"cand_cursor{index}@example.com",
+                location="Remote",
+                is_searchable=True,
+            )
+            profile.profile_completion_percent = 80
+            profile.save(update_fields=["profile_completion_percent"])
+        expected_ids = [
+            str(pk)
+            for pk in CandidateProfile.objects.order_by("-updated_at", "-id").values_list("id", flat=True)
+        ]
+
+        self.client.force_authenticate(user=employer)
+        url = reverse("employer-candidates")
+        first = self.client.get(f"{url}?location=Remote&pagination=cursor&page_size=2")
+        self.assertEqual(first.status_code, 200)
+        self.assertNotIn("count", first.data)
+        self.assertIsNone(first.data["previous"])
+        self.assertEqual([row["id"] for row in first.data["results"]], expected_ids[:2])
+
+        second = self.client.get(first.data["next"])
+        self.assertEqual([row["id"] for row in second.data["results"]], expected_ids[2:])
+        self.assertIsNone(second.data["next"])
+
+        back = self.client.get(f"{second.data['previous']}&include_count=true")
+        self.assertEqual([row["id"] for row in back.data["results"]], expected_ids[:2])
+        self.assertEqual(back.data["count"], 3)
+
+        default_size = self.client.get(f"{url}?location=Remote&pagination=cursor&page_size=0")
+        self.assertEqual(len(default_size.data["results"]), 3)
+
+        recent = self.client.get(reverse("employer-search-recent"))
+        self.assertEqual(recent.data[0]["filters"], {"location": "Remote"})
+
+
+    def test_cursor_errors_are_bad_requests(self):
+        org = Organization.objects.create(
+            name="Test Org",
+            code="TEST16",
+            address="Address",
+            contact_number="123456",
+        )
+        employer = User.objects.create_user(
+            email="employer16@example.com",
+            password="StrongPass123!",
+            full_name="Employer User 16",
+            role=User.Role.EMPLOYER,
+            organization=org,
+        )
+        self.client.force_authenticate(user=employer)
+        url = reverse("employer-candidates")
+
+        for cursor in ("not-a-cursor", "eyJ2IjoieCJ9", "e30="):
+            invalid = self.client.get(f"{url}?location=Remote&cursor={cursor}")
+            self.assertEqual(invalid.status_code, 400)
+            self.assertEqual(invalid.data["code"], "INVALID_CURSOR")
+
+        with patch.object(
+            CandidateSearchView, "get_queryset", lambda view: CandidateProfile.objects.order_by("id")
+        ):
+            unordered = self.client.get(f"{url}?location=Remote&pagination=cursor")
+        self.assertEqual(unordered.status_code, 400)
+        self.assertEqual(unordered.data["code"], "CURSOR_ORDERING_UNSUPPORTED")
+
+    def test_result_ids_are_cached_until_a_profile_is_touched(self):
+        org = Organization.objects.create(
+            name="Test Org",
+            code="TEST06",
+            address="Address",
+            contact_number="123456",
+        )
+        employer = User.objects.create_user(
+            email="employer6@example.com",
+            password="StrongPass123!",
+            full_name="Employer User 6",
+            role=User.Role.EMPLOYER,
+            organization=org,
+        )
+        profiles = []
+        for index in range(2):
+            candidate_user = User.objects.create_user(
+                email=f"cand_cache{index}@example.com",
+                password="StrongPass123!",
+                full_name=f"Cand Cache {index}",
+                role=User.Role.CANDIDATE,
+            )
+            profile = CandidateProfile.objects.create(
+                user=candidate_user,
+                full_name=f"Cand Cache {index}",
+                email=f"cand_cache{index}@example.com",
+                location="Pune",
+                is_searchable=index == 0,
+            )
+            profile.profile_completion_percent = 80
+            profile.save(update_fields=["profile_completion_percent"])
+            profiles.append(profile)
+
+        self.client.force_authenticate(user=employer)
+        url = reverse("employer-candidates")
+        response = self.client.get(f"{url}?location=Pune")
+        self.assertEqual(response.data["count"], 1)
+
+        CandidateProfile.objects.filter(id=profiles[1].id).update(is_searchable=True)
+        response = self.client.get(f"{url}?location=Pune")
+        self.assertEqual(response.data["count"], 1)
+
+        # The generation moves only once the touching write commits.
+        with self.captureOnCommitCallbacks(execute=True):
+            touch_profile(profiles[1])
+            response = self.client.get(f"{url}?location=Pune")
+            self.assertEqual(response.data["count"], 1)
+        response = self.client.get(f"{url}?location=Pune")
+        self.assertEqual(response.data["count"], 2)
+
+        CandidateProfile.objects.filter(id__in=[p.id for p in profiles]).update(
+            last_active_at=timezone.now() - timedelta(days=10)
+        )
+        bump_search_generation()
+        self.assertNotEqual(
+            build_result_cache_key({"location": "Pune", "updated_within": "1"}),
+            build_result_cache_key({"location": "Pune", "updated_within": "365"}),
+        )
+        response = self.client.get(f"{url}?location=Pune&updated_within=365")
+        self.assertEqual(response.data["count"], 2)
+        response = self.client.get(f"{url}?location=Pune&updated_within=1")
+        self.assertEqual(response.data["count"], 0)
+
+        # Applied values key the cache: list order, case and repeats do not
+        # split it, and an empty notice period differs from none at all.
+        self.assertEqual(
+            build_result_cache_key({"city": "Pune,Delhi", "state": "MH", "skills": "Python,SQL"}),
+            build_result_cache_key({"city": "delhi, pune,Pune", "state": "mh", "skills": "sql,python"}),
+        )
+        self.assertNotEqual(
+            build_result_cache_key({"location": "Pune", "notice_period_code": ""}),
+            build_result_cache_key({"location": "Pune"}),
+        )
+
+    def test_search_generation_never_repeats_after_eviction(self):
+        generation = get_search_generation()
+        cache.delete(SEARCH_GENERATION_KEY)
+        self.assertGreater(get_search_generation(), generation)
+
+
+    @override_settings(CANDIDATE_SEARCH_BACKEND="document")
+    def test_document_backend_filters_without_joins(self):
+        org = Organization.objects.create(
+            name="Test Org",
+            code="TEST07",
+            address="Address",
+            contact_number="123456",
+        )
+        employer = User.objects.create_user(
+            email="employer7@example.com",
+            password="StrongPass123!",
+            full_name="Employer User 7",
+            role=User.Role.EMPLOYER,
+            organization=org,
+        )
+        matching = None
+        for index, skill_name in enumerate(("Django", "Flask")):
+            candidate_user = User.objects.create_user(
+                email=f"cand_doc{index}@example.com",
+                password="StrongPass123!",
+                full_name=f"Cand Doc {index}",
+                role=User.Role.CANDIDATE,
+            )
+            profile = CandidateProfile.objects.create(
+                user=candidate_user,
+                full_name=f"Cand Doc {index}",
+                email=f"cand_doc{index}@example.com",
+                current_city="Chennai",
+                total_experience_years=3,
+                is_searchable=True,
+                profile_completion_percent=80,
+            )
+            CandidateSkill.objects.create(profile=profile, name=skill_name)
+            CandidateEducation.objects.create(
+                profile=profile,
+                degree="B.Tech",
+                institution="IIT",
+                start_year=2014,
+                end_year=2018,
+            )
+            if index == 0:
+                matching = profile
+        call_command("rebuild_search_documents", stdout=StringIO())
+
+        self.client.force_authenticate(user=employer)
+        url = reverse("employer-candidates")
+        response = self.client.get(
+            f"{url}?skills=django&city=chennai&exp_min=2&education=B.Tech"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["id"], str(matching.id))
+
+    def test_document_backend_matches_profile_search(self):
+        javascript = Skill.objects.create(name="JavaScript", alt_labels="JS")
+        rows = (
+            ("JavaScript", javascript, "Chennai", "B.Tech"),
+            ("javascript", None, "Chennai", "M.Tech"),
+            ("Java Script", javascript, "Pune", "B.Tech"),
+            ("JavaScript", javascript, "Chennai", "B.Tech"),
+            ("Python", None, "Pune", "B.Sc"),
+        )
+        profiles = []
+        for index, (skill_name, skill, city, degree) in enumerate(rows):
+            candidate_user = User.objects.create_user(
+                email=f"cand_parity{index}@example.com",
+                password="StrongPass123!",
+                full_name=f"Cand Parity {index}",
+                role=User.Role.CANDIDATE,
+            )
+            profile = CandidateProfile.objects.create(
+                user=candidate_user,
+                full_name=f"Cand Parity {index}",
+                email=f"cand_parity{index}@example.com",
+                current_city=city,
+                total_experience_years=index,
+                is_searchable=True,
+                profile_completion_percent=80,
+            )
+            CandidateSkill.objects.create(profile=profile, name=skill_name, skill=skill)
+            CandidateEducation.objects.create(
+                profile=profile,
+                degree=degree,
+                institution="IIT",
+                start_year=2014,
+                end_year=2018,
+            )
+            profiles.append(profile)
+        call_command("rebuild_search_documents", stdout=StringIO())
+        # Deactivated after indexing, so the document still says searchable.
+        User.objects.filter(pk=profiles[3].user_id).update(is_active=False)
+
+        searches = (
+            {"skills": "JS"},
+            {"skills": "javascript", "city": "chennai"},
+            {"skill_ids": str(javascript.id)},
+            {"skills": "script", "exp_min": "1"},
+            {"education": "B.Tech"},
+            {"keywords": "Parity", "state": "", "city": "Pune,pune"},
+        )
+        for params in searches:
+            with self.subTest(params=params):
+                by_profile = apply_search_filters(build_candidate_search_queryset(), params)
+                by_document = build_document_search_queryset(params)
+                self.assertEqual(
+                    list(by_document.values_list("id", flat=True)),
+                    list(by_profile.values_list("id", flat=True)),
+                )
+        self.assertEqual(
+            sorted(
+                build_document_search_queryset({"skills": "JS"}).values_list("full_name", flat=True)
+            ),
+            ["Cand Parity 0", "Cand Parity 1", "Cand Parity 2"],
+        )
+
+
+    @override_settings(CANDIDATE_KEYWORD_SEARCH="fulltext")
+    def test_fulltext_keyword_search_uses_index_and_ranks(self):
+        org = Organization.objects.create(
+            name="Test Org",
+            code="TEST08",
+            address="Address",
+            contact_number="123456",
+        )
+        employer = User.objects.create_user(
+            email="employer8@example.com",
+            password="StrongPass123!",
+            full_name="Employer User 8",
+            role=User.Role.EMPLOYER,
+            organization=org,
+        )
+        summaries = (
+            "Backend developer building Python services.",
+            "Frontend developer focused on React.",
+        )
+        for index, summary in enumerate(summaries):
+            candidate_user = User.objects.create_user(
+                email=f"cand_fts{index}@example.com",
+                password="StrongPass123!",
+                full_name=f"Cand Fts {index}",
+                role=User.Role.CANDIDATE,
+            )
+            CandidateProfile.objects.create(
+                user=candidate_user,
+                full_name=f"Cand Fts {index}",
+                email=f"cand_fts{index}@example.com",
+                summary=summary,
+                is_searchable=True,
+                profile_completion_percent=80,
+            )
+        call_command("rebuild_search_documents", stdout=StringIO())
+
+        self.client.force_authenticate(user=employer)
+        url = reverse("employer-candidates")
+        response = self.client.get(f"{url}?keywords=python backend")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 1)
+        result = response.data["results"][0]
+        self.assertEqual(result["full_name"], "Cand Fts 0")
+        self.assertGreater(result["keyword_rank"], 0)
+
+        response = self.client.get(f"{url}?keywords=developer")
+        self.assertEqual(response.data["count"], 2)
+
+
+    def test_partial_skill_token_matches_linked_and_unlinked_skills(self):
+        org = Organization.objects.create(
+            name="Test Org",
+            code="TEST09",
+            address="Address",
+            contact_number="123456",
+        )
+        employer = User.objects.create_user(
+            email="employer9@example.com",
+            password="StrongPass123!",
+            full_name="Employer User 9",
+            role=User.Role.EMPLOYER,
+            organization=org,
+        )
+        javascript = Skill.objects.create(name="JavaScript")
+        for index, (skill_name, skill) in enumerate(
+            (("JavaScript", javascript), ("TypeScript", None), ("Go", None))
+        ):
+            candidate_user = User.objects.create_user(
+                email=f"cand_trgm{index}@example.com",
+                password="StrongPass123!",
+                full_name=f"Cand Trgm {index}",
+                role=User.Role.CANDIDATE,
+            )
+            profile = CandidateProfile.objects.create(
+                user=candidate_user,
+                full_name=f"Cand Trgm {index}",
+                email=f"cand_trgm{index}@example.com",
+                is_searchable=True,
+                profile_completion_percent=80,
+            )
+            CandidateSkill.objects.create(profile=profile, name=skill_name, skill=skill)
+
+        self.client.force_authenticate(user=employer)
+        url = reverse("employer-candidates")
+        response = self.client.get(f"{url}?skills=script")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(row["full_name"] for row in response.data["results"]),
+            ["Cand Trgm 0", "Cand Trgm 1"],
+        )
+
+        # Broad tokens match through a Skill subquery instead of an id list.
+        with patch("apps.employer.services.search_filters.SKILL_ID_LIST_LIMIT", 0):
+            broad = CandidateSkill.objects.filter(build_skill_substring_q("script", (javascript.pk,)))
+            self.assertIn("skills_skill", str(broad.query))
+            self.assertEqual(sorted(broad.values_list("name", flat=True)), ["JavaScript", "TypeScript"])
+
+        # A memoized plan still matches candidates linked to skills appended
+        # after it was compiled; appending does not move the plan key.
+        plan = get_search_plan({"skills": "rustac"})
+        with self.captureOnCommitCallbacks(execute=True):
+            rust = resolve_master_skills([{"name": "Rustacean", "normalized": "rustacean"}])["rustacean"]
+        profile = CandidateProfile.objects.get(full_name="Cand Trgm 2")
+        CandidateSkill.objects.create(profile=profile, name="Rustacean", skill=rust)
+        self.assertIs(get_search_plan({"skills": "rustac"}), plan)
+        self.assertEqual(
+            list(plan.apply(build_candidate_search_queryset()).values_list("full_name", flat=True)),
+            ["Cand Trgm 2"],
+        )
+
+    def test_relevance_sort_ranks_best_skill_match_first(self):
+        org = Organization.objects.create(
+            name="Test Org",
+            code="TEST10",
+            address="Address",
+            contact_number="123456",
+        )
+        employer = User.objects.create_user(
+            email="employer10@example.com",
+            password="StrongPass123!",
+            full_name="Employer User 10",
+            role=User.Role.EMPLOYER,
+            organization=org,
+        )
+        candidates = (
+            ("Cand Rel Both", ["Python", "Django"], "Backend engineer"),
+            ("Cand Rel Python", ["Python"], "Data analyst"),
+            ("Cand Rel Other", ["Excel"], "Analyst"),
+        )
+        for index, (name, skill_names, summary) in enumerate(candidates):
+            candidate_user = User.objects.create_user(
+                email=f"cand_rel{index}@example.com",
+                password="StrongPass123!",
+                full_name=name,
+                role=User.Role.CANDIDATE,
+            )
+            profile = CandidateProfile.objects.create(
+                user=candidate_user,
+                full_name=name,
+                email=f"cand_rel{index}@example.com",
+                summary=summary,
+                is_searchable=True,
+                profile_completion_percent=80,
+            )
+            for skill_name in skill_names:
+                CandidateSkill.objects.create(profile=profile, name=skill_name)
+
+        self.client.force_authenticate(user=employer)
+        url = reverse("employer-candidates")
+        response = self.client.get(f"{url}?skills=python,django&sort=relevance&pagination=cursor")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(
+            [row["full_name"] for row in response.data["results"]],
+            ["Cand Rel Both", "Cand Rel Python"],
+        )
+
+        self.assertNotIn("relevance_truncated", response.data)
+        recent = self.client.get(reverse("employer-search-recent"))
+        self.assertEqual(recent.data[0]["filters"], {"skills": "django,python"})
+
+        default_order = self.client.get(f"{url}?skills=python,django")
+        self.assertEqual(default_order.data["results"][0]["full_name"], "Cand Rel Python")
+
+        # Capped at one scored match: the true count stays 2, the freshest
+        # match is ranked and the other follows unranked.
+        cache.clear()
+        with patch("apps.employer.services.relevance.MAX_RELEVANCE_CANDIDATES", 1), patch(
+            "apps.employer.services.search_cache.MAX_RELEVANCE_CANDIDATES", 1
+        ):
+            truncated = self.client.get(f"{url}?skills=python,django&sort=relevance")
+        self.assertEqual(truncated.data["count"], 2)
+        self.assertTrue(truncated.data["relevance_truncated"])
+        self.assertEqual(truncated.data["relevance_scored"], 1)
+        self.assertEqual(
+            [row["full_name"] for row in truncated.data["results"]],
+            ["Cand Rel Python", "Cand Rel Both"],
+        )
+
+        # Deeper pages are served from the cached ranking, not re-ranked.
+        cache.clear()
+        with patch("apps.employer.services.search_cache.SEARCH_RESULT_CACHE_MAX_IDS", 1), patch(
+            "apps.employer.services.search_cache.rank_candidate_ids", wraps=rank_candidate_ids
+        ) as rank:
+            pages = [
+                self.client.get(f"{url}?skills=python,django&sort=relevance&page_size=1&page={page}")
+                for page in (1, 2)
+            ]
+        self.assertEqual(rank.call_count, 1)
+        self.assertEqual(
+            [page.data["results"][0]["full_name"] for page in pages],
+            ["Cand Rel Both", "Cand Rel Python"],
+        )
+
+    def test_relevance_counts_each_employment_title_once(self):
+        candidate_user = User.objects.create_user(
+            email="cand_title@example.com",
+            password="StrongPass123!",
+            full_name="Cand Title",
+            role=User.Role.CANDIDATE,
+        )
+        profile = CandidateProfile.objects.create(
+            user=candidate_user,
+            full_name="Cand Title",
+            email="cand_title@example.com",
+        )
+        # The only employment is past, so it also becomes current_title.
+        CandidateEmployment.objects.create(
+            profile=profile,
+            company="Acme",
+            title="Python Developer",
+            start_date="2020-01-01",
+            end_date="2022-01-01",
+        )
+        sync_current_employment(profile)
+        self.assertEqual(profile.current_title, "Python Developer")
+
+        tfs, _lengths = load_term_frequencies([profile.id], {"python"})
+        self.assertEqual(tfs["python"][0], RELEVANCE_FIELD_WEIGHTS["titles"])
+
+    def test_facets_count_filtered_candidates_per_facet(self):
+        org = Organization.objects.create(
+            name="Test Org",
+            code="TEST11",
+            address="Address",
+            contact_number="123456",
+        )
+        employer = User.objects.create_user(
+            email="employer11@example.com",
+            password="StrongPass123!",
+            full_name="Employer User 11",
+            role=User.Role.EMPLOYER,
+            organization=org,
+        )
+        candidates = (
+            ("Chennai", "Tamil Nadu", 0, 250000, "Python"),
+            ("chennai", "Tamil Nadu", 3, 800000, "Python"),
+            ("Pune", "Maharashtra", 12, None, "Python"),
+            ("Pune", "Maharashtra", 4, 800000, "Excel"),
+        )
+        for index, (city, state, years, salary, skill_name) in enumerate(candidates):
+            candidate_user = User.objects.create_user(
+                email=f"cand_facet{index}@example.com",
+                password="StrongPass123!",
+                full_name=f"Cand Facet {index}",
+                role=User.Role.CANDIDATE,
+            )
+            profile = CandidateProfile.objects.create(
+                user=candidate_user,
+                full_name=f"Cand Facet {index}",
+                email=f"cand_facet{index}@example.com",
+                current_city=city,
+                current_state=state,
+                total_experience_years=years,
+                expected_salary=salary,
+                is_searchable=True,
+                profile_completion_percent=80,
+            )
+            CandidateSkill.objects.create(profile=profile, name=skill_name)
+
+        self.client.force_authenticate(user=employer)
+        url = reverse("employer-candidate-facets")
+        get_skill_index()
+        get_alias_map()
+        empty = self.client.get(url)
+        self.assertEqual(empty.data["count"], 0)
+        self.assertEqual(empty.data["facets"]["city"], [])
+
+        # One aggregate for the total and buckets, then one per text facet.
+        with self.assertNumQueries(6):
+            response = self.client.get(f"{url}?skill_ids=&keywords=Cand&skills=python")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["count"], 3)
+        facets = response.data["facets"]
+        self.assertEqual(facets["city"], [{"value": "Chennai", "count": 2}, {"value": "Pune", "count": 1}])
+        self.assertEqual(
+            {entry["value"]: entry["count"] for entry in facets["experience"]},
+            {"FRESHER": 1, "0_2": 0, "2_5": 1, "5_10": 0, "10_PLUS": 1},
+        )
+        self.assertEqual(
+            {entry["value"]: entry["count"] for entry in facets["salary"]},
+            {"0_3L": 1, "3L_6L": 0, "6L_10L": 1, "10L_20L": 0, "20L_PLUS": 0},
+        )
+        self.assertEqual(facets["notice_period_code"], [{"value": "IMMEDIATE_JOINER", "count": 3}])
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(f"{url}?skills=python&keywords=Cand")
+        self.assertEqual(cached.data, response.data)
+
+        with self.assertNumQueries(1):
+            recent = self.client.get(f"{url}?skills=python&keywords=Cand&updated_within=1")
+        self.assertEqual(recent.data["facets"]["city"], [])
+        self.assertEqual(recent.data["count"], 0)
+
+    def test_multi_valued_filters_compile_to_exists_without_distinct(self):
+        params = {
+            "keywords": "django",
+            "skills": "python,sql",
+            "skill_ids": "1,2",
+            "education": "B.Tech",
+        }
+        queryset = apply_search_filters(build_candidate_search_queryset(), params)
+        sql = str(queryset.query).upper()
+        self.assertNotIn("DISTINCT", sql)
+        self.assertIn("EXISTS", sql)
+        self.assertNotIn("JOIN \"CANDIDATES_CANDIDATESKILL\"", sql)
+        self.assertNotIn("JOIN \"CANDIDATES_CANDIDATEEDUCATION\"", sql)
+        # SQLite reports "USE TEMP B-TREE FOR DISTINCT", Postgres a Unique node.
+        plan = queryset.explain().upper()
+        self.assertNotIn("DISTINCT", plan)
+        self.assertNotIn("UNIQUE", plan)
+        self.assertEqual(list(queryset), [])
+
+    def test_city_and_state_filters_use_normalized_keys(self):
+        org = Organization.objects.create(
+            name="Test Org",
+            code="TEST12",
+            address="Address",
+            contact_number="123456",
+        )
+        employer = User.objects.create_user(
+            email="employer12@example.com",
+            password="StrongPass123!",
+            full_name="Employer User 12",
+            role=User.Role.EMPLOYER,
+            organization=org,
+        )
+        candidates = (
+            ("  CHENNAI ", "Tamil Nadu"),
+            ("Coimbatore", ""),
+            ("Pune", "Maharashtra"),
+            ("Mumbai", "Maharashtra"),
+        )
+        for index, (city, state) in enumerate(candidates):
+            candidate_user = User.objects.create_user(
+                email=f"cand_loc{index}@example.com",
+                password="StrongPass123!",
+                full_name=f"Cand Loc {index}",
+                role=User.Role.CANDIDATE,
+            )
+            CandidateProfile.objects.create(
+                user=candidate_user,
+                full_name=f"Cand Loc {index}",
+                email=f"cand_loc{index}@example.com",
+                current_city=city,
+                current_state=state,
+                is_searchable=True,
+                profile_completion_percent=80,
+            )
+
+        self.client.force_authenticate(user=employer)
+        url = reverse("employer-candidates")
+        response = self.client.get(f"{url}?city=chennai, pune")
+        self.assertEqual(
+            sorted(row["full_name"] for row in response.data["results"]),
+            ["Cand Loc 0", "Cand Loc 2"],
+        )
+        response = self.client.get(f"{url}?state=tamil nadu")
+        self.assertEqual(
+            sorted(row["full_name"] for row in response.data["results"]),
+            ["Cand Loc 0", "Cand Loc 1"],
+        )
+
+    def test_preferred_location_and_relocation_filters(self):
+        org = Organization.objects.create(
+            name="Test Org",
+            code="TEST13",
+            address="Address",
+            contact_number="123456",
+        )
+        employer = User.objects.create_user(
+            email="employer13@example.com",
+            password="StrongPass123!",
+            full_name="Employer User 13",
+            role=User.Role.EMPLOYER,
+            organization=org,
+        )
+        candidates = (
+            ("Bengaluru", []),
+            ("Chennai", ["Bengaluru"]),
+            ("Pune", ["Mumbai"]),
+        )
+        for index, (city, preferred) in enumerate(candidates):
+            candidate_user = User.objects.create_user(
+                email=f"cand_pref{index}@example.com",
+                password="StrongPass123!",
+                full_name=f"Cand Pref {index}",
+                role=User.Role.CANDIDATE,
+            )
+            profile = CandidateProfile.objects.create(
+                user=candidate_user,
+                full_name=f"Cand Pref {index}",
+                email=f"cand_pref{index}@example.com",
+                current_city=city,
+                preferred_locations=preferred,
+                is_searchable=True,
+                profile_completion_percent=80,
+            )
+            sync_preferred_locations(profile)
+
+        self.client.force_authenticate(user=employer)
+        url = reverse("employer-candidates")
+        response = self.client.get(f"{url}?preferred_location=bengaluru,Delhi")
+        self.assertEqual([row["full_name"] for row in response.data["results"]], ["Cand Pref 1"])
+
+        response = self.client.get(f"{url}?location=Bengaluru")
+        self.assertEqual([row["full_name"] for row in response.data["results"]], ["Cand Pref 0"])
+
+        response = self.client.get(f"{url}?location=Bengaluru&include_relocation=true")
+        self.assertEqual(
+            sorted(row["full_name"] for row in response.data["results"]),
+            ["Cand Pref 0", "Cand Pref 1"],
+        )
+
+    def test_search_plan_is_compiled_once_per_canonical_filters(self):
+        plan = get_search_plan({"skills": "Python, SQL", "exp_min": "2", "updated_within": "7_DAYS"})
+        same = get_search_plan({"updated_within": "7_days", "exp_min": "2", "skills": "SQL,Python"})
+        self.assertIs(plan, same)
+
+        described = plan.describe()
+        self.assertEqual(described["skill_tokens"], ("python", "sql"))
+        self.assertEqual(described["exp_min_months"], 24)
+        self.assertEqual(described["updated_within_days"], 7)
+        self.assertEqual(described["ordering"], ("-last_active_at", "-id"))
+        self.assertIn("total_experience_in_months__gte", described["q"])
+        self.assertIn("last_active_at__gte", str(plan.cutoff_q()))
+
+    def test_search_plan_key_follows_the_parsed_updated_within_window(self):
+        plain = get_search_plan({"location": "Pune"})
+        six_months = get_search_plan({"location": "Pune", "updated_within": "6M"})
+        self.assertIsNot(plain, six_months)
+        self.assertIsNone(plain.updated_within_days)
+        self.assertEqual(plain.ordering, ("-updated_at", "-id"))
+        self.assertEqual(six_months.updated_within_days, 180)
+        self.assertEqual(six_months.ordering, ("-last_active_at", "-id"))
+        self.assertIs(six_months, get_search_plan({"location": "Pune", "updated_within": "180"}))
+        self.assertIsNot(
+            get_search_plan({"location": "Pune", "updated_within": "30"}),
+            get_search_plan({"location": "Pune", "updated_within": "1"}),
+        )
+
+    def test_skill_tokens_resolve_to_master_ids_by_name_and_alt_label(self):
+        org = Organization.objects.create(
+            name="Test Org",
+            code="TEST14",
+            address="Address",
+            contact_number="123456",
+        )
+        employer = User.objects.create_user(
+            email="employer14@example.com",
+            password="StrongPass123!",
+            full_name="Employer User 14",
+            role=User.Role.EMPLOYER,
+            organization=org,
+        )
+        postgres = Skill.objects.create(name="PostgreSQL", alt_labels="Postgres\nPG database")
+        mysql = Skill.objects.create(name="MySQL")
+        candidates = (
+            ("PostgreSQL", postgres),
+            ("postgres", None),
+            ("MySQL", mysql),
+            ("Postgres tuning", None),
+        )
+        for index, (skill_name, skill) in enumerate(candidates):
+            candidate_user = User.objects.create_user(
+                email=f"cand_res{index}@example.com",
+                password="StrongPass123!",
+                full_name=f"Cand Res {index}",
+                role=User.Role.CANDIDATE,
+            )
+            profile = CandidateProfile.objects.create(
+                user=candidate_user,
+                full_name=f"Cand Res {index}",
+                email=f"cand_res{index}@example.com",
+                is_searchable=True,
+                profile_completion_percent=80,
+            )
+            CandidateSkill.objects.create(profile=profile, name=skill_name, skill=skill)
+
+        plan = get_search_plan({"skills": "pg database,tuning"})
+        self.assertEqual(plan.exact_skill_ids, (("pg database", (postgres.id,)),))
+        self.assertIn("tuning", plan.skill_tokens)
+
+        self.client.force_authenticate(user=employer)
+        url = reverse("employer-candidates")
+        response = self.client.get(f"{url}?skills=postgres")
+        self.assertEqual(
+            sorted(row["full_name"] for row in response.data["results"]),
+            ["Cand Res 0", "Cand Res 1"],
+        )
+
+    def test_skill_alias_expands_to_canonical_skill(self):
+        org = Organization.objects.create(
+            name="Test Org",
+            code="TEST15",
+            address="Address",
+            contact_number="123456",
+        )
+        employer = User.objects.create_user(
+            email="employer15@example.com",
+            password="StrongPass123!",
+            full_name="Employer User 15",
+            role=User.Role.EMPLOYER,
+            organization=org,
+        )
+        javascript = Skill.objects.create(name="JavaScript", alt_labels="JS")
+        for index, (skill_name, skill) in enumerate((("JavaScript", javascript), ("javascript", None))):
+            candidate_user = User.objects.create_user(
+                email=f"cand_alias{index}@example.com",
+                password="StrongPass123!",
+                full_name=f"Cand Alias {index}",
+                role=User.Role.CANDIDATE,
+            )
+            profile = CandidateProfile.objects.create(
+                user=candidate_user,
+                full_name=f"Cand Alias {index}",
+                email=f"cand_alias{index}@example.com",
+                is_searchable=True,
+                profile_completion_percent=80,
+            )
+            CandidateSkill.objects.create(profile=profile, name=skill_name, skill=skill)
+
+        self.client.force_authenticate(user=employer)
+        response = self.client.get(f"{reverse('employer-candidates')}?skills=JS")
+        self.assertEqual(
+            sorted(row["full_name"] for row in response.data["results"]),
+            ["Cand Alias 0", "Cand Alias 1"],
+        )
+
 
 class EmployerSearchPresetTests(APITestCase):
     def setUp(self):
+        cache.clear()
         self.org = Organization.objects.create(
             name="Preset Org",
             code="PRES01",
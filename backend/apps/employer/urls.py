@@ -1,5 +1,6 @@
 from django.urls import path
 from .views import (
+    CandidateSearchFacetsView,
     CandidateSearchView,
     CandidateDetailView,
     EmployerCandidateProfileView,
@@ -11,6 +12,11 @@ from .views import (
 
 urlpatterns = [
     path("candidates/", CandidateSearchView.as_view(), name="employer-candidates"),
+    path(
+        "candidates/facets/",
+        CandidateSearchFacetsView.as_view(),
+        name="employer-candidate-facets",
+    ),
     path("search-presets/recent/", RecentSearchListView.as_view(), name="employer-search-recent"),
     path("search-presets/saved/", SavedSearchListView.as_view(), name="employer-search-saved"),
     path("search-presets/save/", SaveSearchPresetView.as_view(), name="employer-search-save"),
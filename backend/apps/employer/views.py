@@ -1,4 +1,5 @@
 from .search import (
+    CandidateSearchFacetsView,
     CandidateSearchView,
     RecentSearchListView,
     SaveSearchPresetView,
@@ -9,6 +10,7 @@ from .profile import CandidateDetailView, EmployerCandidateProfileView
 
 __all__ = [
     "CandidateSearchView",
+    "CandidateSearchFacetsView",
     "CandidateDetailView",
     "EmployerCandidateProfileView",
     "RecentSearchListView",
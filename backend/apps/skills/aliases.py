@@ -0,0 +1,154 @@
+# Alias -> canonical Skill map built from ESCO alt_labels.
+#
+# SkillAlias rows are the persisted form (rewritten per skill whenever its
+# alt_labels change). Each worker keeps a SkillAliasMap and, when the skill
+# index version moves or the map is older than ALIAS_MAP_MAX_AGE, reloads only
+# the aliases of skills whose updated_at is past its watermark and drops those
+# of deleted skills.
+#
+# The version key lives in the Django cache, so with the default per-process
+# LocMemCache one worker's bump is invisible to the others until the max age
+# passes. Configure a shared CACHES backend when running several workers.
+import threading
+import time
+from bisect import bisect_left, insort
+
+from .index_version import get_skill_index_version
+from .models import Skill, SkillAlias, split_alt_labels
+
+
+ALIAS_BATCH_SIZE = 2000
+ALIAS_MAP_MAX_AGE = 300
+
+_lock = threading.Lock()
+_state = {"version": None, "map": None, "loaded_at": 0.0}
+
+
+def build_alias_rows(skill):
+    return [
+        SkillAlias(skill_id=skill.id, alias=alias)
+        for alias in split_alt_labels(skill.alt_labels)
+        if alias != skill.normalized_name
+    ]
+
+
+def sync_skill_aliases(skills):
+    skills = [skill for skill in skills if skill.id]
+    if not skills:
+        return 0
+    SkillAlias.objects.filter(skill_id__in=[skill.id for skill in skills]).delete()
+    rows = [row for skill in skills for row in build_alias_rows(skill)]
+    SkillAlias.objects.bulk_create(rows, batch_size=ALIAS_BATCH_SIZE, ignore_conflicts=True)
+    return len(rows)
+
+
+def rebuild_skill_aliases(batch_size=ALIAS_BATCH_SIZE):
+    """Recreate every SkillAlias row from Skill.alt_labels."""
+    SkillAlias.objects.all().delete()
+    created = 0
+    batch = []
+    skills = Skill.objects.exclude(alt_labels="").only("id", "normalized_name", "alt_labels")
+    for skill in skills.iterator(chunk_size=batch_size):
+        batch.extend(build_alias_rows(skill))
+        if len(batch) >= batch_size:
+            SkillAlias.objects.bulk_create(batch, ignore_conflicts=True)
+            created += len(batch)
+            batch = []
+    if batch:
+        SkillAlias.objects.bulk_create(batch, ignore_conflicts=True)
+        created += len(batch)
+    return created
+
+
+class SkillAliasMap:
+    def __init__(self):
+        self.by_alias = {}
+        self.by_skill = {}
+        self.sorted_aliases = []
+        self.watermark = None
+
+    def refresh(self):
+        changed = Skill.objects.all()
+        if self.watermark is not None:
+            # >= so rows sharing the watermark timestamp are never skipped;
+            # reapplying a skill's aliases is idempotent.
+            changed = changed.filter(updated_at__gte=self.watermark)
+        stamps = list(changed.values_list("id", "updated_at"))
+        changed_ids = [skill_id for skill_id, _updated_at in stamps]
+        if self.watermark is None:
+            if stamps:
+                self._load(SkillAlias.objects.all())
+                self.sorted_aliases = sorted(self.by_alias)
+        else:
+            # A deleted skill leaves no updated_at behind, so look for it.
+            for skill_id in changed_ids + self._deleted_skill_ids():
+                for alias in self.by_skill.pop(skill_id, ()):
+                    self._discard(alias, skill_id)
+            if changed_ids:
+                self._load(SkillAlias.objects.filter(skill_id__in=changed_ids), keep_sorted=True)
+        if stamps:
+            self.watermark = max(updated_at for _skill_id, updated_at in stamps)
+        return self
+
+    def _load(self, aliases, keep_sorted=False):
+        loaded = {}
+        for skill_id, alias in aliases.values_list("skill_id", "alias").iterator():
+            loaded.setdefault(skill_id, []).append(alias)
+            if keep_sorted and alias not in self.by_alias:
+                insort(self.sorted_aliases, alias)
+            self.by_alias[alias] = tuple(sorted({*self.by_alias.get(alias, ()), skill_id}))
+        for skill_id, skill_aliases in loaded.items():
+            self.by_skill[skill_id] = tuple(skill_aliases)
+
+    def _deleted_skill_ids(self):
+        known = sorted(self.by_skill)
+        deleted = []
+        for start in range(0, len(known), ALIAS_BATCH_SIZE):
+            chunk = known[start:start + ALIAS_BATCH_SIZE]
+            live = set(Skill.objects.filter(id__in=chunk).values_list("id", flat=True))
+            deleted.extend(skill_id for skill_id in chunk if skill_id not in live)
+        return deleted
+
+    def _discard(self, alias, skill_id):
+        remaining = tuple(pk for pk in self.by_alias.get(alias, ()) if pk != skill_id)
+        if remaining:
+            self.by_alias[alias] = remaining
+        elif self.by_alias.pop(alias, None) is not None:
+            position = bisect_left(self.sorted_aliases, alias)
+            if position < len(self.sorted_aliases) and self.sorted_aliases[position] == alias:
+                del self.sorted_aliases[position]
+
+    def resolve(self, token):
+        return self.by_alias.get(token, ())
+
+    def prefix_ids(self, prefix, limit=200):
+        """Skill ids of aliases starting with ``prefix``, via bisect on the sorted keys."""
+        ids = []
+        position = bisect_left(self.sorted_aliases, prefix)
+        while position < len(self.sorted_aliases) and len(ids) < limit:
+            alias = self.sorted_aliases[position]
+            if not alias.startswith(prefix):
+                break
+            ids.extend(self.by_alias[alias])
+            position += 1
+        return ids
+
+
+def _is_stale(version):
+    return (
+        _state["map"] is None
+        or _state["version"] != version
+        or time.monotonic() - _state["loaded_at"] > ALIAS_MAP_MAX_AGE
+    )
+
+
+def get_alias_map():
+    version = get_skill_index_version()
+    if _is_stale(version):
+        with _lock:
+            if _is_stale(version):
+                alias_map = _state["map"] or SkillAliasMap()
+                _state["map"] = alias_map.refresh()
+                _state["version"] = version
+                _state["loaded_at"] = time.monotonic()
+    return _state["map"]
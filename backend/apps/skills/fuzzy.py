@@ -0,0 +1,113 @@
+from itertools import combinations
+
+
+# Only the leading characters of each term are indexed (SymSpell-style prefix
+# indexing): it bounds the number of delete variants per term while still
+# catching typos early in what users type.
+FUZZY_PREFIX_LENGTH = 7
+FUZZY_MAX_DISTANCE = 2
+
+
+def max_distance_for(query):
+    """Edit budget by query length: short queries get no fuzziness."""
+    if len(query) < 4:
+        return 0
+    if len(query) < 8:
+        return 1
+    return FUZZY_MAX_DISTANCE
+
+
+def delete_variants(term, max_distance):
+    variants = {term}
+    for distance in range(1, min(max_distance, len(term)) + 1):
+        for positions in combinations(range(len(term)), distance):
+            variants.add("".join(char for index, char in enumerate(term) if index not in positions))
+    return variants
+
+
+def bounded_distance(left, right, limit):
+    """Levenshtein distance, or ``limit + 1`` as soon as it must exceed ``limit``."""
+    if abs(len(left) - len(right)) > limit:
+        return limit + 1
+    previous = list(range(len(right) + 1))
+    for row, left_char in enumerate(left, start=1):
+        current = [row]
+        best = row
+        for column, right_char in enumerate(right, start=1):
+            cost = 0 if left_char == right_char else 1
+            value = min(previous[column] + 1, current[column - 1] + 1, previous[column - 1] + cost)
+            current.append(value)
+            best = min(best, value)
+        if best > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+class SymmetricDeleteIndex:
+    """
+    Typo-tolerant lookup over normalized terms.
+
+    Every term's prefix is expanded once into its delete variants (up to
+    ``max_distance`` deletions). A query generates its own variants, and any
+    shared variant yields a candidate. Candidates are verified with a bounded
+    edit distance against the full term and against its prefixes of about
+    the query's length, so partially typed names match too.
+    """
+
+    def __init__(self, entries=(), prefix_length=FUZZY_PREFIX_LENGTH, max_distance=FUZZY_MAX_DISTANCE):
+        self.prefix_length = prefix_length
+        self.max_distance = max_distance
+        self.terms = []
+        self.keys = []
+        self.variants = {}
+        for key, term in entries:
+            self.add(key, term)
+
+    @classmethod
+    def from_parts(
+        cls, keys, terms, variants, prefix_length=FUZZY_PREFIX_LENGTH, max_distance=FUZZY_MAX_DISTANCE
+    ):
+        """Wrap prebuilt sequences, e.g. the sections of a mapped index file."""
+        index = cls.__new__(cls)
+        index.prefix_length = prefix_length
+        index.max_distance = max_distance
+        index.keys = keys
+        index.terms = terms
+        index.variants = variants
+        return index
+
+    def add(self, key, term):
+        position = len(self.terms)
+        self.terms.append(term)
+        self.keys.append(key)
+        for variant in delete_variants(term[:self.prefix_length], self.max_distance):
+            self.variants.setdefault(variant, []).append(position)
+
+    def __len__(self):
+        return len(self.terms)
+
+    def search(self, query, max_distance=None):
+        """Return [(distance, key)] for terms within the edit budget, nearest first."""
+        if max_distance is None:
+            max_distance = max_distance_for(query)
+        max_distance = min(max_distance, self.max_distance)
+        if not query or max_distance <= 0:
+            return []
+
+        candidates = set()
+        for variant in delete_variants(query[: self.prefix_length], max_distance):
+            candidates.update(self.variants.get(variant, ()))
+
+        matches = []
+        for position in candidates:
+            term = self.terms[position]
+            distance = min(
+                bounded_distance(query, term[:length], max_distance)
+                for length in range(max(1, len(query) - max_distance), len(query) + max_distance + 1)
+            )
+            distance = min(distance, bounded_distance(query, term, max_distance))
+            if distance <= max_distance:
+                matches.append((distance, self.keys[position]))
+        matches.sort(key=lambda match: match[0])
+        return matches
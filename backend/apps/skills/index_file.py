@@ -0,0 +1,180 @@
+# Shared suggestion index file.
+#
+# build_suggestion_index writes the skill and location indexes into one
+# binary file; every worker maps it read-only, so the pages are shared by all
+# processes on the node and a worker starts without parsing JSON or loading
+# the Skill table. Layout:
+#
+#   MAGIC | uint32 toc length | toc (JSON) | padding | sections...
+#
+# The table of contents maps section names to (offset, length) in the data
+# area plus freshness metadata. Sections are raw arrays in native byte order,
+# 8-byte aligned, viewed in place through memoryview casts. A string list is
+# stored as an ``.offsets`` uint32 array and a UTF-8 ``.blob``.
+import json
+import mmap
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+
+
+MAGIC = b"JPSUGG01"
+ALIGNMENT = 8
+
+_lock = threading.Lock()
+_state = {"stat": None, "file": None}
+
+
+class IndexFileError(Exception):
+    pass
+
+
+class MappedStrings:
+    """Read-only sequence of strings backed by an offsets array and a blob."""
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return max(len(self.offsets) - 1, 0)
+
+    def __getitem__(self, position):
+        if not 0 <= position < len(self):
+            raise IndexError(position)
+        return bytes(self.blob[self.offsets[position]:self.offsets[position + 1]]).decode("utf-8")
+
+    def __iter__(self):
+        for position in range(len(self)):
+            yield self[position]
+
+
+class MappedPostings:
+    """Sorted string keys, each pointing at a slice of a uint32 array."""
+
+    def __init__(self, keys, offsets, values):
+        self.keys = keys
+        self.offsets = offsets
+        self.values = values
+
+    def get(self, key, default=None):
+        position = bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            return self.values[self.offsets[position]:self.offsets[position + 1]]
+        return default
+
+
+class IndexFileWriter:
+    def __init__(self):
+        self.sections = {}
+        self.meta = {}
+        self.buffer = bytearray()
+
+    def add_bytes(self, name, data):
+        self.buffer.extend(b"\0" * (-len(self.buffer) % ALIGNMENT))
+        self.sections[name] = [len(self.buffer), len(data)]
+        self.buffer.extend(data)
+
+    def add_array(self, name, typecode, values):
+        self.add_bytes(name, array(typecode, values).tobytes())
+
+    def add_strings(self, name, values):
+        offsets = array("I", [0])
+        blob = bytearray()
+        for value in values:
+            blob.extend(value.encode("utf-8"))
+            offsets.append(len(blob))
+        self.add_bytes(f"{name}.offsets", offsets.tobytes())
+        self.add_bytes(f"{name}.blob", bytes(blob))
+
+    def add_postings(self, name, postings):
+        keys = sorted(postings)
+        offsets = array("I", [0])
+        values = array("I")
+        for key in keys:
+            values.extend(postings[key])
+            offsets.append(len(values))
+        self.add_strings(f"{name}.keys", keys)
+        self.add_bytes(f"{name}.offsets", offsets.tobytes())
+        self.add_bytes(f"{name}.values", values.tobytes())
+
+    def write(self, path):
+        """Write atomically: workers still mapping the old file keep its pages."""
+        toc = json.dumps({"meta": self.meta, "sections": self.sections}).encode("utf-8")
+        header = MAGIC + struct.pack("<I", len(toc)) + toc
+        header += b"\0" * (-len(header) % ALIGNMENT)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as handle:
+            handle.write(header)
+            handle.write(self.buffer)
+        os.replace(temp_path, path)
+        return len(header) + len(self.buffer)
+
+
+class IndexFile:
+    def __init__(self, path):
+        with open(path, "rb") as handle:
+            self.mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self.mmap)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise IndexFileError(f"{path} is not a suggestion index file.")
+        (toc_length,) = struct.unpack_from("<I", view, len(MAGIC))
+        toc_start = len(MAGIC) + 4
+        toc = json.loads(bytes(view[toc_start:toc_start + toc_length]))
+        data_start = toc_start + toc_length
+        data_start += -data_start % ALIGNMENT
+        self.meta = toc["meta"]
+        self.sections = toc["sections"]
+        self.data = view[data_start:]
+
+    def __contains__(self, name):
+        return name in self.sections or f"{name}.offsets" in self.sections
+
+    def raw(self, name):
+        offset, length = self.sections[name]
+        return self.data[offset:offset + length]
+
+    def array(self, name, typecode):
+        return self.raw(name).cast(typecode)
+
+    def strings(self, name):
+        return MappedStrings(self.array(f"{name}.offsets", "I"), self.raw(f"{name}.blob"))
+
+    def postings(self, name):
+        return MappedPostings(
+            self.strings(f"{name}.keys"),
+            self.array(f"{name}.offsets", "I"),
+            self.array(f"{name}.values", "I"),
+        )
+
+
+def suggestion_index_path():
+    return getattr(settings, "SUGGESTION_INDEX_PATH", "") or ""
+
+
+def get_index_file():
+    """
+    The mapped suggestion index, or None when it is not configured or cannot
+    be read. The file is reopened when the build command replaces it.
+    """
+    path = suggestion_index_path()
+    if not path:
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    key = (path, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    if _state["stat"] != key:
+        with _lock:
+            if _state["stat"] != key:
+                try:
+                    _state["file"] = IndexFile(path)
+                except (OSError, ValueError, KeyError, struct.error, IndexFileError):
+                    _state["file"] = None
+                _state["stat"] = key
+    return _state["file"]
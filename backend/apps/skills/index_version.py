@@ -0,0 +1,47 @@
+import time
+
+from django.core.cache import cache
+
+
+SKILL_INDEX_VERSION_KEY = "skills:index:version"
+SKILL_ADDITIONS_VERSION_KEY = "skills:index:additions"
+
+
+def _get_version(key):
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock: worker indexes outlive the cache, so a cleared
+        # or evicted key must never come back as a version seen before.
+        seed = time.time_ns()
+        cache.add(key, seed, None)
+        version = cache.get(key, seed)
+    return version
+
+
+def _bump_version(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), None)
+
+
+def get_skill_index_version():
+    return _get_version(SKILL_INDEX_VERSION_KEY)
+
+
+def bump_skill_index_version():
+    """Tell every worker to rebuild its in-memory skill indexes."""
+    _bump_version(SKILL_INDEX_VERSION_KEY)
+
+
+def get_skill_additions_version():
+    return _get_version(SKILL_ADDITIONS_VERSION_KEY)
+
+
+def bump_skill_additions_version():
+    """
+    Tell every worker that skills were appended. Workers add rows past their
+    highest known id to the index in place; compiled search plans and the
+    rest of the index stay valid.
+    """
+    _bump_version(SKILL_ADDITIONS_VERSION_KEY)
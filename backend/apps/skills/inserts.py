@@ -0,0 +1,59 @@
+# Race-aware bulk insert of Skill rows.
+#
+# bulk_create(ignore_conflicts=True) cannot say which rows it wrote, so both
+# the candidate skill path and the ESCO import would otherwise count or
+# credit rows that a concurrent writer inserted first.
+from django.db import connection
+from django.utils import timezone
+
+from .models import Skill
+
+
+SKILL_INSERT_FIELDS = (
+    "name",
+    "normalized_name",
+    "alt_labels",
+    "source_uri",
+    "popularity",
+    "content_hash",
+    "created_at",
+    "updated_at",
+)
+SKILL_INSERT_BATCH_SIZE = 500
+
+
+def insert_new_skills(skills):
+    """
+    Insert ``skills``, skipping names that already exist, and return
+    {normalized_name: id} for the rows this call actually wrote.
+
+    ON CONFLICT DO NOTHING RETURNING (PostgreSQL, SQLite 3.35+) reports only
+    inserted rows, so a row a concurrent writer inserted first is never
+    mistaken for ours.
+    """
+    quote = connection.ops.quote_name
+    fields = [Skill._meta.get_field(name) for name in SKILL_INSERT_FIELDS]
+    name_column = Skill._meta.get_field("normalized_name").column
+    row_sql = "(" + ", ".join(["%s"] * len(fields)) + ")"
+    now = timezone.now()
+    inserted = {}
+    with connection.cursor() as cursor:
+        for start in range(0, len(skills), SKILL_INSERT_BATCH_SIZE):
+            batch = skills[start:start + SKILL_INSERT_BATCH_SIZE]
+            params = []
+            for skill in batch:
+                skill.created_at = skill.updated_at = now
+                params.extend(
+                    field.get_db_prep_save(getattr(skill, field.attname), connection)
+                    for field in fields
+                )
+            cursor.execute(
+                f"INSERT INTO {quote(Skill._meta.db_table)} "
+                f"({', '.join(quote(field.column) for field in fields)}) "
+                f"VALUES {', '.join([row_sql] * len(batch))} "
+                f"ON CONFLICT ({quote(name_column)}) DO NOTHING "
+                f"RETURNING {quote(Skill._meta.pk.column)}, {quote(name_column)}",
+                params,
+            )
+            inserted.update((name, pk) for pk, name in cursor.fetchall())
+    return inserted
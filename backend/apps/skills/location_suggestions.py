@@ -1,15 +1,41 @@
+import hashlib
 import json
-from functools import lru_cache
+from bisect import bisect_left
+from functools import cached_property, lru_cache
+from itertools import islice
 from pathlib import Path
 
 from django.conf import settings
 
+from .fuzzy import SymmetricDeleteIndex
+from .index_file import get_index_file
 from .models import normalize_skill_name
+from .ngram import NgramIndex
+
+
+def locations_json_path():
+    return Path(settings.BASE_DIR) / "seed" / "esco" / "Indian_Cities_In_States.json"
+
+
+def locations_source_stamp():
+    """Content hash of the seed file, to detect a stale shared index file."""
+    path = locations_json_path()
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return _file_digest(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=4)
+def _file_digest(path, mtime_ns, size):
+    # Keyed on mtime and size, so the file is only re-hashed when it changes.
+    return hashlib.sha1(Path(path).read_bytes()).hexdigest()
 
 
 @lru_cache(maxsize=1)
 def load_locations_json():
-    path = Path(settings.BASE_DIR) / "seed" / "esco" / "Indian_Cities_In_States.json"
+    path = locations_json_path()
     if not path.exists():
         return {}, []
 
@@ -36,49 +62,144 @@ def load_locations_json():
     return state_to_cities, all_city_rows
 
 
-def suggest_location_names(raw_q, state=None, limit=10):
-    query = normalize_skill_name(raw_q or "")
-    if len(query) < 3:
-        return []
+class LocationIndex:
+    """
+    Prebuilt lookup structures over the city seed data.
 
-    state_to_cities, all_city_rows = load_locations_json()
-    if not state_to_cities:
-        return []
+    Cities are deduplicated by normalized name and numbered in first-seen
+    order. Prefix matches come first, in name order, by walking forward from
+    a bisect on the sorted normalized names; infix matches follow in
+    first-seen order from the n-gram postings. Both are generated lazily, so
+    a request stops at its limit. With a state, only that state's cities are
+    scanned. States are looked up by normalized name, so a request never
+    re-normalizes the seed data.
+    """
+
+    def __init__(self, state_to_cities, all_city_rows):
+        self.names = []
+        self.normalized = []
+        city_ids = {}
+        for _, city_name in all_city_rows:
+            normalized_city = normalize_skill_name(city_name)
+            if normalized_city not in city_ids:
+                city_ids[normalized_city] = len(self.names)
+                self.names.append(city_name)
+                self.normalized.append(normalized_city)
+
+        self.state_city_ids = {}
+        for state, cities in state_to_cities.items():
+            ids = self.state_city_ids.setdefault(normalize_skill_name(state), set())
+            ids.update(city_ids[normalize_skill_name(city)] for city in cities)
+
+        order = sorted(range(len(self.names)), key=self.normalized.__getitem__)
+        self.sorted_names = [self.normalized[city_id] for city_id in order]
+        self.sorted_ids = order
+        self.infixes = NgramIndex(enumerate(self.normalized))
+
+    @cached_property
+    def fuzzy(self):
+        return SymmetricDeleteIndex(enumerate(self.normalized))
+
+    def state_ids(self, state):
+        return self.state_city_ids.get(normalize_skill_name(state))
+
+    def prefix_ids(self, prefix):
+        """Yield the ids of cities starting with ``prefix``, in name order."""
+        position = bisect_left(self.sorted_names, prefix)
+        for offset in range(position, len(self.sorted_names)):
+            if not self.sorted_names[offset].startswith(prefix):
+                break
+            yield self.sorted_ids[offset]
+
+    def match_ids(self, query, allowed=None):
+        """Yield prefix matches, then infix matches, optionally within ``allowed``."""
+        if allowed is None:
+            yield from self.prefix_ids(query)
+            for city_id in self.infixes.iter_search(query):
+                if not self.normalized[city_id].startswith(query):
+                    yield city_id
+            return
+
+        # Narrow to the state first, so a common prefix in other states
+        # cannot use up the scan before reaching this state's cities.
+        city_ids = sorted(allowed)
+        prefix = [city_id for city_id in city_ids if self.normalized[city_id].startswith(query)]
+        yield from sorted(prefix, key=self.normalized.__getitem__)
+        for city_id in city_ids:
+            name = self.normalized[city_id]
+            if query in name and not name.startswith(query):
+                yield city_id
+
+    def suggest(self, query, state=None, limit=10, fuzzy=True):
+        allowed = None
+        if state:
+            allowed = self.state_ids(state)
+            if allowed is None:
+                return []
 
-    rows = all_city_rows
-    if state:
-        normalized_state = normalize_skill_name(state)
-        selected_state = next(
-            (
-                state_name
-                for state_name in state_to_cities.keys()
-                if normalize_skill_name(state_name) == normalized_state
-            ),
-            None,
+        limit = max(limit, 0)
+        matches = list(islice(self.match_ids(query, allowed), limit))
+        if not matches and fuzzy:
+            similar = (
+                city_id
+                for _, city_id in self.fuzzy.search(query)
+                if allowed is None or city_id in allowed
+            )
+            matches = list(islice(similar, limit))
+        return [self.names[city_id] for city_id in matches]
+
+    def write_sections(self, writer):
+        """Serialize into an IndexFileWriter."""
+        writer.add_strings("locations.names", self.names)
+        writer.add_strings("locations.normalized", self.normalized)
+        writer.add_strings("locations.sorted_names", self.sorted_names)
+        writer.add_array("locations.sorted_ids", "I", self.sorted_ids)
+        writer.add_postings(
+            "locations.states",
+            {state: sorted(ids) for state, ids in self.state_city_ids.items()},
         )
-        if not selected_state:
-            return []
-        rows = [(selected_state, city) for city in state_to_cities.get(selected_state, [])]
-
-    prefix = []
-    contains = []
-    for city_state, city_name in rows:
-        normalized_city = normalize_skill_name(city_name)
-        row = (city_state, city_name, normalized_city)
-        if normalized_city.startswith(query):
-            prefix.append(row)
-        elif query in normalized_city:
-            contains.append(row)
-
-    merged = prefix + contains
-    seen = set()
-    results = []
-    for _, city_name, normalized_city in merged:
-        if normalized_city in seen:
-            continue
-        seen.add(normalized_city)
-        results.append(city_name)
-        if len(results) >= limit:
-            break
+        writer.add_postings("locations.trigrams", self.infixes.postings)
+        writer.meta["locations"] = locations_source_stamp()
+
+
+class MappedLocationIndex(LocationIndex):
+    """LocationIndex answered from the shared index file."""
+
+    def __init__(self, index_file):
+        self.names = index_file.strings("locations.names")
+        self.normalized = index_file.strings("locations.normalized")
+        self.sorted_names = index_file.strings("locations.sorted_names")
+        self.sorted_ids = index_file.array("locations.sorted_ids", "I")
+        self.states = index_file.postings("locations.states")
+        self.infixes = NgramIndex.from_parts(
+            range(len(self.names)), self.normalized, index_file.postings("locations.trigrams")
+        )
+
+    def state_ids(self, state):
+        ids = self.states.get(normalize_skill_name(state))
+        return None if ids is None else set(ids)
+
+
+@lru_cache(maxsize=1)
+def build_location_index():
+    return LocationIndex(*load_locations_json())
 
-    return results
+
+@lru_cache(maxsize=1)
+def _mapped_location_index(index_file):
+    return MappedLocationIndex(index_file)
+
+
+def load_location_index():
+    index_file = get_index_file()
+    if index_file is not None and "locations.names" in index_file:
+        if index_file.meta.get("locations") == locations_source_stamp():
+            return _mapped_location_index(index_file)
+    return build_location_index()
+
+
+def suggest_location_names(raw_q, state=None, limit=10, fuzzy=True):
+    query = normalize_skill_name(raw_q or "")
+    if len(query) < 3:
+        return []
+    return load_location_index().suggest(query, state=state, limit=limit, fuzzy=fuzzy)
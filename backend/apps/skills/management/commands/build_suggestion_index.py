@@ -0,0 +1,39 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from apps.skills.index_file import IndexFileWriter, suggestion_index_path
+from apps.skills.location_suggestions import LocationIndex, load_locations_json
+from apps.skills.search_index import SkillIndex
+
+
+class Command(BaseCommand):
+    help = "Write the skill and location suggestion indexes to the shared index file."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--path",
+            type=str,
+            default=None,
+            help="Output file (defaults to SUGGESTION_INDEX_PATH)",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"] or suggestion_index_path()
+        if not path:
+            self.stderr.write(self.style.ERROR("Set SUGGESTION_INDEX_PATH or pass --path."))
+            return
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        writer = IndexFileWriter()
+        skill_index = SkillIndex.build()
+        skill_index.write_sections(writer)
+        location_index = LocationIndex(*load_locations_json())
+        location_index.write_sections(writer)
+        size = writer.write(path)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Suggestion index written to {path}: {len(skill_index.sorted_ids)} skills, "
+                f"{len(location_index.names)} cities, {size} bytes."
+            )
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from apps.skills.popularity import POPULARITY_FLUSH_BATCH_SIZE, flush_skill_popularity_batch
+
+
+class Command(BaseCommand):
+    help = "Apply buffered SkillPopularityDelta rows to Skill.popularity."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=POPULARITY_FLUSH_BATCH_SIZE,
+            help="Number of delta rows aggregated per transaction",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        flushed = 0
+        skills = 0
+        while True:
+            rows, touched = flush_skill_popularity_batch(batch_size)
+            if not rows:
+                break
+            flushed += rows
+            skills += touched
+            if rows < batch_size:
+                break
+        self.stdout.write(
+            self.style.SUCCESS(f"Popularity flush complete. Applied {flushed} deltas to {skills} skills.")
+        )
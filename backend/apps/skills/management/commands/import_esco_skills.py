@@ -1,9 +1,83 @@
 import csv
+import multiprocessing
 from pathlib import Path
 
 from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
 
-from apps.skills.models import Skill, normalize_skill_name
+from apps.skills.aliases import sync_skill_aliases
+from apps.skills.index_version import bump_skill_index_version
+from apps.skills.inserts import insert_new_skills
+from apps.skills.models import Skill, normalize_skill_name, skill_content_hash
+
+
+IMPORTED_FIELDS = ["name", "alt_labels", "source_uri", "content_hash", "updated_at"]
+
+
+def parse_skill_rows(path, limit=None):
+    """Yield (normalized_name, name, alt_labels, source_uri, content_hash) per usable CSV row."""
+    with Path(path).open("r", encoding="utf-8") as csvfile:
+        reader = csv.DictReader(csvfile)
+        for idx, row in enumerate(reader, start=1):
+            name = (row.get("PREFERREDLABEL") or "").strip()
+            normalized = normalize_skill_name(name)
+            if normalized:
+                alt_labels = (row.get("ALTLABELS") or "").strip()
+                source_uri = (row.get("ORIGINURI") or "").strip()
+                yield (
+                    normalized,
+                    name,
+                    alt_labels,
+                    source_uri,
+                    skill_content_hash(name, alt_labels, source_uri),
+                )
+            if limit and idx >= limit:
+                break
+
+
+def parse_skill_batches(path, limit=None, batch_size=2000):
+    batch = []
+    for row in parse_skill_rows(path, limit):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _parse_into_queue(path, limit, batch_size, queue):
+    try:
+        for batch in parse_skill_batches(path, limit, batch_size):
+            queue.put(batch)
+    except Exception as exc:  # surfaced by the writer process
+        queue.put(exc)
+    queue.put(None)
+
+
+def parse_skill_batches_in_worker(path, limit=None, batch_size=2000):
+    """
+    Parse in a child process while the caller writes. The queue is bounded,
+    so at most a few batches are held in memory on either side.
+    """
+    queue = multiprocessing.Queue(maxsize=4)
+    worker = multiprocessing.Process(
+        target=_parse_into_queue, args=(str(path), limit, batch_size, queue), daemon=True
+    )
+    worker.start()
+    try:
+        while True:
+            batch = queue.get()
+            if batch is None:
+                break
+            if isinstance(batch, Exception):
+                raise batch
+            yield batch
+    finally:
+        worker.join(timeout=5)
+        if worker.is_alive():
+            worker.terminate()
 
 
 class Command(BaseCommand):
@@ -22,53 +96,133 @@ class Command(BaseCommand):
             default=None,
             help="Optional limit for number of rows to import",
         )
+        parser.add_argument(
+            "--upsert",
+            action="store_true",
+            help="Update existing skills whose name, alt labels or URI changed",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of CSV rows written per batch",
+        )
+        parser.add_argument(
+            "--parse-worker",
+            action="store_true",
+            help="Parse the CSV in a separate process while this one writes",
+        )
 
     def handle(self, *args, **options):
         path = Path(options["path"])
         limit = options["limit"]
+        upsert = options["upsert"]
+        batch_size = max(1, options["batch_size"])
 
         if not path.exists():
             self.stderr.write(self.style.ERROR(f"File not found: {path}"))
             return
 
-        created = 0
-        batch = []
-        batch_size = 2000
-
-        with path.open("r", encoding="utf-8") as csvfile:
-            reader = csv.DictReader(csvfile)
-            for idx, row in enumerate(reader, start=1):
-                name = (row.get("PREFERREDLABEL") or "").strip()
-                if not name:
-                    continue
+        if options["parse_worker"]:
+            batches = parse_skill_batches_in_worker(path, limit, batch_size)
+        else:
+            batches = parse_skill_batches(path, limit, batch_size)
+
+        counts = {"inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0, "aliases": 0}
+        for batch in batches:
+            self.write_batch(batch, upsert, counts)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Inserted {counts['inserted']}, updated {counts['updated']}, "
+                    f"unchanged {counts['unchanged']} rows..."
+                )
+            )
 
-                normalized = normalize_skill_name(name)
-                if not normalized:
-                    continue
+        if counts["inserted"] or counts["updated"]:
+            bump_skill_index_version()
+        message = (
+            f"Import complete. Inserted {counts['inserted']}, updated {counts['updated']}, "
+            f"unchanged {counts['unchanged']} rows, {counts['aliases']} aliases written."
+        )
+        if counts["skipped"]:
+            message += f" {counts['skipped']} existing rows differ; rerun with --upsert to update them."
+        self.stdout.write(self.style.SUCCESS(message))
+
+    def write_batch(self, batch, upsert, counts):
+        rows = {}
+        for row in batch:
+            # The last occurrence of a normalized name wins, as a row-by-row import would.
+            rows[row[0]] = row
+        existing = dict(
+            Skill.objects.filter(normalized_name__in=list(rows)).values_list(
+                "normalized_name", "content_hash"
+            )
+        )
 
-                alt_labels = (row.get("ALTLABELS") or "").strip()
-                source_uri = (row.get("ORIGINURI") or "").strip()
+        inserts = []
+        updates = []
+        for normalized, name, alt_labels, source_uri, content_hash in rows.values():
+            skill = Skill(
+                name=name,
+                normalized_name=normalized,
+                alt_labels=alt_labels,
+                source_uri=source_uri,
+                content_hash=content_hash,
+            )
+            if normalized not in existing:
+                inserts.append(skill)
+            elif existing[normalized] == content_hash:
+                counts["unchanged"] += 1
+            elif upsert:
+                updates.append(skill)
+            else:
+                counts["skipped"] += 1
+        if not inserts and not updates:
+            return
 
-                batch.append(
-                    Skill(
-                        name=name,
-                        normalized_name=normalized,
-                        alt_labels=alt_labels,
-                        source_uri=source_uri,
+        with transaction.atomic():
+            inserted = insert_new_skills(inserts)
+            for skill in inserts:
+                if skill.normalized_name in inserted:
+                    continue
+                # A concurrent writer created this name after the lookup.
+                if upsert:
+                    updates.append(skill)
+                else:
+                    counts["skipped"] += 1
+            updated = 0
+            if updates and connection.features.supports_update_conflicts_with_target:
+                Skill.objects.bulk_create(
+                    updates,
+                    update_conflicts=True,
+                    unique_fields=["normalized_name"],
+                    update_fields=IMPORTED_FIELDS,
+                )
+                updated = len(updates)
+            elif updates:
+                ids = dict(
+                    Skill.objects.filter(
+                        normalized_name__in=[skill.normalized_name for skill in updates]
+                    ).values_list("normalized_name", "id")
+                )
+                now = timezone.now()
+                updates = [skill for skill in updates if skill.normalized_name in ids]
+                for skill in updates:
+                    skill.id = ids[skill.normalized_name]
+                    skill.updated_at = now
+                updated = Skill.objects.bulk_update(updates, IMPORTED_FIELDS)
+
+            touched = [skill.normalized_name for skill in updates]
+            touched.extend(
+                skill.normalized_name
+                for skill in inserts
+                if skill.alt_labels and skill.normalized_name in inserted
+            )
+            if touched:
+                counts["aliases"] += sync_skill_aliases(
+                    Skill.objects.filter(normalized_name__in=touched).only(
+                        "id", "normalized_name", "alt_labels"
                     )
                 )
-
-                if len(batch) >= batch_size:
-                    Skill.objects.bulk_create(batch, ignore_conflicts=True)
-                    created += len(batch)
-                    batch = []
-                    self.stdout.write(self.style.SUCCESS(f"Imported {created} rows..."))
-
-                if limit and idx >= limit:
-                    break
-
-        if batch:
-            Skill.objects.bulk_create(batch, ignore_conflicts=True)
-            created += len(batch)
-
-        self.stdout.write(self.style.SUCCESS(f"Import complete. Processed {created} rows."))
+        counts["inserted"] += len(inserted)
+        counts["updated"] += updated
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, OuterRef
+
+from apps.candidates.models import CandidateSkill
+from apps.skills.popularity import reconcile_popularity_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute Skill.popularity from CandidateSkill counts and apply buffered deltas."
+
+    def handle(self, *args, **options):
+        counts = (
+            CandidateSkill.objects.filter(skill=OuterRef("pk"))
+            .order_by()
+            .values("skill")
+            .annotate(total=Count("id"))
+            .values("total")
+        )
+        updated, applied = reconcile_popularity_counts(counts)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Popularity reconcile complete. Updated {updated} skills, applied {applied} buffered deltas."
+            )
+        )
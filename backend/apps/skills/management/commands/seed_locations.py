@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from apps.skills.location_suggestions import load_locations_json
+from apps.skills.models import Location, normalize_skill_name
+
+
+class Command(BaseCommand):
+    help = "Seed the canonical Location table from Indian_Cities_In_States.json."
+
+    def handle(self, *args, **options):
+        _, all_city_rows = load_locations_json()
+        if not all_city_rows:
+            self.stderr.write(self.style.ERROR("No location seed data found."))
+            return
+
+        existing = set(Location.objects.values_list("state_key", "city_key"))
+        batch = []
+        for state, city in all_city_rows:
+            key = (normalize_skill_name(state), normalize_skill_name(city))
+            if key in existing:
+                continue
+            existing.add(key)
+            batch.append(Location(city=city, state=state, state_key=key[0], city_key=key[1]))
+
+        Location.objects.bulk_create(batch, batch_size=1000)
+        self.stdout.write(
+            self.style.SUCCESS(f"Location seed complete. Created {len(batch)} locations.")
+        )
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS skills_skill_normalized_trgm_idx "
+        "ON skills_skill USING gin (normalized_name gin_trgm_ops)"
+    )
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS skills_skill_normalized_trgm_idx")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("skills", "0002_rename_skills_skil_normal_51e33a_idx_skills_skil_normali_e9faaa_idx"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
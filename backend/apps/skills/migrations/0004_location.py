@@ -0,0 +1,61 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:25
+
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def seed_locations(apps, schema_editor):
+    Location = apps.get_model("skills", "Location")
+    path = Path(settings.BASE_DIR) / "seed" / "esco" / "Indian_Cities_In_States.json"
+    if not path.exists():
+        return
+    with path.open("r", encoding="utf-8") as jsonfile:
+        raw = json.load(jsonfile)
+
+    # mirror location_suggestions.load_locations_json and Location.save
+    seen = set()
+    rows = []
+    for state, cities in raw.items():
+        if not isinstance(state, str) or not isinstance(cities, list):
+            continue
+        for city in cities:
+            if not isinstance(city, str):
+                continue
+            city = " ".join(city.split()).strip()
+            if not city:
+                continue
+            key = (" ".join(state.lower().split()), city.lower())
+            if key in seen:
+                continue
+            seen.add(key)
+            rows.append(Location(city=city, state=state, state_key=key[0], city_key=key[1]))
+    Location.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0003_skill_normalized_name_trigram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('city', models.CharField(max_length=120)),
+                ('state', models.CharField(max_length=120)),
+                ('country', models.CharField(default='India', max_length=60)),
+                ('city_key', models.CharField(db_index=True, max_length=120)),
+                ('state_key', models.CharField(db_index=True, max_length=120)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='location',
+            constraint=models.UniqueConstraint(fields=('state_key', 'city_key'), name='skills_location_state_city_uniq'),
+        ),
+        migrations.RunPython(seed_locations, migrations.RunPython.noop),
+    ]
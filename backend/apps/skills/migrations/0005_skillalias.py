@@ -0,0 +1,48 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_skill_aliases(apps, schema_editor):
+    Skill = apps.get_model("skills", "Skill")
+    SkillAlias = apps.get_model("skills", "SkillAlias")
+    # mirror aliases.rebuild_skill_aliases / models.split_alt_labels
+    batch = []
+    skills = Skill.objects.exclude(alt_labels="").only("id", "normalized_name", "alt_labels")
+    for skill in skills.iterator(chunk_size=2000):
+        seen = set()
+        for line in skill.alt_labels.replace("|", "\n").splitlines():
+            alias = " ".join(line.lower().split())
+            if not alias or alias == skill.normalized_name or alias in seen:
+                continue
+            seen.add(alias)
+            batch.append(SkillAlias(skill_id=skill.id, alias=alias))
+        if len(batch) >= 2000:
+            SkillAlias.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        SkillAlias.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0004_location'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=255)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='skills.skill')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='skillalias',
+            constraint=models.UniqueConstraint(fields=('alias', 'skill'), name='skills_alias_skill_uniq'),
+        ),
+        migrations.RunPython(backfill_skill_aliases, migrations.RunPython.noop),
+    ]
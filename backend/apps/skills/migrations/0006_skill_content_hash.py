@@ -0,0 +1,37 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:42
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def backfill_content_hash(apps, schema_editor):
+    Skill = apps.get_model("skills", "Skill")
+    # mirror models.skill_content_hash
+    batch = []
+    skills = Skill.objects.only("id", "name", "alt_labels", "source_uri")
+    for skill in skills.iterator(chunk_size=2000):
+        content = "\x1f".join((skill.name or "", skill.alt_labels or "", skill.source_uri or ""))
+        skill.content_hash = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        batch.append(skill)
+        if len(batch) >= 2000:
+            Skill.objects.bulk_update(batch, ["content_hash"])
+            batch = []
+    if batch:
+        Skill.objects.bulk_update(batch, ["content_hash"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0005_skillalias'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=40),
+        ),
+        migrations.RunPython(backfill_content_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 18:45
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0006_skill_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillPopularityDelta',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('delta', models.IntegerField(default=1)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='popularity_deltas', to='skills.skill')),
+            ],
+        ),
+    ]
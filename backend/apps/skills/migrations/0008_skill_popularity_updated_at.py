@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 19:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0007_skillpopularitydelta'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='popularity_updated_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
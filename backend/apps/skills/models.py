@@ -1,26 +1,121 @@
+import hashlib
+
 from django.db import models
 
+from .index_version import bump_skill_index_version
+
 
 def normalize_skill_name(value: str) -> str:
     return " ".join(value.lower().split()).strip()
 
 
+def split_alt_labels(value: str) -> list:
+    """ESCO stores alternative labels newline separated; accept "|" too."""
+    labels = []
+    for line in (value or "").replace("|", "\n").splitlines():
+        normalized = normalize_skill_name(line)
+        if normalized and normalized not in labels:
+            labels.append(normalized)
+    return labels
+
+
+def skill_content_hash(name: str, alt_labels: str, source_uri: str) -> str:
+    """Fingerprint of the imported columns, used to skip unchanged ESCO rows."""
+    content = "\x1f".join((name or "", alt_labels or "", source_uri or ""))
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
 class Skill(models.Model):
     name = models.CharField(max_length=255)
     normalized_name = models.CharField(max_length=255, unique=True, db_index=True)
     alt_labels = models.TextField(blank=True, default="")
     source_uri = models.TextField(blank=True, default="")
     popularity = models.IntegerField(default=0)
+    # Set by the popularity flush and reconcile, so a mapped suggestion index
+    # overlays only the counters changed since it was written.
+    popularity_updated_at = models.DateTimeField(null=True, blank=True, db_index=True)
+    content_hash = models.CharField(max_length=40, blank=True, default="")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         indexes = [models.Index(fields=["normalized_name"])]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._stored_content = instance._content_key()
+        return instance
+
+    def _content_key(self):
+        # Deferred fields read as None, so a partial load counts as changed.
+        return (self.__dict__.get("normalized_name"), self.__dict__.get("content_hash"))
+
     def save(self, *args, **kwargs):
         if self.name and not self.normalized_name:
             self.normalized_name = normalize_skill_name(self.name)
+        self.content_hash = skill_content_hash(self.name, self.alt_labels, self.source_uri)
+        adding = self._state.adding
+        # Saves that only touch counters or timestamps leave the indexes alone.
+        content_changed = adding or self._content_key() != getattr(self, "_stored_content", None)
         super().save(*args, **kwargs)
+        if not content_changed:
+            return
+        if not adding or self.alt_labels:
+            from .aliases import sync_skill_aliases
+
+            sync_skill_aliases([self])
+        bump_skill_index_version()
+        self._stored_content = self._content_key()
 
     def __str__(self) -> str:
         return self.name
+
+
+class SkillPopularityDelta(models.Model):
+    """
+    Append-only popularity increment. Request paths insert rows here instead
+    of updating hot Skill rows; flush_skill_popularity folds them in.
+    """
+
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="popularity_deltas")
+    delta = models.IntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
+class SkillAlias(models.Model):
+    """One normalized ESCO alternative label pointing at its canonical Skill."""
+
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="aliases")
+    alias = models.CharField(max_length=255)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["alias", "skill"], name="skills_alias_skill_uniq"),
+        ]
+
+    def __str__(self) -> str:
+        return self.alias
+
+
+class Location(models.Model):
+    """Canonical city/state pairs seeded from Indian_Cities_In_States.json."""
+
+    city = models.CharField(max_length=120)
+    state = models.CharField(max_length=120)
+    country = models.CharField(max_length=60, default="India")
+    city_key = models.CharField(max_length=120, db_index=True)
+    state_key = models.CharField(max_length=120, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["state_key", "city_key"], name="skills_location_state_city_uniq"),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.city_key = normalize_skill_name(self.city)
+        self.state_key = normalize_skill_name(self.state)
+        super().save(*args, **kwargs)
+
+    def __str__(self) -> str:
+        return f"{self.city}, {self.state}"
@@ -0,0 +1,88 @@
+from array import array
+
+
+def ngrams(text, n=3):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class NgramIndex:
+    """
+    In-memory substring index: each n-gram maps to the sorted positions of
+    the entries containing it. A fragment of length >= n is answered by
+    intersecting its n-gram postings (rarest first) and verifying the few
+    survivors with ``in``; shorter fragments fall back to a linear scan.
+    """
+
+    def __init__(self, entries=(), n=3):
+        self.n = n
+        self.keys = []
+        self.texts = []
+        self.postings = {}
+        for key, text in entries:
+            self.add(key, text)
+        self.postings = {gram: array("I", positions) for gram, positions in self.postings.items()}
+
+    @classmethod
+    def from_parts(cls, keys, texts, postings, n=3):
+        """Wrap prebuilt sequences, e.g. the sections of a mapped index file."""
+        index = cls.__new__(cls)
+        index.n = n
+        index.keys = keys
+        index.texts = texts
+        index.postings = postings
+        return index
+
+    def add(self, key, text):
+        position = len(self.keys)
+        self.keys.append(key)
+        self.texts.append(text)
+        for gram in ngrams(text, self.n):
+            self.postings.setdefault(gram, []).append(position)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def positions(self, fragment):
+        if not fragment:
+            return []
+        if len(fragment) < self.n:
+            return [pos for pos, text in enumerate(self.texts) if fragment in text]
+
+        lists = []
+        for gram in ngrams(fragment, self.n):
+            posting = self.postings.get(gram)
+            if posting is None:
+                return []
+            lists.append(posting)
+        lists.sort(key=len)
+        candidates = set(lists[0])
+        for posting in lists[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        return sorted(pos for pos in candidates if fragment in self.texts[pos])
+
+    def iter_positions(self, fragment):
+        """
+        Yield the positions ``positions`` would return, in order, without
+        building the list: the rarest n-gram's postings are walked and each
+        entry is verified with ``in``, so a caller can stop at its limit.
+        """
+        if not fragment:
+            return
+        if len(fragment) < self.n:
+            candidates = range(len(self.texts))
+        else:
+            postings = [self.postings.get(gram) for gram in ngrams(fragment, self.n)]
+            if any(posting is None for posting in postings):
+                return
+            candidates = min(postings, key=len)
+        for pos in candidates:
+            if fragment in self.texts[pos]:
+                yield pos
+
+    def search(self, fragment):
+        return [self.keys[pos] for pos in self.positions(fragment)]
+
+    def iter_search(self, fragment):
+        return (self.keys[pos] for pos in self.iter_positions(fragment))
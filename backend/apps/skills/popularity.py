@@ -0,0 +1,135 @@
+# Write-behind Skill.popularity.
+#
+# Adding a candidate skill appends a SkillPopularityDelta row (a plain insert,
+# no lock on the Skill row). flush_skill_popularity periodically sums the
+# pending deltas per skill and applies them with one UPDATE per chunk of
+# skills, so a burst of sign-ups touches "python" once per flush rather than
+# once per request.
+#
+# reconcile_skill_popularity recounts from CandidateSkill rows. It never
+# locks the delta table: see reconcile_popularity_counts.
+import logging
+
+from django.db import connection, transaction
+from django.db.models import Case, F, IntegerField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Skill, SkillPopularityDelta
+
+
+POPULARITY_FLUSH_BATCH_SIZE = 5000
+POPULARITY_UPDATE_CHUNK = 500
+# Pending deltas past which writers log a warning: nothing in the app runs
+# flush_skill_popularity, so a missing scheduler shows up here first.
+POPULARITY_BACKLOG_WARNING = 50000
+POPULARITY_BACKLOG_CHECK_INTERVAL = 1000
+# Postgres advisory lock keeping a reconcile from interleaving with a flush.
+# Flushes share it; request-path delta inserts never take it.
+POPULARITY_LOCK_KEY = 7201400
+
+logger = logging.getLogger(__name__)
+
+
+def record_skill_popularity(skill_ids):
+    """Buffer one popularity increment per id in ``skill_ids``."""
+    deltas = SkillPopularityDelta.objects.bulk_create(
+        [SkillPopularityDelta(skill_id=skill_id) for skill_id in skill_ids]
+    )
+    if deltas and deltas[0].pk is not None:
+        # Sampled: the backlog is counted about once per check interval of ids.
+        interval = POPULARITY_BACKLOG_CHECK_INTERVAL
+        if (deltas[0].pk - 1) // interval != deltas[-1].pk // interval:
+            warn_on_popularity_backlog()
+
+
+def warn_on_popularity_backlog():
+    backlog = SkillPopularityDelta.objects.count()
+    if backlog > POPULARITY_BACKLOG_WARNING:
+        logger.warning(
+            "%s skill popularity deltas are pending; schedule flush_skill_popularity.", backlog
+        )
+    return backlog
+
+
+def apply_popularity_totals(totals):
+    skill_ids = sorted(totals)
+    for start in range(0, len(skill_ids), POPULARITY_UPDATE_CHUNK):
+        chunk = skill_ids[start:start + POPULARITY_UPDATE_CHUNK]
+        increment = Case(
+            *[When(id=skill_id, then=Value(totals[skill_id])) for skill_id in chunk],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        Skill.objects.filter(id__in=chunk).update(
+            popularity=F("popularity") + increment,
+            popularity_updated_at=timezone.now(),
+        )
+
+
+def flush_skill_popularity_batch(batch_size=POPULARITY_FLUSH_BATCH_SIZE):
+    """
+    Fold up to ``batch_size`` pending deltas into Skill.popularity.
+
+    The rows are locked with SKIP LOCKED where supported, so concurrent
+    flushers never apply the same delta twice. Returns (rows, skills).
+    """
+    with transaction.atomic():
+        lock_popularity_counters(shared=True)
+        rows = list(
+            SkillPopularityDelta.objects.select_for_update(skip_locked=True)
+            .order_by("id")
+            .values_list("id", "skill_id", "delta")[:batch_size]
+        )
+        if not rows:
+            return 0, 0
+        totals = {}
+        for _id, skill_id, delta in rows:
+            totals[skill_id] = totals.get(skill_id, 0) + delta
+        apply_popularity_totals(totals)
+        SkillPopularityDelta.objects.filter(id__in=[row[0] for row in rows]).delete()
+    return len(rows), len(totals)
+
+
+def lock_popularity_counters(shared):
+    if connection.vendor != "postgresql":
+        return
+    function = "pg_advisory_xact_lock_shared" if shared else "pg_advisory_xact_lock"
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {function}(%s)", [POPULARITY_LOCK_KEY])
+
+
+def reconcile_popularity_counts(counts):
+    """
+    Set every Skill.popularity to ``counts`` (a per-skill subquery) and fold in
+    the pending deltas; returns (skills changed, deltas applied).
+
+    One UPDATE writes count minus pending deltas, reading both from the same
+    statement snapshot: a delta is visible exactly when the CandidateSkill
+    written in its transaction is, so the flush that follows brings each
+    skill back to its count. Deltas committed after that snapshot belong to
+    rows it did not count and are simply applied. Writers keep inserting
+    deltas throughout; only flushes wait for the advisory lock.
+    """
+    pending = (
+        SkillPopularityDelta.objects.filter(skill=OuterRef("pk"))
+        .order_by()
+        .values("skill")
+        .annotate(total=Sum("delta"))
+        .values("total")
+    )
+    recount = Coalesce(Subquery(counts, output_field=IntegerField()), Value(0)) - Coalesce(
+        Subquery(pending, output_field=IntegerField()), Value(0)
+    )
+    with transaction.atomic():
+        lock_popularity_counters(shared=False)
+        updated = Skill.objects.exclude(popularity=recount).update(
+            popularity=recount, popularity_updated_at=timezone.now()
+        )
+        applied = 0
+        while True:
+            rows, _skills = flush_skill_popularity_batch()
+            applied += rows
+            if rows < POPULARITY_FLUSH_BATCH_SIZE:
+                break
+    return updated, applied
@@ -0,0 +1,429 @@
+# Process-local indexes over the Skill master.
+#
+# Each worker keeps one SkillIndex and rebuilds it when the shared version
+# key in the cache moves (a Skill save that changes names or labels bumps it).
+# Skills appended by candidates move a separate additions key instead; workers
+# then read only rows past their highest id and add them in place, so
+# compiled search plans survive. Popularity counters are bumped with F()
+# updates that move neither key, so an index older than SKILL_INDEX_MAX_AGE
+# is rebuilt on a background thread while requests keep using the old one.
+#
+# When build_suggestion_index has written a shared index file, a reload maps
+# that file instead of building a private copy (see index_file). The file
+# carries the names, popularity, trigram and fuzzy postings; skills created or
+# edited after its watermark are read into a small in-memory overlay, and only
+# popularity counters flushed since then are read back. Only deletions or a
+# large backlog of changes fall back to a private index.
+import heapq
+import threading
+import time
+from bisect import bisect_left
+from functools import cached_property
+
+from django.db import connection, connections
+from django.db.models import Count, Max, Q
+from django.utils.dateparse import parse_datetime
+
+from .index_version import get_skill_additions_version, get_skill_index_version
+from .aliases import get_alias_map
+from .fuzzy import SymmetricDeleteIndex
+from .index_file import get_index_file
+from .models import Skill
+from .ngram import NgramIndex
+
+
+SKILL_INDEX_MAX_AGE = 300
+# Skills changed since the index file was written that are served from an
+# in-memory overlay; beyond this a private index is built instead.
+SKILL_INDEX_MAX_OVERLAY = 5000
+
+_lock = threading.Lock()
+_state = {"version": None, "additions": None, "index": None, "loaded_at": 0.0, "refreshing": False}
+
+
+def uses_trigram_index():
+    """Postgres answers substring lookups with pg_trgm GIN indexes."""
+    return connection.vendor == "postgresql"
+
+
+class SkillIndex:
+    """
+    Exact, prefix and infix lookups over the Skill master plus the display
+    name and popularity needed to answer type-ahead without the database.
+    """
+
+    def __init__(self, rows):
+        self.stamp = None
+        self.ids = []
+        self.exact = {}
+        self.names = {}
+        self.labels = {}
+        self.popularity = {}
+        entries = []
+        for skill_id, normalized_name, name, popularity in rows:
+            self.ids.append(skill_id)
+            entries.append((skill_id, normalized_name))
+            self.exact[normalized_name] = skill_id
+            self.names[skill_id] = normalized_name
+            self.labels[skill_id] = name
+            self.popularity[skill_id] = popularity
+        ordered = sorted(entries, key=lambda entry: entry[1])
+        self.sorted_names = [normalized_name for _skill_id, normalized_name in ordered]
+        self.sorted_ids = [skill_id for skill_id, _normalized_name in ordered]
+        self.substrings = NgramIndex(entries)
+        self.entries = entries
+        self.max_id = max(self.ids, default=0)
+
+    @classmethod
+    def load(cls):
+        """
+        Map the shared file or build a private index, with the fuzzy index
+        built up front so no type-ahead request pays for it.
+        """
+        index = None
+        index_file = get_index_file()
+        if index_file is not None and "skills.names" in index_file:
+            index = MappedSkillIndex.from_file(index_file)
+        if index is None:
+            index = cls.build()
+        index.fuzzy
+        return index
+
+    @classmethod
+    def build(cls):
+        # Stamped before reading: rows changed while building are newer than
+        # the watermark, so a file written from this index overlays them again.
+        stamp = skill_table_stamp()
+        index = cls(skill_rows(Skill.objects.order_by("id")).iterator())
+        index.stamp = stamp
+        return index
+
+    def add_rows(self, rows):
+        """Append skills created since the index was built (ids not yet present)."""
+        for skill_id, normalized_name, name, popularity in rows:
+            if skill_id in self.labels:
+                continue
+            self.ids.append(skill_id)
+            self.entries.append((skill_id, normalized_name))
+            self.exact[normalized_name] = skill_id
+            self.names[skill_id] = normalized_name
+            self.labels[skill_id] = name
+            self.popularity[skill_id] = popularity
+            position = bisect_left(self.sorted_names, normalized_name)
+            self.sorted_names.insert(position, normalized_name)
+            self.sorted_ids.insert(position, skill_id)
+            self.substrings.add(skill_id, normalized_name)
+            if "fuzzy" in self.__dict__:
+                self.fuzzy.add(skill_id, normalized_name)
+            self.max_id = max(self.max_id, skill_id)
+
+    def __contains__(self, skill_id):
+        return skill_id in self.labels
+
+    def exact_id(self, normalized_name):
+        return self.exact.get(normalized_name)
+
+    def name_of(self, skill_id):
+        return self.names.get(skill_id)
+
+    def label_of(self, skill_id):
+        return self.labels[skill_id]
+
+    def popularity_of(self, skill_id):
+        return self.popularity[skill_id]
+
+    def prefix_ids(self, prefix):
+        position = bisect_left(self.sorted_names, prefix)
+        ids = []
+        while position < len(self.sorted_names) and self.sorted_names[position].startswith(prefix):
+            ids.append(self.sorted_ids[position])
+            position += 1
+        return ids
+
+    @cached_property
+    def fuzzy(self):
+        # Built by load() alongside the rest of the index (see get_skill_index).
+        return SymmetricDeleteIndex(self.entries)
+
+    def suggest(self, q, limit=10, fuzzy=True):
+        """
+        Type-ahead matches for a normalized query ranked by popularity, then
+        name: prefix matches for one character, infix matches otherwise, plus
+        skills with an alias starting with ``q``. When nothing matches and
+        ``fuzzy`` is set, near misses within a small edit distance are
+        returned, closest first.
+        """
+        ids = set(self.prefix_ids(q) if len(q) == 1 else self.substring_ids(q))
+        ids.update(pk for pk in get_alias_map().prefix_ids(q) if pk in self)
+        if ids:
+            top = heapq.nsmallest(limit, ids, key=lambda pk: (-self.popularity_of(pk), self.label_of(pk)))
+        elif fuzzy:
+            distances = {}
+            for distance, pk in self.fuzzy_matches(q):
+                distances.setdefault(pk, distance)
+            top = heapq.nsmallest(
+                limit,
+                distances,
+                key=lambda pk: (distances[pk], -self.popularity_of(pk), self.label_of(pk)),
+            )
+        else:
+            top = []
+        return [{"id": pk, "name": self.label_of(pk)} for pk in top]
+
+    def fuzzy_matches(self, q):
+        return self.fuzzy.search(q)
+
+    def resolve(self, token):
+        """Skill ids whose name or one of its ESCO aliases equals ``token``."""
+        ids = set(get_alias_map().resolve(token))
+        skill_id = self.exact_id(token)
+        if skill_id is not None:
+            ids.add(skill_id)
+        return tuple(sorted(ids))
+
+    def expand_names(self, skill_ids):
+        """Canonical names and aliases of ``skill_ids`` (synonym expansion)."""
+        alias_map = get_alias_map()
+        names = set()
+        for skill_id in skill_ids:
+            name = self.name_of(skill_id)
+            if name is not None:
+                names.add(name)
+            names.update(alias_map.by_skill.get(skill_id, ()))
+        return names
+
+    def substring_ids(self, fragment):
+        return self.substrings.search(fragment)
+
+    def write_sections(self, writer):
+        """Serialize into an IndexFileWriter; entries are stored in name order."""
+        writer.add_strings("skills.names", self.sorted_names)
+        writer.add_strings("skills.labels", (self.labels[pk] for pk in self.sorted_ids))
+        writer.add_array("skills.ids", "q", self.sorted_ids)
+        writer.add_array("skills.popularity", "q", (self.popularity[pk] for pk in self.sorted_ids))
+        by_id = sorted(range(len(self.sorted_ids)), key=self.sorted_ids.__getitem__)
+        writer.add_array("skills.by_id", "q", (self.sorted_ids[position] for position in by_id))
+        writer.add_array("skills.by_id.positions", "I", by_id)
+        writer.add_postings(
+            "skills.trigrams", NgramIndex(enumerate(self.sorted_names)).postings
+        )
+        writer.add_postings(
+            "skills.fuzzy", SymmetricDeleteIndex(enumerate(self.sorted_names)).variants
+        )
+        writer.meta["skills"] = self.stamp or skill_table_stamp()
+
+
+class MappedSkillIndex(SkillIndex):
+    """
+    SkillIndex answered from the shared index file: entries sit in name order,
+    so prefixes bisect ``names`` directly and id lookups go through the
+    id-sorted ``by_id`` section.
+
+    ``overlay`` is an in-memory SkillIndex of skills changed after the file
+    was written; its ids shadow their entries in the file.
+    ``popularity_deltas`` holds the counters flushed since the file was
+    written; every other popularity is read from the file.
+    """
+
+    def __init__(self, index_file, overlay_rows=(), popularity_deltas=None):
+        self.overlay = SkillIndex(overlay_rows)
+        self.shadowed = set(self.overlay.ids)
+        self.max_id = max((index_file.meta.get("skills") or {}).get("max_id") or 0, self.overlay.max_id)
+        self.popularity_deltas = popularity_deltas or {}
+        self.fuzzy_postings = (
+            index_file.postings("skills.fuzzy") if "skills.fuzzy.values" in index_file else None
+        )
+        self.sorted_names = index_file.strings("skills.names")
+        self.sorted_labels = index_file.strings("skills.labels")
+        self.sorted_ids = index_file.array("skills.ids", "q")
+        self.sorted_popularity = index_file.array("skills.popularity", "q")
+        self.by_id = index_file.array("skills.by_id", "q")
+        self.by_id_positions = index_file.array("skills.by_id.positions", "I")
+        self.substrings = NgramIndex.from_parts(
+            self.sorted_ids, self.sorted_names, index_file.postings("skills.trigrams")
+        )
+
+    @classmethod
+    def from_file(cls, index_file):
+        """
+        Map ``index_file`` with an overlay of skills newer than its watermark,
+        or return None when skills were deleted since it was written or the
+        overlay would be too large.
+        """
+        stamp = index_file.meta.get("skills") or {}
+        if "max_id" not in stamp or "popularity_updated_at" not in stamp:
+            return None
+        max_id = stamp["max_id"] or 0
+        if Skill.objects.filter(id__lte=max_id).count() != stamp["count"]:
+            return None
+        changed = Q(id__gt=max_id)
+        if stamp["updated_at"]:
+            changed |= Q(updated_at__gt=parse_datetime(stamp["updated_at"]))
+        overlay_rows = list(skill_rows(Skill.objects.filter(changed))[: SKILL_INDEX_MAX_OVERLAY + 1])
+        if len(overlay_rows) > SKILL_INDEX_MAX_OVERLAY:
+            return None
+        flushed = Skill.objects.exclude(popularity_updated_at=None)
+        if stamp["popularity_updated_at"]:
+            # >= so counters stamped with the watermark itself are not missed.
+            flushed = flushed.filter(
+                popularity_updated_at__gte=parse_datetime(stamp["popularity_updated_at"])
+            )
+        popularity_deltas = dict(
+            flushed.values_list("id", "popularity")[: SKILL_INDEX_MAX_OVERLAY + 1]
+        )
+        if len(popularity_deltas) > SKILL_INDEX_MAX_OVERLAY:
+            return None
+        return cls(index_file, overlay_rows, popularity_deltas)
+
+    def add_rows(self, rows):
+        rows = list(rows)
+        self.overlay.add_rows(rows)
+        self.shadowed.update(skill_id for skill_id, _name, _label, _popularity in rows)
+        self.max_id = max(self.max_id, self.overlay.max_id)
+
+    @cached_property
+    def fuzzy(self):
+        """Delete variants of the file's entries, mapped when the file has them."""
+        self.overlay.fuzzy
+        if self.fuzzy_postings is None:
+            return SymmetricDeleteIndex(zip(self.sorted_ids, self.sorted_names))
+        return SymmetricDeleteIndex.from_parts(self.sorted_ids, self.sorted_names, self.fuzzy_postings)
+
+    def fuzzy_matches(self, q):
+        matches = [match for match in self.fuzzy.search(q) if match[1] not in self.shadowed]
+        matches.extend(self.overlay.fuzzy_matches(q))
+        matches.sort(key=lambda match: match[0])
+        return matches
+
+    @property
+    def entries(self):
+        for skill_id, normalized_name in zip(self.sorted_ids, self.sorted_names):
+            if skill_id not in self.shadowed:
+                yield skill_id, normalized_name
+        yield from self.overlay.entries
+
+    def _position(self, skill_id):
+        if skill_id in self.shadowed:
+            return None
+        position = bisect_left(self.by_id, skill_id)
+        if position < len(self.by_id) and self.by_id[position] == skill_id:
+            return self.by_id_positions[position]
+        return None
+
+    def __contains__(self, skill_id):
+        return skill_id in self.overlay or self._position(skill_id) is not None
+
+    def exact_id(self, normalized_name):
+        skill_id = self.overlay.exact_id(normalized_name)
+        if skill_id is not None:
+            return skill_id
+        position = bisect_left(self.sorted_names, normalized_name)
+        if position < len(self.sorted_names) and self.sorted_names[position] == normalized_name:
+            skill_id = self.sorted_ids[position]
+            if skill_id not in self.shadowed:
+                return skill_id
+        return None
+
+    def name_of(self, skill_id):
+        if skill_id in self.overlay:
+            return self.overlay.name_of(skill_id)
+        position = self._position(skill_id)
+        return None if position is None else self.sorted_names[position]
+
+    def label_of(self, skill_id):
+        if skill_id in self.overlay:
+            return self.overlay.label_of(skill_id)
+        return self.sorted_labels[self._position(skill_id)]
+
+    def popularity_of(self, skill_id):
+        if skill_id in self.overlay:
+            return self.overlay.popularity_of(skill_id)
+        popularity = self.popularity_deltas.get(skill_id)
+        if popularity is not None:
+            return popularity
+        return self.sorted_popularity[self._position(skill_id)]
+
+    def prefix_ids(self, prefix):
+        ids = [pk for pk in super().prefix_ids(prefix) if pk not in self.shadowed]
+        return ids + self.overlay.prefix_ids(prefix)
+
+    def substring_ids(self, fragment):
+        ids = {pk for pk in self.substrings.search(fragment) if pk not in self.shadowed}
+        ids.update(self.overlay.substring_ids(fragment))
+        return sorted(ids)
+
+
+def skill_rows(queryset):
+    return queryset.values_list("id", "normalized_name", "name", "popularity")
+
+
+def skill_table_stamp():
+    """
+    Watermark of the Skill table: row count, highest id, last change and last
+    popularity flush. Rows past it are overlaid on a mapped file; a lower
+    count means deletions.
+    """
+    stamp = Skill.objects.aggregate(
+        count=Count("id"),
+        max_id=Max("id"),
+        updated_at=Max("updated_at"),
+        popularity_updated_at=Max("popularity_updated_at"),
+    )
+    return {
+        "count": stamp["count"],
+        "max_id": stamp["max_id"],
+        "updated_at": _isoformat(stamp["updated_at"]),
+        "popularity_updated_at": _isoformat(stamp["popularity_updated_at"]),
+    }
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _load(version, additions):
+    index = SkillIndex.load()
+    _state.update(index=index, version=version, additions=additions, loaded_at=time.monotonic())
+
+
+def _refresh(version, additions):
+    try:
+        index = SkillIndex.load()
+        with _lock:
+            # A synchronous reload for a newer version wins over this one.
+            if _state["version"] == version:
+                _state.update(index=index, additions=additions, loaded_at=time.monotonic())
+    finally:
+        _state["refreshing"] = False
+        connections.close_all()
+
+
+def _refresh_in_background(version, additions):
+    with _lock:
+        if _state["refreshing"]:
+            return
+        _state["refreshing"] = True
+    threading.Thread(target=_refresh, args=(version, additions), daemon=True).start()
+
+
+def get_skill_index():
+    """
+    This worker's SkillIndex. A version change (edited names or labels)
+    reloads it before answering; appended skills are added in place; an index
+    past SKILL_INDEX_MAX_AGE keeps serving while a fresh one builds.
+    """
+    version = get_skill_index_version()
+    additions = get_skill_additions_version()
+    if _state["index"] is None or _state["version"] != version:
+        with _lock:
+            if _state["index"] is None or _state["version"] != version:
+                _load(version, additions)
+    elif time.monotonic() - _state["loaded_at"] > SKILL_INDEX_MAX_AGE:
+        _refresh_in_background(version, additions)
+    if _state["additions"] != additions:
+        with _lock:
+            if _state["additions"] != additions:
+                index = _state["index"]
+                index.add_rows(skill_rows(Skill.objects.filter(id__gt=index.max_id).order_by("id")))
+                _state["additions"] = additions
+    return _state["index"]
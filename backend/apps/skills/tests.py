@@ -1,8 +1,36 @@
+import io
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APITestCase
 
 from apps.accounts.models import User
-from apps.skills.location_suggestions import load_locations_json
+from apps.candidates.utils.skills import resolve_master_skills
+from apps.skills.location_suggestions import (
+    LocationIndex,
+    MappedLocationIndex,
+    build_location_index,
+    load_location_index,
+    load_locations_json,
+    locations_source_stamp,
+)
+from apps.skills import aliases
+from apps.skills.aliases import ALIAS_MAP_MAX_AGE, get_alias_map
+from apps.skills.fuzzy import SymmetricDeleteIndex
+from apps.skills.index_version import bump_skill_index_version, get_skill_index_version
+from apps.skills.models import Skill, SkillAlias
+from apps.skills.index_file import MappedPostings
+from apps.skills.inserts import insert_new_skills
+from apps.skills.ngram import NgramIndex
+from apps.skills.popularity import apply_popularity_totals
+from apps.skills import search_index
+from apps.skills.search_index import SKILL_INDEX_MAX_AGE, MappedSkillIndex, SkillIndex, get_skill_index
 
 
 class LocationSuggestionTests(APITestCase):
@@ -31,8 +59,275 @@ class LocationSuggestionTests(APITestCase):
         for city in payload["results"]:
             self.assertIn("ben", city.lower())
 
+    def test_misspelled_city_falls_back_to_fuzzy_matches(self):
+        url = reverse("locations-suggest")
+        response = self.client.get(url, {"q": "bengalure"})
+        self.assertEqual(response.json()["results"][0], "Bengaluru")
+        response = self.client.get(url, {"q": "bengalure", "fuzzy": "0"})
+        self.assertEqual(response.json(), {"results": []})
+
     def test_location_json_loader_uses_process_cache(self):
         load_locations_json.cache_clear()
         first = load_locations_json()
         second = load_locations_json()
         self.assertIs(first, second)
+
+
+class LocationIndexTests(SimpleTestCase):
+    def test_prefix_then_infix_matches_in_seed_order_with_state_scope(self):
+        index = LocationIndex(
+            {"Karnataka": ["Bengaluru", "Udupi"], "Kerala": ["Kochi", " bengaluru "]},
+            [("Karnataka", "Bengaluru"), ("Karnataka", "Udupi"), ("Kerala", "Kochi"), ("Kerala", "Bengaluru")],
+        )
+        self.assertEqual(len(index.names), 3)
+        self.assertEqual(index.suggest("ben"), ["Bengaluru"])
+        self.assertEqual(index.suggest("u", limit=5), ["Udupi", "Bengaluru"])
+        self.assertEqual(index.suggest("koc", state="KARNATAKA"), [])
+        self.assertEqual(index.suggest("ben", state="kerala"), ["Bengaluru"])
+        self.assertEqual(index.suggest("ben", state="goa"), [])
+
+    def test_stops_at_the_limit_and_narrows_by_state_first(self):
+        towns = [f"Sangam {number:02d}" for number in range(30)]
+        index = LocationIndex(
+            {"Maharashtra": towns, "West Bengal": ["Santipur", "Hasanpur"]},
+            [("Maharashtra", town) for town in towns]
+            + [("West Bengal", "Santipur"), ("West Bengal", "Hasanpur")],
+        )
+        with patch.object(index.infixes, "iter_search", side_effect=AssertionError):
+            self.assertEqual(index.suggest("san", limit=2), ["Sangam 00", "Sangam 01"])
+        self.assertEqual(index.suggest("san", state="west bengal", limit=2), ["Santipur", "Hasanpur"])
+
+    def test_seed_stamp_tracks_content_not_size(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "cities.json"
+            path.write_text('{"Goa": ["Panaji"]}')
+            with patch("apps.skills.location_suggestions.locations_json_path", return_value=path):
+                stamp = locations_source_stamp()
+                path.write_text('{"Goa": ["Margao"]}')
+                self.assertNotEqual(locations_source_stamp(), stamp)
+
+
+class NgramIndexTests(SimpleTestCase):
+    def test_finds_infix_matches_and_short_fragments(self):
+        index = NgramIndex([(1, "javascript"), (2, "typescript"), (3, "java"), (4, "scala")])
+        self.assertEqual(index.search("script"), [1, 2])
+        self.assertEqual(index.search("java"), [1, 3])
+        self.assertEqual(index.search("sc"), [1, 2, 4])
+        self.assertEqual(index.search("rust"), [])
+        for fragment in ("script", "java", "sc", "rust", ""):
+            self.assertEqual(list(index.iter_search(fragment)), index.search(fragment))
+
+
+class SymmetricDeleteIndexTests(SimpleTestCase):
+    def test_finds_terms_within_the_edit_budget(self):
+        index = SymmetricDeleteIndex(
+            [(1, "javascript"), (2, "java"), (3, "typescript"), (4, "machine learning")]
+        )
+        self.assertEqual(index.search("javscript"), [(1, 1)])
+        self.assertEqual(index.search("machne lear"), [(1, 4)])
+        self.assertEqual(index.search("jvaa"), [])
+        self.assertEqual(index.search("jav"), [])
+
+
+class SkillSuggestionTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="skills@example.com",
+            password="StrongPass123!",
+            full_name="Skills Tester",
+            role=User.Role.CANDIDATE,
+        )
+        self.client.force_authenticate(user=self.user)
+        self.javascript = Skill.objects.create(
+            name="JavaScript", popularity=50, alt_labels="JS\nECMAScript"
+        )
+        Skill.objects.create(name="TypeScript", popularity=80)
+        Skill.objects.create(name="Java", popularity=90)
+
+    def test_substring_suggestions_are_ranked_by_popularity(self):
+        response = self.client.get(reverse("skills-suggest"), {"q": "script"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item["name"] for item in response.json()], ["TypeScript", "JavaScript"])
+
+    def test_new_skill_is_visible_without_restart(self):
+        self.client.get(reverse("skills-suggest"), {"q": "learn"})
+        Skill.objects.create(name="Machine Learning", popularity=5)
+        response = self.client.get(reverse("skills-suggest"), {"q": "learni"})
+        self.assertEqual([item["name"] for item in response.json()], ["Machine Learning"])
+
+    def test_candidate_created_skills_are_added_in_place(self):
+        index = get_skill_index()
+        version = get_skill_index_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            resolve_master_skills([{"name": "Rust", "normalized": "rust"}])
+        self.assertEqual(get_skill_index_version(), version)
+        self.assertIs(get_skill_index(), index)
+        self.assertEqual(index.suggest("rus"), [{"id": Skill.objects.get(name="Rust").pk, "name": "Rust"}])
+
+    def test_old_index_is_served_while_a_fresh_one_builds(self):
+        index = get_skill_index()
+        search_index._state["loaded_at"] -= SKILL_INDEX_MAX_AGE + 1
+        with patch("apps.skills.search_index.threading.Thread") as thread:
+            self.assertIs(get_skill_index(), index)
+        thread.return_value.start.assert_called_once_with()
+        search_index._state["refreshing"] = False
+
+    def test_alt_labels_are_persisted_and_used_for_matching(self):
+        self.assertEqual(
+            sorted(SkillAlias.objects.filter(skill=self.javascript).values_list("alias", flat=True)),
+            ["ecmascript", "js"],
+        )
+        response = self.client.get(reverse("skills-suggest"), {"q": "js"})
+        self.assertEqual([item["name"] for item in response.json()], ["JavaScript"])
+
+        typescript = Skill.objects.get(name="TypeScript")
+        typescript.alt_labels = "TS"
+        typescript.save()
+        response = self.client.get(reverse("skills-suggest"), {"q": "ts"})
+        self.assertEqual([item["name"] for item in response.json()], ["TypeScript"])
+
+    def test_alias_map_refreshes_after_max_age_and_drops_deleted_skills(self):
+        alias_map = get_alias_map()
+        self.assertEqual(alias_map.resolve("js"), (self.javascript.pk,))
+        # Neither write moves the version key this worker sees.
+        Skill.objects.filter(pk=self.javascript.pk).delete()
+        Skill.objects.filter(name="TypeScript").update(alt_labels="TS", updated_at=timezone.now())
+        SkillAlias.objects.create(skill=Skill.objects.get(name="TypeScript"), alias="ts")
+        self.assertEqual(get_alias_map().resolve("js"), (self.javascript.pk,))
+
+        aliases._state["loaded_at"] -= ALIAS_MAP_MAX_AGE + 1
+        self.assertIs(get_alias_map(), alias_map)
+        self.assertEqual(alias_map.resolve("js"), ())
+        self.assertEqual(alias_map.resolve("ts"), (Skill.objects.get(name="TypeScript").pk,))
+        self.assertEqual(alias_map.sorted_aliases, ["ts"])
+
+    def test_saving_unchanged_content_keeps_index_version_and_aliases(self):
+        version = get_skill_index_version()
+        javascript = Skill.objects.get(pk=self.javascript.pk)
+        javascript.popularity = 60
+        with self.assertNumQueries(1):
+            javascript.save()
+        self.assertEqual(get_skill_index_version(), version)
+
+        javascript.alt_labels = "JS"
+        javascript.save()
+        self.assertNotEqual(get_skill_index_version(), version)
+        self.assertEqual(list(SkillAlias.objects.filter(skill=javascript).values_list("alias", flat=True)), ["js"])
+
+    def test_suggestions_are_served_from_memory(self):
+        self.client.get(reverse("skills-suggest"), {"q": "java"})
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("skills-suggest"), {"q": "j", "limit": 2})
+        self.assertEqual([item["name"] for item in response.json()], ["Java", "JavaScript"])
+
+    def test_typo_falls_back_to_fuzzy_suggestions(self):
+        # Built with the index, not by the first misspelled request.
+        self.assertIn("fuzzy", get_skill_index().__dict__)
+        response = self.client.get(reverse("skills-suggest"), {"q": "javscript"})
+        self.assertEqual([item["name"] for item in response.json()], ["JavaScript"])
+        response = self.client.get(reverse("skills-suggest"), {"q": "javscript", "fuzzy": "off"})
+        self.assertEqual(response.json(), [])
+
+    def test_shared_index_file_is_mapped_until_skills_change(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / "suggestions.idx")
+            with override_settings(SUGGESTION_INDEX_PATH=path):
+                call_command("build_suggestion_index", stdout=io.StringIO())
+                mapped = SkillIndex.load()
+                self.assertIsInstance(mapped, MappedSkillIndex)
+                built = SkillIndex.build()
+                for query in ("j", "script", "js", "javscript"):
+                    self.assertEqual(mapped.suggest(query), built.suggest(query))
+                self.assertEqual(mapped.resolve("ecmascript"), (self.javascript.pk,))
+                self.assertEqual(mapped.expand_names([self.javascript.pk]), {"javascript", "js", "ecmascript"})
+
+                locations = load_location_index()
+                self.assertIsInstance(locations, MappedLocationIndex)
+                for query, state in (("ben", None), ("ben", "Karnataka"), ("bengalure", None)):
+                    self.assertEqual(
+                        locations.suggest(query, state=state),
+                        build_location_index().suggest(query, state=state),
+                    )
+
+                # New skills and popularity changes are overlaid on the file.
+                Skill.objects.create(name="Machine Learning", popularity=5)
+                apply_popularity_totals({self.javascript.pk: 45})
+                overlaid = get_skill_index()
+                self.assertIsInstance(overlaid, MappedSkillIndex)
+                # Only the flushed counter is read back; fuzzy variants are mapped.
+                self.assertEqual(overlaid.popularity_deltas, {self.javascript.pk: 95})
+                self.assertIsInstance(overlaid.fuzzy.variants, MappedPostings)
+                self.assertEqual(overlaid.suggest("javscript"), SkillIndex.build().suggest("javscript"))
+                self.assertEqual(overlaid.suggest("mach"), SkillIndex.build().suggest("mach"))
+                self.assertEqual(overlaid.suggest("j"), SkillIndex.build().suggest("j"))
+                self.assertEqual(overlaid.suggest("j")[0]["id"], self.javascript.pk)
+
+                # An edited skill shadows its stale entry in the file.
+                java = Skill.objects.get(name="Java")
+                java.name = "Kotlin"
+                java.normalized_name = "kotlin"
+                java.save()
+                renamed = get_skill_index()
+                self.assertIsInstance(renamed, MappedSkillIndex)
+                self.assertIsNone(renamed.exact_id("java"))
+                self.assertEqual(renamed.exact_id("kotlin"), java.pk)
+                self.assertEqual(renamed.suggest("j"), SkillIndex.build().suggest("j"))
+
+                # A deleted skill would still be in the file: build privately.
+                Skill.objects.filter(name="TypeScript").delete()
+                bump_skill_index_version()
+                self.assertNotIsInstance(get_skill_index(), MappedSkillIndex)
+
+
+class ImportEscoSkillsTests(TestCase):
+    def run_import(self, path, *args):
+        out = io.StringIO()
+        call_command("import_esco_skills", "--path", path, *args, stdout=out)
+        return out.getvalue().strip().splitlines()[-1]
+
+    def test_rerun_skips_unchanged_rows_and_upsert_updates_changed_ones(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "skills.csv"
+            path.write_text(
+                "PREFERREDLABEL,ALTLABELS,ORIGINURI\nPython,py,esco/1\nJava,,esco/2\n,,\n",
+                encoding="utf-8",
+            )
+            self.assertIn("Inserted 2, updated 0, unchanged 0", self.run_import(str(path)))
+            self.assertIn("Inserted 0, updated 0, unchanged 2", self.run_import(str(path)))
+
+            path.write_text(
+                "PREFERREDLABEL,ALTLABELS,ORIGINURI\nPython,python3,esco/1\nJava,,esco/2\nGo,,esco/3\n",
+                encoding="utf-8",
+            )
+            summary = self.run_import(str(path))
+            self.assertIn("Inserted 1, updated 0, unchanged 1", summary)
+            self.assertIn("1 existing rows differ", summary)
+            self.assertEqual(Skill.objects.get(normalized_name="python").alt_labels, "py")
+
+            summary = self.run_import(str(path), "--upsert", "--parse-worker")
+            self.assertIn("Inserted 0, updated 1, unchanged 2", summary)
+            python = Skill.objects.get(normalized_name="python")
+            self.assertEqual(python.alt_labels, "python3")
+            self.assertEqual(list(python.aliases.values_list("alias", flat=True)), ["python3"])
+
+    def test_rows_lost_to_a_concurrent_insert_are_not_counted_as_inserted(self):
+        real_insert = insert_new_skills
+
+        def racing_insert(skills):
+            # A candidate creates "rust" between the lookup and the insert.
+            Skill.objects.create(name="Rust")
+            return real_insert(skills)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "skills.csv"
+            path.write_text(
+                "PREFERREDLABEL,ALTLABELS,ORIGINURI\nRust,rustlang,esco/1\nGo,,esco/2\n",
+                encoding="utf-8",
+            )
+            target = "apps.skills.management.commands.import_esco_skills.insert_new_skills"
+            with patch(target, side_effect=racing_insert):
+                summary = self.run_import(str(path), "--upsert")
+        self.assertIn("Inserted 1, updated 1, unchanged 0", summary)
+        self.assertEqual(Skill.objects.get(normalized_name="rust").source_uri, "esco/1")
+
@@ -1,10 +1,12 @@
-from django.core.cache import cache
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Skill, normalize_skill_name
-from .serializers import SkillSuggestionSerializer
+from .models import normalize_skill_name
+from .search_index import get_skill_index
+
+
+FUZZY_OFF_VALUES = {"0", "false", "off", "no"}
 
 
 class SkillSuggestionView(APIView):
@@ -22,17 +24,5 @@ class SkillSuggestionView(APIView):
             limit = 10
 
         q = normalize_skill_name(raw_q)
-        cache_key = f"skills:suggest:{q}:{limit}"
-        cached = cache.get(cache_key)
-        if cached is not None:
-            return Response(cached)
-
-        if len(q) == 1:
-            queryset = Skill.objects.filter(normalized_name__startswith=q)
-        else:
-            queryset = Skill.objects.filter(normalized_name__icontains=q)
-
-        queryset = queryset.order_by("-popularity", "name")[:limit]
-        data = SkillSuggestionSerializer(queryset, many=True).data
-        cache.set(cache_key, data, 3600)
-        return Response(data)
+        fuzzy = (request.query_params.get("fuzzy") or "").strip().lower() not in FUZZY_OFF_VALUES
+        return Response(get_skill_index().suggest(q, limit=max(limit, 0), fuzzy=fuzzy))
@@ -3,6 +3,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from .location_suggestions import suggest_location_names
+from .views import FUZZY_OFF_VALUES
 
 
 class LocationSuggestionView(APIView):
@@ -20,5 +21,6 @@ class LocationSuggestionView(APIView):
             limit = 10
 
         state = (request.query_params.get("state") or "").strip() or None
-        results = suggest_location_names(raw_q=raw_q, state=state, limit=limit)
+        fuzzy = (request.query_params.get("fuzzy") or "").strip().lower() not in FUZZY_OFF_VALUES
+        results = suggest_location_names(raw_q=raw_q, state=state, limit=limit, fuzzy=fuzzy)
         return Response({"results": results})
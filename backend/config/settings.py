@@ -134,6 +134,22 @@ SPECTACULAR_SETTINGS = {
     "VERSION": "1.0.0",
 }
 
+# Search result ids, the search generation and the skill index/alias version
+# keys live in the Django cache. The default LocMemCache is per process, so a
+# multi-worker deployment must configure a shared CACHES backend (Redis or
+# Memcached); otherwise workers only see each other's skill edits once their
+# in-memory indexes reach their max age.
+
+# "profile" filters CandidateProfile with joins; "document" filters the
+# denormalized CandidateSearchDocument table (run rebuild_search_documents first).
+CANDIDATE_SEARCH_BACKEND = os.getenv("CANDIDATE_SEARCH_BACKEND", "profile")
+# "basic" matches keywords with icontains; "fulltext" uses the tsvector/GIN
+# index on Postgres or the FTS5 table on SQLite (both built from search documents).
+CANDIDATE_KEYWORD_SEARCH = os.getenv("CANDIDATE_KEYWORD_SEARCH", "basic")
+# Shared skill/location suggestion index written by build_suggestion_index;
+# empty keeps a private in-memory index per worker.
+SUGGESTION_INDEX_PATH = os.getenv("SUGGESTION_INDEX_PATH", "")
+
 CORS_ALLOWED_ORIGINS = [
     origin
     for origin in os.getenv("CORS_ALLOWED_ORIGINS", "http://localhost:5173").split(",")